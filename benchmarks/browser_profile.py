@@ -0,0 +1,200 @@
+"""
+Measures page-load time and Chrome memory with and without the
+lean browser profile, against fixture pages served locally.
+
+    python -m benchmarks.browser_profile [--repeat 5] [--rows 500] [--asset-delay 0.05] [--save]
+
+Needs Chrome and chromedriver (CHROME_BINARY_PATH, CHROMEDRIVER_PATH).
+Every fixture carries a stylesheet, web fonts, images and an analytics
+script; each asset is served after --asset-delay seconds so blocked
+requests show up in load time. Memory is the summed RSS of the Chrome
+processes this run started, sampled after each load.
+
+Each page's rows are counted with the scrapers' own locators after it
+loads. The run fails if the lean profile renders fewer rows than the
+full one. --save writes the results, with the Chrome version, to
+benchmarks/browser_profile.json.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import threading
+import statistics
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from config.chrome_options import chrome_options, block_resources
+from config.tracing import chrome_rss_bytes
+from scraping.locators import LOCATORS, by
+from benchmarks.fixtures import market_movers_html, earnings_html, econ_html, with_assets
+
+RESULTS_PATH = os.path.join(os.path.dirname(__file__), "browser_profile.json")
+
+PAGES = {
+    "market_movers": market_movers_html,
+    "earnings": earnings_html,
+    "econ": econ_html,
+}
+
+# Locator of the rows each page's scraper reads
+ROW_LOCATORS = {
+    "market_movers": "movers_rows",
+    "earnings": "earnings_rows",
+    "econ": "econ_items",
+}
+
+ASSET_TYPES = {
+    ".css": "text/css",
+    ".woff2": "font/woff2",
+    ".png": "image/png",
+    ".js": "application/javascript",
+}
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    Serves /<page> fixtures and synthetic /assets/ files,
+    counting the requests it answers.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, pages, asset_delay):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        self.pages = pages
+        self.asset_delay = asset_delay
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def url(self, page):
+        return f"http://127.0.0.1:{self.server_address[1]}/{page}"
+
+    def count(self):
+        with self._lock:
+            self.requests += 1
+
+    def reset(self):
+        with self._lock:
+            served, self.requests = self.requests, 0
+        return served
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.count()
+        path = self.path.lstrip("/")
+
+        if path in self.server.pages:
+            self._send(200, "text/html; charset=utf-8", self.server.pages[path].encode())
+            return
+
+        if path.startswith("assets/"):
+            time.sleep(self.server.asset_delay)
+            content_type = next((t for ext, t in ASSET_TYPES.items() if path.endswith(ext)), "application/octet-stream")
+            body = b"/* */" if path.endswith((".css", ".js")) else bytes(32 * 1024)
+            self._send(200, content_type, body)
+            return
+
+        self._send(404, "text/plain", b"not found")
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def measure(server, page, lean, repeat, port):
+    """
+    Loads `page` `repeat` times in a fresh browser and returns
+    median load ms, peak RSS bytes, requests per load, the rows
+    the page rendered and the Chrome version.
+    """
+    driver = chrome_options(debug_port=port, lean=lean)
+    try:
+        block_resources(driver, page)
+        driver.get("about:blank")
+        server.reset()
+
+        timings, rss = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            driver.get(server.url(page))
+            timings.append((time.perf_counter() - start) * 1000)
+            rss.append(chrome_rss_bytes() or 0)
+            rows = count_rows(driver, page)
+            driver.get("about:blank")
+
+        version = driver.capabilities.get("browserVersion")
+        return statistics.median(timings), max(rss), server.reset() / repeat, rows, version
+    finally:
+        driver.quit()
+
+
+def count_rows(driver, page):
+    """
+    Returns the most rows any of the page's row locators finds.
+    """
+    return max(len(driver.find_elements(*by(selector))) for selector in LOCATORS[ROW_LOCATORS[page]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--asset-delay", type=float, default=0.05)
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), choices=list(PAGES))
+    parser.add_argument("--port", type=int, default=9400)
+    parser.add_argument("--save", action="store_true", help=f"write the results to {RESULTS_PATH}")
+    args = parser.parse_args()
+
+    pages = {name: with_assets(PAGES[name](args.rows)) for name in args.pages}
+    server = FixtureServer(pages, args.asset_delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results, missing, version = {}, [], None
+    print(f"{'page':<15}{'profile':<9}{'load ms':>10}{'chrome MB':>11}{'requests':>10}{'rows':>7}")
+    try:
+        for page in args.pages:
+            for lean in (False, True):
+                load_ms, rss, requests, rows, version = measure(server, page, lean, args.repeat, args.port)
+                profile = "lean" if lean else "full"
+                results.setdefault(page, {})[profile] = {
+                    "load_ms": round(load_ms, 1),
+                    "chrome_rss_mb": round(rss / 2**20, 1),
+                    "requests": requests,
+                    "rows": rows,
+                }
+                print(f"{page:<15}{profile:<9}{load_ms:>10.1f}{rss / 2**20:>11.1f}{requests:>10.1f}{rows:>7}")
+
+            if results[page]["lean"]["rows"] < results[page]["full"]["rows"]:
+                missing.append(f"{page}: {results[page]['lean']['rows']} of {results[page]['full']['rows']} rows")
+    finally:
+        server.shutdown()
+
+    if args.save:
+        with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+            json.dump({
+                "measured_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                "chrome": version,
+                "rows": args.rows,
+                "repeat": args.repeat,
+                "asset_delay": args.asset_delay,
+                "pages": results,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Saved results to {RESULTS_PATH}")
+
+    if missing:
+        print(f"Lean profile renders fewer rows: {'; '.join(missing)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
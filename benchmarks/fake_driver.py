@@ -0,0 +1,404 @@
+"""
+In-memory stand-in for a Selenium WebDriver, backed by a small DOM
+built from fixture HTML. It understands the selector subset the
+scrapers use and the extractor's execute_script payload, and counts
+every call so benchmarks can report WebDriver round trips.
+"""
+import re
+import json
+from collections import Counter
+from html.parser import HTMLParser
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+from scraping.extractor import EXTRACT_SCRIPT, COUNT_SCRIPT
+from scraping.locators import LOCATE_SCRIPT, by
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+BLOCK_TAGS = {
+    "address", "article", "aside", "div", "footer", "h1", "h2", "h3",
+    "h4", "h5", "h6", "header", "li", "main", "nav", "ol", "p",
+    "section", "table", "tbody", "thead", "tr", "ul",
+}
+
+
+class Node:
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.parent = parent
+        self.children = []
+
+    @property
+    def element_children(self):
+        return [c for c in self.children if isinstance(c, Node)]
+
+    def iter_descendants(self):
+        for child in self.children:
+            if isinstance(child, Node):
+                yield child
+                yield from child.iter_descendants()
+
+    def inner_text(self):
+        parts = []
+        self._collect_text(parts)
+        lines = (line.strip() for line in "".join(parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+    def _collect_text(self, parts):
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif child.tag == "br":
+                parts.append("\n")
+            else:
+                block = child.tag in BLOCK_TAGS
+                if block:
+                    parts.append("\n")
+                child._collect_text(parts)
+                if block:
+                    parts.append("\n")
+
+
+class TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document")
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {k: v or "" for k, v in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.children.append(Node(tag, {k: v or "" for k, v in attrs}, self.current))
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def parse_html(html):
+    builder = TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+COMPOUND_RE = re.compile(
+    r"(?P<tag>^[a-zA-Z*][\w-]*)"
+    r"|\.(?P<cls>[\w-]+)"
+    r"|#(?P<id>[\w-]+)"
+    r"|\[(?P<attr>[\w-]+)(?:(?P<op>[*^$~]?=)(?P<q>['\"]?)(?P<val>.*?)(?P=q))?\]"
+    r"|:nth-child\((?P<nth>\d+)\)"
+)
+
+
+def _parse_compound(text):
+    tests, position = [], 0
+    while position < len(text):
+        match = COMPOUND_RE.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unsupported selector: {text}")
+        tests.append({k: v for k, v in match.groupdict().items() if v is not None})
+        position = match.end()
+    return tests
+
+
+def _split_outside_brackets(text, separator):
+    parts, depth, quote, current = [], 0, None, ""
+    for char in text:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif depth == 0 and (char == separator or (separator == " " and char.isspace())):
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    parts.append(current)
+    return [p.strip() for p in parts if p.strip()]
+
+
+def compile_selector(selector):
+    """
+    Compiles a CSS selector list into [[(combinator, tests), ...], ...].
+    Supports tag, .class, #id, [attr], [attr=|*=|^=|$=|~=value],
+    :nth-child(n), and the descendant and child combinators.
+    """
+    compiled = []
+    for complex_selector in _split_outside_brackets(selector, ","):
+        steps, combinator = [], " "
+        for token in _split_outside_brackets(complex_selector.replace(">", " > "), " "):
+            if token == ">":
+                combinator = ">"
+                continue
+            steps.append((combinator, _parse_compound(token)))
+            combinator = " "
+        compiled.append(steps)
+    return compiled
+
+
+def _matches_compound(node, tests):
+    for test in tests:
+        if "tag" in test and test["tag"] != "*" and node.tag != test["tag"].lower():
+            return False
+        if "cls" in test and test["cls"] not in node.attrs.get("class", "").split():
+            return False
+        if "id" in test and node.attrs.get("id") != test["id"]:
+            return False
+        if "attr" in test:
+            if test["attr"] not in node.attrs:
+                return False
+            value, expected, op = node.attrs[test["attr"]], test.get("val"), test.get("op")
+            if op == "=" and value != expected:
+                return False
+            if op == "*=" and expected not in value:
+                return False
+            if op == "^=" and not value.startswith(expected):
+                return False
+            if op == "$=" and not value.endswith(expected):
+                return False
+            if op == "~=" and expected not in value.split():
+                return False
+        if "nth" in test:
+            siblings = node.parent.element_children if node.parent else [node]
+            if siblings.index(node) + 1 != int(test["nth"]):
+                return False
+    return True
+
+
+def _matches(node, steps, scope):
+    combinator, tests = steps[-1]
+    if not _matches_compound(node, tests):
+        return False
+    if len(steps) == 1:
+        return True
+
+    ancestor = node.parent
+    while ancestor is not None and ancestor is not scope:
+        if _matches(ancestor, steps[:-1], scope):
+            return True
+        if combinator == ">":
+            return False
+        ancestor = ancestor.parent
+    return False
+
+
+def query_all(scope, selector):
+    compiled = compile_selector(selector)
+    return [
+        node for node in scope.iter_descendants()
+        if any(_matches(node, steps, scope) for steps in compiled)
+    ]
+
+
+def query_one(scope, selector):
+    compiled = compile_selector(selector)
+    for node in scope.iter_descendants():
+        if any(_matches(node, steps, scope) for steps in compiled):
+            return node
+    return None
+
+
+XPATH_CONTAINS_RE = re.compile(r"^\.?//(\w+|\*)\[contains\(@([\w-]+),\s*'([^']*)'\)\]$")
+XPATH_EQUALS_RE = re.compile(r"^\.?//(\w+|\*)\[@([\w-]+)=['\"]([^'\"]*)['\"]\]$")
+
+
+def to_css(by, value):
+    """
+    Translates a Selenium locator into the CSS subset above.
+    Only simple //tag[contains(@attr, 'v')] and //tag[@attr='v']
+    XPath expressions are supported.
+    """
+    if by == By.CSS_SELECTOR:
+        return value
+    if by == By.CLASS_NAME:
+        return f".{value}"
+    if by == By.ID:
+        return f"#{value}"
+    if by == By.TAG_NAME:
+        return value
+    if by == By.XPATH:
+        match = XPATH_CONTAINS_RE.match(value)
+        if match:
+            return f"{match.group(1)}[{match.group(2)}*='{match.group(3)}']"
+        match = XPATH_EQUALS_RE.match(value)
+        if match:
+            return f"{match.group(1)}[{match.group(2)}='{match.group(3)}']"
+    raise NoSuchElementException(f"Fake driver cannot resolve locator {by}={value}")
+
+
+class FakeElement:
+    def __init__(self, driver, node):
+        self._driver = driver
+        self.node = node
+
+    @property
+    def text(self):
+        self._driver.calls["element.text"] += 1
+        return self.node.inner_text()
+
+    def get_attribute(self, name):
+        self._driver.calls["element.get_attribute"] += 1
+        return self.node.attrs.get(name)
+
+    def find_element(self, by=By.ID, value=None):
+        self._driver.calls["element.find_element"] += 1
+        node = query_one(self.node, to_css(by, value))
+        if node is None:
+            raise NoSuchElementException(f"No element for {by}={value}")
+        return FakeElement(self._driver, node)
+
+    def find_elements(self, by=By.ID, value=None):
+        self._driver.calls["element.find_elements"] += 1
+        return [FakeElement(self._driver, n) for n in query_all(self.node, to_css(by, value))]
+
+
+class FakeDriver:
+    """
+    WebDriver double serving fixture HTML from memory. `pages`
+    maps URLs to HTML; load() sets the current page directly.
+    With `lazy_batch`, only that many table elements are
+    rendered at first and each scroll to the end reveals
+    another batch, like an infinitely scrolling page.
+    """
+
+    def __init__(self, pages=None, lazy_batch=None):
+        self.pages = pages or {}
+        self.lazy_batch = lazy_batch
+        self.visible_rows = lazy_batch
+        self._matched = {}
+        self.calls = Counter()
+        self.document = parse_html("<html><body></body></html>")
+        self.current_url = "about:blank"
+        self.window_handles = ["main"]
+
+    @property
+    def round_trips(self):
+        return sum(self.calls.values())
+
+    def load(self, html, url="fixture://"):
+        self.document = parse_html(html)
+        self._matched = {}
+        self.visible_rows = self.lazy_batch
+        self.current_url = url
+
+    def get(self, url):
+        self.calls["get"] += 1
+        self.load(self.pages.get(url, ""), url)
+
+    def set_window_size(self, width, height):
+        self.calls["set_window_size"] += 1
+
+    def find_element(self, by=By.ID, value=None):
+        self.calls["find_element"] += 1
+        node = query_one(self.document, to_css(by, value))
+        if node is None:
+            raise NoSuchElementException(f"No element for {by}={value}")
+        return FakeElement(self, node)
+
+    def find_elements(self, by=By.ID, value=None):
+        self.calls["find_elements"] += 1
+        return [FakeElement(self, n) for n in query_all(self.document, to_css(by, value))]
+
+    def execute_script(self, script, *args):
+        self.calls["execute_script"] += 1
+        if script == EXTRACT_SCRIPT:
+            return json.dumps(self._extract(*args))
+        if script == COUNT_SCRIPT:
+            return len(self._walked(args[0]))
+        if script == LOCATE_SCRIPT:
+            return self._locate(args[0])
+        if script.strip() == "return 1;":
+            return 1
+        raise NotImplementedError("Fake driver does not run arbitrary scripts.")
+
+    def _read(self, row, field):
+        node = query_one(row, field["selector"]) if field["selector"] else row
+        if node is None:
+            return None
+        if field["attr"]:
+            return node.attrs.get(field["attr"])
+        return node.inner_text()
+
+    def _walked(self, spec):
+        group = spec.get("group")
+        selector = f"{spec['rows']}, {group['selector']}" if group else spec["rows"]
+        # The document only changes on load(), so repeated chunked
+        # extractions reuse the match instead of re-walking the tree
+        if selector not in self._matched:
+            self._matched[selector] = query_all(self.document, selector)
+        nodes = self._matched[selector]
+        return nodes if self.visible_rows is None else nodes[:self.visible_rows]
+
+    def _locate(self, groups):
+        found = {}
+        for name, candidates in groups.items():
+            found[name] = None
+            for selector in candidates:
+                try:
+                    hit = query_one(self.document, to_css(*by(selector)))
+                except NoSuchElementException:
+                    continue
+                if hit is not None:
+                    found[name] = selector
+                    break
+        return {"found": found, "ready": "complete", "nodes": len(self.document.children)}
+
+    def _extract(self, spec, offset=0, limit=None, heading=None, scroll=False):
+        row_filter = spec.get("filter")
+        if row_filter:
+            wanted = set(row_filter["values"])
+            pattern = re.compile(row_filter["pattern"]) if row_filter.get("pattern") else None
+
+        group = spec.get("group")
+        row_steps = compile_selector(spec["rows"])
+        nodes = self._walked(spec)
+        limit = len(nodes) if limit is None else limit
+
+        out, scanned, index = [], 0, offset or 0
+        while index < len(nodes) and scanned < limit:
+            row = nodes[index]
+            index += 1
+            if group and not any(_matches(row, steps, self.document) for steps in row_steps):
+                heading = row.inner_text().strip()
+                continue
+            scanned += 1
+            if row_filter:
+                key = self._read(row, spec["fields"][row_filter["field"]])
+                if key is not None:
+                    key = key.strip()
+                    if pattern:
+                        match = pattern.search(key)
+                        key = (match.group(1) if match.groups() else match.group(0)) if match else None
+                if key not in wanted:
+                    continue
+            record = {name: self._read(row, field) for name, field in spec["fields"].items()}
+            if group:
+                record[group["field"]] = heading
+            out.append(record)
+
+        # Scrolling to the end reveals the next lazily loaded batch
+        if scroll and index >= len(nodes) and self.visible_rows is not None:
+            self.visible_rows += self.lazy_batch
+
+        return {"rows": out, "scanned": scanned, "next": index, "total": len(nodes), "heading": heading}
+
+    def quit(self):
+        self.calls["quit"] += 1
@@ -0,0 +1,165 @@
+"""
+Synthetic TradingView pages with the markup the scrapers target,
+scaled to any row count. Saved pages in tests/fixtures/ (listed in
+RECORDED_PAGES) are used instead when present, and recorded scanner
+responses as tests/fixtures/scanner.json.
+"""
+import os
+import json
+import random
+import datetime
+
+# Saved pages and scanner responses, shared with the tests
+RECORDED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures")
+
+# Benchmark name -> saved page it runs against
+RECORDED_PAGES = {
+    "premarket_data_scraper": "market_movers.html",
+    "parse_market_movers": "market_movers.html",
+}
+
+
+def recorded_fixture(name):
+    """
+    Returns the saved HTML for `name`, or None.
+    """
+    if name not in RECORDED_PAGES:
+        return None
+    path = os.path.join(RECORDED_DIR, RECORDED_PAGES[name])
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _page(body):
+    return f"<!DOCTYPE html><html><head><title>fixture</title></head><body>{body}</body></html>"
+
+
+def market_movers_html(rows, seed=0):
+    rng = random.Random(seed)
+    body = []
+    for i in range(rows):
+        change = rng.uniform(-40, 40)
+        body.append(
+            f"<tr><td><span><a href='/symbols/T{i}/'>T{i:05d}</a>"
+            f"<div>Company {i} Inc</div></span></td>"
+            f"<td><span>{change:+.2f}%</span></td>"
+            f"<td><span>{rng.uniform(1, 500):.2f} USD</span></td></tr>"
+        )
+    return _page(
+        "<div class='tv-category-content'><table><thead><tr><th>Symbol</th><th>Chg %</th>"
+        f"<th>Price</th></tr></thead><tbody>{''.join(body)}</tbody></table></div>"
+    )
+
+
+def recorded_screens():
+    """
+    Returns the saved scanner exchanges, {"source": url,
+    "responses": [{"query": ..., "response": ...}]}, or None.
+    """
+    path = os.path.join(RECORDED_DIR, "scanner.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def scanner_universe(rows, columns, seed=0):
+    """
+    A universe of `rows` symbols with every one of `columns`, for
+    a server that evaluates scanner queries. Roughly one symbol
+    in ten is at a 52-week or all-time extreme, a few have no
+    pre-market quote and a few are not primary listings.
+    """
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        close = rng.uniform(1, 500)
+        high, low = close * rng.uniform(1.0, 1.05), close * rng.uniform(0.95, 1.0)
+        exchange = rng.choice(["NASDAQ", "NYSE", "AMEX"])
+        values = {
+            "type": "stock" if rng.random() > 0.1 else "dr",
+            "exchange": exchange,
+            "is_primary": rng.random() > 0.05,
+            "premarket_change": rng.uniform(-40, 40) if rng.random() > 0.05 else None,
+            "premarket_gap": rng.uniform(-20, 20) if rng.random() > 0.05 else None,
+            "change": rng.uniform(-15, 15),
+            "close": close,
+            "high": high,
+            "low": low,
+            "price_52_week_high": high if rng.random() < 0.1 else high * rng.uniform(1.0, 2.0),
+            "price_52_week_low": low if rng.random() < 0.1 else low * rng.uniform(0.5, 1.0),
+            "High.All": high if rng.random() < 0.03 else high * rng.uniform(1.0, 4.0),
+            "Low.All": low if rng.random() < 0.03 else low * rng.uniform(0.1, 1.0),
+            "volume": rng.randint(1000, 10 ** 8),
+        }
+        data.append({"s": f"{exchange}:T{i:05d}", "d": [values.get(c) for c in columns]})
+    return {"columns": list(columns), "data": data}
+
+
+def earnings_html(rows, tracked=(), seed=0):
+    """
+    Earnings calendar rows. Tickers in `tracked` are spread
+    evenly through the table so filtering has work to do.
+    """
+    rng = random.Random(seed)
+    tracked = list(tracked)
+    step = max(1, rows // (len(tracked) + 1))
+    body = []
+
+    for i in range(rows):
+        if tracked and i % step == step - 1:
+            ticker = tracked.pop(0)
+        else:
+            ticker = f"T{i:05d}"
+        time_title = rng.choice(["Before Open", "After Close", "Time Not Supplied"])
+        body.append(
+            f"<tr class='tv-data-table__row'>"
+            f"<td data-field-key='name'><div>{ticker}D</div><div>Company {i}</div></td>"
+            f"<td data-field-key='earnings_per_share_forecast_next_fq'>{rng.uniform(-1, 5):.2f}USD</td>"
+            f"<td data-field-key='revenue_forecast_next_fq'>{rng.uniform(1, 900):.2f}MUSD</td>"
+            f"<td data-field-key='earnings_release_next_time' title='{time_title}'><span></span></td>"
+            f"</tr>"
+        )
+    return _page(f"<table class='tv-data-table'><tbody>{''.join(body)}</tbody></table>")
+
+
+def econ_html(rows, seed=0, days=5):
+    """
+    Economic calendar items grouped under day titles, as
+    in the "This Week" view.
+    """
+    rng = random.Random(seed)
+    first_day = datetime.date(2026, 10, 19)
+    per_day = max(1, -(-rows // days))
+    body = []
+    for i in range(rows):
+        if i % per_day == 0:
+            title = first_day + datetime.timedelta(days=i // per_day)
+            body.append(f"<div class='dayTitle-c3d4'>{title:%A, %B} {title.day}</div>")
+        body.append(
+            f"<div data-name='economic-calendar-item'>"
+            f"<span class='time-x1'>{rng.randint(0, 23):02d}:30</span>"
+            f"<span class='titleText-a1b2'>Event {i}</span></div>"
+        )
+    return _page(f"<div id='js-category-content'>{''.join(body)}</div>")
+
+
+def with_assets(html, images=40, fonts=4):
+    """
+    Adds the kind of weight a real TradingView page carries:
+    a stylesheet, web fonts, images and an analytics script,
+    all served by benchmarks.browser_profile from /assets/.
+    """
+    head = ["<link rel='stylesheet' href='/assets/site.css'>"]
+    for i in range(fonts):
+        head.append(
+            f"<style>@font-face {{ font-family: f{i}; src: url('/assets/font{i}.woff2'); }}"
+            f" body {{ font-family: f{i}; }}</style>"
+        )
+    head.append("<script async src='/assets/www.google-analytics.com/analytics.js'></script>")
+
+    body = "".join(f"<img src='/assets/logo{i}.png' width='16' height='16'>" for i in range(images))
+    html = html.replace("</head>", "".join(head) + "</head>", 1)
+    return html.replace("</body>", body + "</body>", 1)
@@ -0,0 +1,53 @@
+"""
+Compares cold-start import cost of eagerly importing every
+job module against the Lambda handler resolving a single job.
+
+    python -m benchmarks.import_time [--runs 5] [--job pre_market_gainers]
+"""
+import sys
+import argparse
+import statistics
+import subprocess
+from config.paths import PROJECT_ROOT
+
+SNIPPETS = {
+    "all": "import jobs.earnings, jobs.econ, jobs.market_movers",
+    "lambda": "import lambda_function; from jobs import load_job; load_job({job!r})",
+}
+
+TIMER = "import time; t = time.perf_counter(); {body}; print(time.perf_counter() - t)"
+
+
+def measure(body, runs):
+    """
+    Runs `body` in fresh interpreters and returns
+    the import times in milliseconds.
+    """
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(body=body)],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--job", default="pre_market_gainers")
+    args = parser.parse_args()
+
+    results = {}
+    for name, snippet in SNIPPETS.items():
+        samples = measure(snippet.format(job=args.job), args.runs)
+        results[name] = statistics.median(samples)
+        print(f"{name:>8}: median {results[name]:7.1f} ms  (min {min(samples):.1f}, max {max(samples):.1f})")
+
+    saved = results["all"] - results["lambda"]
+    print(f"Lambda handler for '{args.job}' saves {saved:.1f} ms of import time per cold start.")
+
+
+if __name__ == "__main__":
+    main()
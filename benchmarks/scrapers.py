@@ -0,0 +1,168 @@
+"""
+Offline scraper benchmarks against fixture pages.
+
+    python -m benchmarks.scrapers                   # run and compare with baselines
+    python -m benchmarks.scrapers --save-baseline   # record new baselines
+    python -m benchmarks.scrapers --sizes 10 100    # subset of table sizes
+
+Reports wall time, WebDriver round trips and rows/second (table rows
+scanned) per scraper and table size. Pages are served by the in-memory
+FakeDriver, so wall time measures our extraction and post-processing
+rather than Chrome. A run regresses when it makes more WebDriver calls
+than the baseline, or is slower by more than --tolerance.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import statistics
+from benchmarks.fake_driver import FakeDriver
+from benchmarks.fixtures import (
+    recorded_fixture,
+    market_movers_html,
+    earnings_html,
+    econ_html,
+)
+import scraping.earnings_tradingview as earnings_module
+import scraping.extractor as extractor_module
+from scraping.earnings_tradingview import earnings_to_be_tracked, scrape_earnings_data
+from scraping.econ_scraper import scrape_economics_data, scrape_econ_week
+from scraping.market_movers import premarket_data_scraper
+from scraping.movers_http import parse_market_movers
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+SIZES = (10, 100, 1000, 10000)
+
+# Pin the earnings watchlist so results do not depend on the weekday
+TRACKED = frozenset(earnings_to_be_tracked()["Wednesday"])
+
+SCRAPERS = {
+    "premarket_data_scraper": (premarket_data_scraper, market_movers_html),
+    "scrape_earnings_data": (scrape_earnings_data, lambda n: earnings_html(n, sorted(TRACKED))),
+    # Same table rendered 100 rows at a time as the page scrolls
+    "scrape_earnings_lazy": (scrape_earnings_data, lambda n: earnings_html(n, sorted(TRACKED))),
+    "scrape_economics_data": (scrape_economics_data, econ_html),
+    "scrape_econ_week": (scrape_econ_week, econ_html),
+    # HTTP fast path: no driver involved, parses the raw HTML
+    "parse_market_movers": (None, market_movers_html),
+}
+
+
+DRIVER_OPTIONS = {
+    "scrape_earnings_lazy": {"lazy_batch": 100},
+}
+
+
+def run_case(name, size, repeat):
+    """
+    Runs one scraper against one fixture `repeat` times
+    and returns the median wall time and call count.
+    """
+    scraper, build = SCRAPERS[name]
+    html = recorded_fixture(name) if size is None else build(size)
+    timings, calls, rows_out = [], 0, 0
+
+    for _ in range(repeat):
+        if scraper is None:
+            start = time.perf_counter()
+            rows_out = len(parse_market_movers(html))
+            timings.append(time.perf_counter() - start)
+            continue
+
+        driver = FakeDriver(**DRIVER_OPTIONS.get(name, {}))
+        driver.load(html)
+        start = time.perf_counter()
+        rows_out = len(scraper(driver))
+        timings.append(time.perf_counter() - start)
+        calls = driver.round_trips
+
+    wall = statistics.median(timings)
+    rows_in = size if size is not None else rows_out
+    return {
+        "wall_ms": round(wall * 1000, 3),
+        "calls": calls,
+        "rows_out": rows_out,
+        "rows_per_s": round(rows_in / wall) if wall > 0 else None,
+    }
+
+
+def load_baselines():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(result, baseline, tolerance):
+    """
+    Returns a list of regression messages.
+    """
+    problems = []
+    if result["calls"] > baseline["calls"]:
+        problems.append(f"calls {baseline['calls']} -> {result['calls']}")
+    if result["wall_ms"] > baseline["wall_ms"] * (1 + tolerance):
+        problems.append(f"wall {baseline['wall_ms']:.1f} -> {result['wall_ms']:.1f} ms")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmarks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--scrapers", nargs="+", choices=SCRAPERS, default=list(SCRAPERS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed fractional slowdown before flagging (default 0.5)")
+    parser.add_argument("--recorded", action="store_true",
+                        help="also run the saved pages in tests/fixtures/")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    earnings_module.get_todays_stocks = lambda: TRACKED
+    # Fixture pages never load more rows; do not wait for them
+    extractor_module.LOAD_TIMEOUT = 0
+    baselines = load_baselines()
+    results = {}
+    regressions = []
+
+    print(f"{'scraper':<24}{'rows':>8}{'out':>7}{'wall ms':>12}{'calls':>8}{'rows/s':>12}")
+    for name in args.scrapers:
+        cases = list(args.sizes)
+        if args.recorded and recorded_fixture(name) is not None:
+            cases.append(None)
+
+        for size in cases:
+            label = "recorded" if size is None else str(size)
+            result = run_case(name, size, args.repeat)
+            results.setdefault(name, {})[label] = result
+            print(
+                f"{name:<24}{label:>8}{result['rows_out']:>7}{result['wall_ms']:>12.2f}"
+                f"{result['calls']:>8}{result['rows_per_s'] or 0:>12}"
+            )
+
+            baseline = baselines.get(name, {}).get(label)
+            if baseline and not args.save_baseline:
+                for problem in compare(result, baseline, args.tolerance):
+                    regressions.append(f"{name} @ {label}: {problem}")
+
+    if args.save_baseline:
+        for name, cases in results.items():
+            baselines.setdefault(name, {}).update(cases)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Saved baselines to {BASELINE_PATH}")
+        return 0
+
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""
+Serves scanner responses locally and compares the movers screens
+from the scanner against fetching each movers page's HTML.
+
+    python -m benchmarks.screener [--rows 5000] [--repeat 5] [--synthetic]
+    python -m benchmarks.screener --serve [--port 9500]   # SCREENER_URL=http://127.0.0.1:9500
+    python -m benchmarks.screener --record [--keep 5]     # save SCREENER_URL's responses as the fixture
+
+The replay server answers POST /<market>/scan with the recorded
+response for the same query (tests/fixtures/scanner.json) when
+there is one. Other queries are evaluated against a synthetic
+universe of --rows symbols: filtered, sorted, sliced to the
+requested range and projected onto the requested columns, like the
+real endpoint.
+"""
+import os
+import json
+import math
+import time
+import argparse
+import threading
+import statistics
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from benchmarks.fixtures import RECORDED_DIR, market_movers_html, recorded_screens, scanner_universe
+from scraping.screener import SCREENS, SCREENER_URL, SCREENER_LIMIT, MARKET, get_session, fetch_screens
+from scraping.movers_http import fetch_market_movers
+
+# Every column the universe filter and any screen reads
+COLUMNS = ["type", "exchange", "is_primary", "volume"] + list(dict.fromkeys(
+    column
+    for screen in SCREENS.values()
+    for column in (screen.value, *(screen.where[::2] if screen.where else ()))
+    if isinstance(column, str)
+))
+
+
+def _key(query):
+    return json.dumps(query, sort_keys=True)
+
+
+def _missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+OPERATIONS = {
+    "greater": lambda a, b: a > b,
+    "less": lambda a, b: a < b,
+    "egreater": lambda a, b: a >= b,
+    "eless": lambda a, b: a <= b,
+    "equal": lambda a, b: a == b,
+    "in_range": lambda a, b: a in b,
+}
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Serves scanner responses and movers pages, counting
+    the requests and response bytes it sends.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, universe=None, recorded=None, pages=None, port=0):
+        super().__init__(("127.0.0.1", port), ReplayHandler)
+        self.universe = universe
+        self.index = {column: i for i, column in enumerate(universe["columns"])} if universe else {}
+        self.recorded = {
+            _key(exchange["query"]): exchange["response"]
+            for exchange in (recorded or {}).get("responses", [])
+        }
+        self.pages = pages or {}
+        self.requests = 0
+        self.bytes = 0
+        self.replayed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, size):
+        with self._lock:
+            self.requests += 1
+            self.bytes += size
+
+    def reset(self):
+        with self._lock:
+            served = (self.requests, self.bytes)
+            self.requests, self.bytes = 0, 0
+        return served
+
+    def answer(self, query):
+        """
+        Returns the response to `query`, or None when it is
+        neither recorded nor answerable from the universe.
+        """
+        recorded = self.recorded.get(_key(query))
+        if recorded is not None:
+            with self._lock:
+                self.replayed += 1
+            return recorded
+        if self.universe is None:
+            return None
+        return self.evaluate(query)
+
+    def evaluate(self, query):
+        columns = query.get("columns") or []
+        filters = query.get("filter") or []
+        sort = query.get("sort") or {}
+        referenced = columns + [f["left"] for f in filters] + ([sort["sortBy"]] if sort else [])
+        if any(column not in self.index for column in referenced):
+            return None
+
+        def cell(row, column):
+            return row["d"][self.index[column]]
+
+        def matches(row, f):
+            left = cell(row, f["left"])
+            if f["operation"] == "nempty":
+                return not _missing(left)
+            right = f.get("right")
+            if isinstance(right, str) and right in self.index:
+                right = cell(row, right)
+            if _missing(left) or _missing(right):
+                return False
+            return OPERATIONS[f["operation"]](left, right)
+
+        rows = [row for row in self.universe["data"] if all(matches(row, f) for f in filters)]
+        if sort:
+            rows = [row for row in rows if not _missing(cell(row, sort["sortBy"]))]
+            rows.sort(key=lambda row: cell(row, sort["sortBy"]), reverse=sort.get("sortOrder") == "desc")
+
+        start, end = (query.get("range") or [0, len(rows)])[:2]
+        picks = [self.index[column] for column in columns]
+        return {
+            "totalCount": len(rows),
+            "data": [{"s": row["s"], "d": [row["d"][i] for i in picks]} for row in rows[start:end]],
+        }
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path.strip("/") != f"{MARKET}/scan":
+            self._send(404, "text/plain", b"not found")
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            query = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, "application/json", b'{"error": "bad json"}')
+            return
+
+        response = self.server.answer(query)
+        if response is None:
+            self._send(400, "application/json", b'{"error": "Unknown field or unrecorded query"}')
+            return
+        self._send(200, "application/json", json.dumps(response).encode())
+
+    def do_GET(self):
+        path = self.path.strip("/")
+        if path in self.server.pages:
+            self._send(200, "text/html; charset=utf-8", self.server.pages[path].encode())
+        else:
+            self._send(404, "text/plain", b"not found")
+
+    def _send(self, status, content_type, body):
+        self.server.count(len(body))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def record(path, base_url, limit=SCREENER_LIMIT, keep=5):
+    """
+    Saves the response `base_url` gives to every screen's
+    query as the replay fixture, trimmed to its first `keep`
+    rows so the fixture stays small enough to review.
+    """
+    responses = []
+    for name, screen in SCREENS.items():
+        query = screen.query(limit)
+        response = get_session().post(f"{base_url.rstrip('/')}/{MARKET}/scan", json=query, timeout=30)
+        response.raise_for_status()
+        payload = response.json()
+        payload["data"] = (payload.get("data") or [])[:keep]
+        responses.append({"screen": name, "query": query, "response": payload})
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"source": base_url, "responses": responses}, f, indent=1, ensure_ascii=False)
+        f.write("\n")
+    print(f"Recorded {len(responses)} screens from {base_url} to {path}")
+
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("--source", default=SCREENER_URL, help="scanner to record from")
+    parser.add_argument("--keep", type=int, default=5, help="rows kept per recorded screen")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="ignore the recorded fixture and answer every query from the universe")
+    args = parser.parse_args()
+
+    if args.record:
+        record(os.path.join(RECORDED_DIR, "scanner.json"), args.source, keep=args.keep)
+        return
+
+    recorded = None if args.synthetic else recorded_screens()
+    pages = {name: market_movers_html(100, seed=i) for i, name in enumerate(SCREENS)}
+    server = ReplayServer(scanner_universe(args.rows, COLUMNS), recorded, pages, port=args.port)
+
+    if args.serve:
+        print(f"Serving {len(server.recorded)} recorded queries and {args.rows} synthetic symbols at {server.base_url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        names = list(SCREENS)
+        scan_ms, results = timed(lambda: fetch_screens(names, base_url=server.base_url), args.repeat)
+        scan_requests, scan_bytes = server.reset()
+
+        html_ms, _ = timed(
+            lambda: [fetch_market_movers(f"{server.base_url}/{name}") for name in names], args.repeat
+        )
+        html_requests, html_bytes = server.reset()
+
+        source = f"recorded from {recorded['source']}" if server.replayed else f"{args.rows} synthetic symbols"
+        print(f"{len(names)} screens, {source}")
+        print(f"{'source':<10}{'ms':>10}{'requests':>10}{'KB':>10}")
+        print(f"{'scanner':<10}{scan_ms:>10.1f}{scan_requests / args.repeat:>10.1f}{scan_bytes / args.repeat / 1024:>10.1f}")
+        print(f"{'html':<10}{html_ms:>10.1f}{html_requests / args.repeat:>10.1f}{html_bytes / args.repeat / 1024:>10.1f}")
+        for name, rows in results.items():
+            print(f"  {name:<20}{len(rows or []):>5} rows  {', '.join(f'{r.ticker} {r.change}' for r in (rows or [])[:3])}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
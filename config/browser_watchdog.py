@@ -0,0 +1,224 @@
+import os
+import time
+import threading
+import psutil
+from config.logger import setup_logging
+
+logging = setup_logging("BrowserWatchdog")
+
+WATCHDOG_ENABLED = os.getenv("BROWSER_WATCHDOG", "1") == "1"
+CHECK_INTERVAL = float(os.getenv("BROWSER_WATCHDOG_INTERVAL", "60"))
+MAX_RSS_MB = float(os.getenv("DRIVER_MAX_RSS_MB", "1536"))
+MAX_BORROW_SECONDS = float(os.getenv("DRIVER_MAX_BORROW_SECONDS", "900"))
+
+# Seconds an untracked browser of ours may exist before it is
+# treated as leaked, so a session still starting is never reaped
+LAUNCH_GRACE = 120
+
+# Set in the chromedriver environment (and so inherited by Chrome)
+# to "<pid>:<start time>" of the process that launched it.
+OWNER_ENV = "FINANCETWEETBOT_BROWSER_OWNER"
+
+BROWSER_NAMES = ("chromedriver", "chrome", "chromium")
+
+
+def owner_tag(pid=None):
+    """
+    Returns the owner marker for process `pid` (default: this one).
+    """
+    proc = psutil.Process(pid or os.getpid())
+    return f"{proc.pid}:{int(proc.create_time())}"
+
+
+def browser_env():
+    """
+    Returns the environment to launch chromedriver with, tagged
+    so its browsers can be traced back to this process.
+    """
+    return dict(os.environ, **{OWNER_ENV: owner_tag()})
+
+
+def _owner_alive(tag):
+    try:
+        return owner_tag(int(tag.split(":")[0])) == tag
+    except (ValueError, psutil.Error):
+        return False
+
+
+def _is_browser(name):
+    name = (name or "").lower()
+    return any(browser in name for browser in BROWSER_NAMES)
+
+
+def session_processes(root_pid):
+    """
+    Returns chromedriver `root_pid` and every Chrome process
+    below it as psutil.Process objects, which remember their
+    start time so a reused pid is never mistaken for them.
+    """
+    try:
+        root = psutil.Process(root_pid)
+        return {root, *root.children(recursive=True)}
+    except psutil.Error:
+        return set()
+
+
+def browser_processes(root_pid):
+    """
+    Returns the Chrome and chromedriver processes at or
+    below `root_pid`.
+    """
+    browsers = set()
+    for proc in session_processes(root_pid):
+        try:
+            if _is_browser(proc.name()):
+                browsers.add(proc)
+        except psutil.Error:
+            continue
+    return browsers
+
+
+def rss_mb(procs):
+    """
+    Returns the combined resident memory of `procs` in MB.
+    """
+    total = 0
+    for proc in procs:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+def kill_processes(procs, timeout=5):
+    """
+    Terminates those of `procs` still running (psutil checks
+    a pid has not been reused), then kills whatever is left
+    after `timeout` seconds. Returns the number running.
+    """
+    procs = [proc for proc in procs if proc.is_running()]
+
+    for proc in procs:
+        try:
+            proc.terminate()
+        except psutil.Error:
+            pass
+
+    _, alive = psutil.wait_procs(procs, timeout=timeout)
+    for proc in alive:
+        try:
+            proc.kill()
+        except psutil.Error:
+            pass
+
+    return len(procs)
+
+
+def find_orphans(tracked=(), now=None):
+    """
+    Returns the browser processes launched by this bot that
+    nothing owns any more: those whose launching process has
+    exited, and those of this process that no session tracks
+    and that are older than LAUNCH_GRACE.
+    """
+    now = now or time.time()
+    me = owner_tag()
+    tracked = set(tracked)
+    orphans = set()
+
+    for proc in psutil.process_iter(["pid", "name", "create_time"]):
+        if proc in tracked or not _is_browser(proc.info["name"]):
+            continue
+
+        try:
+            tag = proc.environ().get(OWNER_ENV)
+        except psutil.Error:
+            continue
+
+        if tag is None:
+            continue
+        if tag == me:
+            if now - proc.info["create_time"] > LAUNCH_GRACE:
+                orphans.add(proc)
+        elif not _owner_alive(tag):
+            orphans.add(proc)
+
+    return orphans
+
+
+def reap_orphans(tracked=()):
+    """
+    Kills leaked browser processes (see find_orphans)
+    and returns how many were killed.
+    """
+    try:
+        orphans = find_orphans(tracked)
+    except psutil.Error as e:
+        logging.warning(f"Could not scan for orphaned browsers: {e}")
+        return 0
+
+    if not orphans:
+        return 0
+
+    killed = kill_processes(orphans)
+    pids = ", ".join(str(proc.pid) for proc in sorted(orphans, key=lambda p: p.pid))
+    logging.warning(f"Reaped {killed} orphaned browser process(es): {pids}.")
+    return killed
+
+
+class BrowserWatchdog:
+    """
+    Background thread that reaps orphaned browsers, evicts
+    idle pool sessions and kills sessions using more than
+    `max_rss_mb` of memory or borrowed for longer than
+    `max_borrow_seconds`.
+    """
+
+    def __init__(self, pool, interval=CHECK_INTERVAL, max_rss_mb=MAX_RSS_MB,
+                 max_borrow_seconds=MAX_BORROW_SECONDS):
+        self.pool = pool
+        self.interval = interval
+        self.max_rss_mb = max_rss_mb
+        self.max_borrow_seconds = max_borrow_seconds
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Reaps browsers left behind by earlier runs, then
+        starts checking every `interval` seconds.
+        """
+        reap_orphans(self.pool.tracked_processes())
+        self._thread = threading.Thread(target=self.run, name="browser-watchdog", daemon=True)
+        self._thread.start()
+        return self
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logging.error(f"Browser watchdog check failed: {e}")
+
+    def check(self):
+        """
+        Quits sessions idle past the pool's timeout, enforces
+        the caps on the rest, then reaps anything no session owns.
+        """
+        self.pool.evict_idle()
+        now = time.monotonic()
+
+        for session, borrowed_at in self.pool.sessions():
+            if borrowed_at is not None and now - borrowed_at > self.max_borrow_seconds:
+                self.pool.kill(session, f"borrowed for over {self.max_borrow_seconds:.0f}s")
+                continue
+
+            used = rss_mb(session.refresh_processes())
+            if used > self.max_rss_mb:
+                self.pool.kill(session, f"using {used:.0f} MB, over {self.max_rss_mb:.0f} MB")
+
+        reap_orphans(self.pool.tracked_processes())
+
+    def stop(self):
+        self._stop.set()
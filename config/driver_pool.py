@@ -0,0 +1,306 @@
+import os
+import time
+import atexit
+import threading
+from config.chrome_options import chrome_options
+from config.browser_watchdog import WATCHDOG_ENABLED, BrowserWatchdog, kill_processes, session_processes
+from config.logger import setup_logging
+from config.tracing import span
+
+logging = setup_logging("DriverPool")
+
+POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "2"))
+MAX_USES = int(os.getenv("DRIVER_MAX_USES", "25"))
+IDLE_TIMEOUT = float(os.getenv("DRIVER_IDLE_TIMEOUT", "600"))
+BASE_DEBUG_PORT = int(os.getenv("DRIVER_BASE_DEBUG_PORT", "9222"))
+
+
+class PooledSession:
+    """
+    A warm Chrome session owned by the pool.
+    """
+
+    def __init__(self, driver, port):
+        self.driver = driver
+        self.port = port
+        self.uses = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.borrowed_at = None
+        self.killed = False
+        service = getattr(driver, "service", None)
+        self.root_pid = getattr(getattr(service, "process", None), "pid", None)
+        self.processes = set()
+        self.refresh_processes()
+
+    def refresh_processes(self):
+        """
+        Adds the session's current browser processes to those
+        it has ever owned and returns the current ones.
+        """
+        if self.root_pid is None:
+            return set()
+        current = session_processes(self.root_pid)
+        self.processes |= current
+        return current
+
+
+class DriverPool:
+    """
+    Keeps up to `size` warm Chrome sessions, each on its
+    own remote debugging port, and hands them out to jobs.
+    Sessions are health checked on borrow, recycled after
+    `max_uses` borrows and quit after `idle_timeout` seconds idle.
+    """
+
+    def __init__(self, size=POOL_SIZE, max_uses=MAX_USES,
+                 idle_timeout=IDLE_TIMEOUT, base_port=BASE_DEBUG_PORT,
+                 factory=chrome_options):
+        self.size = size
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self.factory = factory
+        self._idle = []
+        self._in_use = {}
+        self._free_ports = list(range(base_port + size - 1, base_port - 1, -1))
+        self._closed = False
+        self._lock = threading.Condition()
+
+    def borrow(self, timeout=60):
+        """
+        Returns a healthy driver, reusing an idle session when
+        one exists and starting a new one while ports are free.
+        Blocks up to `timeout` seconds when the pool is exhausted.
+        """
+        deadline = time.monotonic() + timeout
+
+        while True:
+            session, port = None, None
+            self.evict_idle()
+
+            with self._lock:
+                while not self._closed and not self._idle and not self._free_ports:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No browser session free after {timeout}s.")
+                    self._lock.wait(remaining)
+
+                if self._closed:
+                    raise RuntimeError("The browser pool is closed.")
+                if self._idle:
+                    session = self._idle.pop()
+                else:
+                    port = self._free_ports.pop()
+
+            if session is not None:
+                if self._is_healthy(session):
+                    return self._check_out(session)
+                logging.info(f"Discarding unhealthy session on port {session.port}.")
+                self._discard(session)
+                continue
+
+            try:
+                logging.info(f"Starting browser session on debug port {port}.")
+                with span("browser_launch"):
+                    driver = self.factory(debug_port=port)
+            except Exception:
+                with self._lock:
+                    self._free_ports.append(port)
+                    self._lock.notify()
+                raise
+
+            return self._check_out(PooledSession(driver, port))
+
+    def release(self, driver, healthy=True):
+        """
+        Returns a borrowed driver to the pool. Sessions that are
+        broken or have reached `max_uses`, or are released after
+        the pool is closed, are quit instead.
+        """
+        if driver is None:
+            return
+
+        with self._lock:
+            session = self._in_use.pop(id(driver), None)
+            if session is not None:
+                session.borrowed_at = None
+
+        if session is None:
+            logging.warning("Released a driver the pool does not own; quitting it.")
+            _quit(driver)
+            return
+
+        session.uses += 1
+        session.last_used = time.monotonic()
+
+        if session.killed:
+            self._discard(session)
+            return
+
+        if not healthy or session.uses >= self.max_uses or not self._reset(session):
+            logging.info(f"Recycling session on port {session.port} after {session.uses} uses.")
+            self._discard(session)
+            return
+
+        with self._lock:
+            if not self._closed:
+                self._idle.append(session)
+                self._lock.notify()
+                return
+
+        self._discard(session)
+
+    def evict_idle(self):
+        """
+        Quits sessions that have been idle longer than `idle_timeout`.
+        Called on every borrow and periodically by the watchdog. The
+        sessions leave the pool under the lock but are quit after it
+        is released, so borrowers are not held up by a slow quit.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [s for s in self._idle if now - s.last_used > self.idle_timeout]
+            if expired:
+                self._idle = [s for s in self._idle if s not in expired]
+
+        for session in expired:
+            logging.info(f"Evicting idle session on port {session.port}.")
+            self._discard(session)
+
+    def close(self):
+        """
+        Quits every idle session. Borrowed sessions are
+        quit when they are released, and borrow() raises
+        from then on.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._closed = True
+            self._lock.notify_all()
+
+        for session in idle:
+            self._discard(session)
+
+    def shutdown(self):
+        """
+        Closes the pool and kills every browser process it
+        still owns, borrowed or not. Called at exit.
+        """
+        self.close()
+        kill_processes(self.tracked_processes())
+
+    def sessions(self):
+        """
+        Returns [(session, borrowed_at)] for every live session,
+        with borrowed_at read under the lock (None when idle) so
+        a concurrent release cannot clear it under the caller.
+        """
+        with self._lock:
+            return [(s, None) for s in self._idle] + [(s, s.borrowed_at) for s in self._in_use.values()]
+
+    def tracked_processes(self):
+        """
+        Returns every browser process the pool's sessions own.
+        """
+        processes = set()
+        for session, _ in self.sessions():
+            session.refresh_processes()
+            processes |= session.processes
+        return processes
+
+    def kill(self, session, reason):
+        """
+        Kills a session's browser processes. An idle session
+        leaves the pool at once; a borrowed one fails on its
+        next command and is discarded when released.
+        """
+        logging.warning(f"Killing browser session on port {session.port}: {reason}.")
+        session.killed = True
+        session.refresh_processes()
+        kill_processes(session.processes)
+
+        with self._lock:
+            if session not in self._idle:
+                return
+            self._idle.remove(session)
+
+        self._discard(session)
+
+    def _check_out(self, session):
+        with self._lock:
+            session.borrowed_at = time.monotonic()
+            self._in_use[id(session.driver)] = session
+        return session.driver
+
+    def _discard(self, session):
+        # quit() can leave Chrome running when the session has hung
+        session.refresh_processes()
+        if not session.killed:
+            _quit(session.driver)
+        kill_processes(session.processes)
+        with self._lock:
+            self._free_ports.append(session.port)
+            self._lock.notify()
+
+    def _is_healthy(self, session):
+        try:
+            return session.driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def _reset(self, session):
+        """
+        Closes extra tabs and parks the session on a blank page
+        so the next borrower starts from a clean state.
+        """
+        try:
+            driver = session.driver
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            logging.warning(f"Failed to reset session on port {session.port}: {e}")
+            return False
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        logging.warning(f"Error quitting WebDriver: {e}")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Returns the process-wide driver pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.shutdown)
+            if WATCHDOG_ENABLED:
+                BrowserWatchdog(_pool).start()
+        return _pool
+
+
+def borrow_driver(timeout=60):
+    """
+    Borrows a warm WebDriver from the shared pool.
+    """
+    return get_pool().borrow(timeout=timeout)
+
+
+def release_driver(driver, healthy=True):
+    """
+    Returns a WebDriver to the shared pool.
+    """
+    get_pool().release(driver, healthy=healthy)
@@ -1,16 +1,186 @@
+import os
+import sys
+import copy
+import json
+import queue
+import atexit
 import logging
+import datetime
+import threading
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener
+
+# "json" writes one JSON object per line; "text" the classic format
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+# Row errors of one type logged individually per scrape before the rest are only counted
+ROW_ERRORS_LOGGED = int(os.getenv("LOG_ROW_ERRORS_LOGGED", "1"))
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_queue = queue.Queue()
+_listener = None
+_setup_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as a single line of JSON with the job it
+    was logged from and any `fields` passed through `extra`.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "job": getattr(record, "job", None),
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if getattr(record, "exception", None):
+            entry["exception"] = record.exception
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    The classic line format, with the job name when there is one.
+    """
+
+    def format(self, record):
+        line = super().format(record)
+        job = getattr(record, "job", None)
+        if job:
+            line = line.replace(" [", f" [{job}] [", 1)
+        if getattr(record, "exception", None):
+            line = f"{line}\n{record.exception}"
+        return line
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Hands records to the background writer. The message, the
+    current job and any traceback are resolved here, on the
+    logging thread, so the writer never touches live objects.
+    """
+
+    def prepare(self, record):
+        from config.tracing import current_job
+
+        record = copy.copy(record)
+        record.job = current_job()
+        record.exception = self.formatter.formatException(record.exc_info) if record.exc_info else None
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        return record
+
+
+def _configure(level):
+    global _listener
+
+    if LOG_FORMAT == "text":
+        formatter = TextFormatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+    else:
+        formatter = JsonFormatter()
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(formatter)
+
+    handler = ContextQueueHandler(_queue)
+    handler.setFormatter(logging.Formatter())
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
 
 def setup_logging(name=None, level=logging.INFO):
     """
     Sets up a reusable logger with consistent formatting.
+    The first call routes the root logger through a queue
+    to a background writer thread.
 
     :param name: Optional logger name (default: root logger)
     :param level: Logging level (default: INFO)
     :return: Configured logger instance
     """
-    logging.basicConfig(
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        level=level,
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
+    with _setup_lock:
+        if _listener is None:
+            _configure(level)
     return logging.getLogger(name)
+
+
+def flush_logs():
+    """
+    Blocks until every queued record and span has been written,
+    e.g. before a Lambda invocation returns and is frozen.
+    """
+    if _listener is not None:
+        _queue.join()
+
+    from config.tracing import flush_spans
+
+    flush_spans()
+
+
+class RowErrors:
+    """
+    Collects the per-row errors of one scrape. The first
+    ROW_ERRORS_LOGGED errors of each type are logged as they
+    happen; summary() then logs one line with the counts by
+    type and a sample message for each. Set `rows` to the
+    number of rows processed to include it in the summary.
+    """
+
+    def __init__(self, logger, source, rows=None):
+        self.logger = logger
+        self.source = source
+        self.rows = rows
+        self.counts = Counter()
+        self.samples = {}
+
+    def add(self, error):
+        """
+        Records one failed row.
+        """
+        kind = type(error).__name__
+        self.counts[kind] += 1
+        self.samples.setdefault(kind, str(error))
+        if self.counts[kind] <= ROW_ERRORS_LOGGED:
+            self.logger.warning(f"Error processing {self.source} row: {kind}: {error}")
+
+    def summary(self):
+        """
+        Logs the aggregate, if any row failed.
+        """
+        failed = sum(self.counts.values())
+        if not failed:
+            return
+
+        by_type = ", ".join(f"{kind} x{count}" for kind, count in self.counts.most_common())
+        of_rows = f" of {self.rows}" if self.rows is not None else ""
+        self.logger.error(
+            f"{failed}{of_rows} {self.source} rows failed ({by_type}).",
+            extra={"fields": {
+                "source": self.source,
+                "rows": self.rows,
+                "failed": failed,
+                "errors": dict(self.counts),
+                "samples": self.samples,
+            }},
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.summary()
+        return False
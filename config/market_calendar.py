@@ -0,0 +1,113 @@
+import datetime
+import functools
+from zoneinfo import ZoneInfo
+
+MARKET_TZ = ZoneInfo("America/New_York")
+
+
+def market_now():
+    """
+    Returns the current time in New York.
+    """
+    return datetime.datetime.now(MARKET_TZ)
+
+
+def trading_date(now=None):
+    """
+    Returns the New York calendar date the
+    given (or current) moment belongs to.
+    """
+    now = now or market_now()
+    return now.astimezone(MARKET_TZ).date()
+
+
+def _easter(year):
+    """
+    Gregorian Easter Sunday (anonymous computus).
+    """
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def _nth_weekday(year, month, weekday, n):
+    """
+    The n-th `weekday` (0 = Monday) of a month; n = -1 is the last.
+    """
+    if n > 0:
+        first = datetime.date(year, month, 1)
+        return first + datetime.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day):
+    """
+    Saturday holidays are observed on Friday, Sunday ones on Monday.
+    """
+    if day.weekday() == 5:
+        return day - datetime.timedelta(days=1)
+    if day.weekday() == 6:
+        return day + datetime.timedelta(days=1)
+    return day
+
+
+@functools.lru_cache(maxsize=None)
+def nyse_holidays(year):
+    """
+    Returns {date: name} of full-day NYSE closures in `year`,
+    computed from the exchange's standing holiday rules.
+    One-off closures are not included.
+    """
+    holidays = {
+        _nth_weekday(year, 1, 0, 3): "Martin Luther King Jr. Day",
+        _nth_weekday(year, 2, 0, 3): "Washington's Birthday",
+        _easter(year) - datetime.timedelta(days=2): "Good Friday",
+        _nth_weekday(year, 5, 0, -1): "Memorial Day",
+        _observed(datetime.date(year, 7, 4)): "Independence Day",
+        _nth_weekday(year, 9, 0, 1): "Labor Day",
+        _nth_weekday(year, 11, 3, 4): "Thanksgiving Day",
+        _observed(datetime.date(year, 12, 25)): "Christmas Day",
+    }
+
+    # NYSE does not close on Friday Dec 31 for a Saturday New Year's Day
+    new_year = datetime.date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays[_observed(new_year)] = "New Year's Day"
+
+    if year >= 2022:
+        holidays[_observed(datetime.date(year, 6, 19))] = "Juneteenth"
+
+    return holidays
+
+
+def is_trading_day(day):
+    """
+    True when NYSE holds a regular session on `day`.
+    """
+    return day.weekday() < 5 and day not in nyse_holidays(day.year)
+
+
+def next_trading_day(day):
+    """
+    Returns the first trading day strictly after `day`.
+    """
+    day += datetime.timedelta(days=1)
+    while not is_trading_day(day):
+        day += datetime.timedelta(days=1)
+    return day
+
+
+def before_trading_day(day):
+    """
+    True when the day after `day` is a trading day. Used by
+    evening jobs that preview the next session.
+    """
+    return is_trading_day(day + datetime.timedelta(days=1))
@@ -0,0 +1,21 @@
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def data_dir(*parts):
+    """
+    Returns (and creates) a directory for local bot state.
+    Defaults to ./data, or /tmp on AWS Lambda where it is
+    the only writable path. Override with BOT_DATA_DIR.
+    """
+    if os.getenv("BOT_DATA_DIR"):
+        root = os.getenv("BOT_DATA_DIR")
+    elif os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+        root = "/tmp/financetweetbot"
+    else:
+        root = os.path.join(PROJECT_ROOT, "data")
+
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,298 @@
+import os
+import json
+import time
+import queue
+import atexit
+import functools
+import threading
+import contextvars
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from logging import Formatter, makeLogRecord
+from logging.handlers import QueueListener, RotatingFileHandler
+from config.logger import setup_logging
+from config.paths import data_dir
+
+logging = setup_logging("Tracing")
+
+WINDOW = int(os.getenv("TRACING_WINDOW", "500"))
+RSS_SAMPLE_INTERVAL = float(os.getenv("TRACING_RSS_INTERVAL", "1.0"))
+
+# spans.jsonl rolls over to spans.jsonl.1 .. .N at this size
+SPANS_MAX_BYTES = int(os.getenv("TRACING_SPANS_MAX_BYTES", str(10 * 1024 * 1024)))
+SPANS_BACKUPS = int(os.getenv("TRACING_SPANS_BACKUPS", "3"))
+
+_current_job = contextvars.ContextVar("current_job", default=None)
+_durations = defaultdict(lambda: deque(maxlen=WINDOW))
+_counters = defaultdict(float)
+_rss_peaks = {}
+_lock = threading.Lock()
+
+_span_queue = queue.Queue()
+_span_listener = None
+_span_setup_lock = threading.Lock()
+
+
+class Span:
+    """
+    One timed phase of a job. Attach counts such as
+    rows or retries with set() and incr().
+    """
+
+    def __init__(self, job, phase):
+        self.job = job
+        self.phase = phase
+        self.fields = {}
+        self.start = time.perf_counter()
+        self.duration = None
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def incr(self, name, amount=1):
+        self.fields[name] = self.fields.get(name, 0) + amount
+
+
+def current_job():
+    """
+    Returns the name of the job running in this context.
+    """
+    return _current_job.get()
+
+
+@contextmanager
+def span(phase, job=None):
+    """
+    Times a phase of the current job and records it
+    when the block exits, even on error.
+    """
+    current = Span(job or current_job() or "-", phase)
+    try:
+        yield current
+    except Exception as e:
+        current.set(error=type(e).__name__)
+        raise
+    finally:
+        current.duration = time.perf_counter() - current.start
+        _record(current)
+
+
+def traced(phase):
+    """
+    Decorator form of span() for scraper functions.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(phase) as current:
+                result = func(*args, **kwargs)
+                if isinstance(result, (list, dict)):
+                    current.set(rows=len(result))
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def traced_job(name):
+    """
+    Marks a function as job `name`: everything it calls is
+    attributed to the job, the whole run is recorded as the
+    "total" phase along with peak Chrome RSS, and the metric
+    files are rewritten when it finishes.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _current_job.set(name)
+            sampler = RssSampler()
+            sampler.start()
+            try:
+                with span("total") as current:
+                    try:
+                        return func(*args, **kwargs)
+                    finally:
+                        peak = sampler.stop()
+                        if peak is not None:
+                            current.set(chrome_rss_peak_bytes=peak)
+                            with _lock:
+                                _rss_peaks[name] = peak
+            finally:
+                _current_job.reset(token)
+                export_prometheus()
+
+        return wrapper
+
+    return decorator
+
+
+def _record(current):
+    labels = (current.job, current.phase)
+    with _lock:
+        _durations[labels].append(current.duration)
+        _counters[labels + ("count",)] += 1
+        _counters[labels + ("sum",)] += current.duration
+        for name, value in current.fields.items():
+            if isinstance(value, (int, float)) and name != "chrome_rss_peak_bytes":
+                _counters[labels + (name,)] += value
+
+    line = {
+        "ts": time.time(),
+        "job": current.job,
+        "phase": current.phase,
+        "duration_ms": round(current.duration * 1000, 2),
+        **current.fields,
+    }
+    if _start_span_writer():
+        _span_queue.put_nowait(makeLogRecord({"msg": json.dumps(line, default=str)}))
+
+
+def _start_span_writer():
+    """
+    Starts the background thread that appends spans to
+    metrics/spans.jsonl, rotating it at SPANS_MAX_BYTES, so a
+    span never waits on disk. Returns False if it cannot.
+    """
+    global _span_listener
+    with _span_setup_lock:
+        if _span_listener is None:
+            try:
+                output = RotatingFileHandler(
+                    os.path.join(data_dir("metrics"), "spans.jsonl"),
+                    maxBytes=SPANS_MAX_BYTES,
+                    backupCount=SPANS_BACKUPS,
+                    encoding="utf-8",
+                    delay=True,
+                )
+            except OSError as e:
+                logging.warning(f"Failed to open the span log: {e}")
+                return False
+            output.setFormatter(Formatter("%(message)s"))
+            _span_listener = QueueListener(_span_queue, output)
+            _span_listener.start()
+            atexit.register(_span_listener.stop)
+    return True
+
+
+def flush_spans():
+    """
+    Blocks until every recorded span has been written.
+    """
+    if _span_listener is not None:
+        _span_queue.join()
+
+
+def _quantile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summary():
+    """
+    Returns {job: {phase: {"p50", "p95", "count"}}} over the
+    most recent TRACING_WINDOW runs of each phase.
+    """
+    with _lock:
+        snapshot = {labels: list(values) for labels, values in _durations.items()}
+
+    result = defaultdict(dict)
+    for (job, phase), values in snapshot.items():
+        result[job][phase] = {
+            "p50": _quantile(values, 0.5),
+            "p95": _quantile(values, 0.95),
+            "count": len(values),
+        }
+    return dict(result)
+
+
+def export_prometheus(path=None):
+    """
+    Writes every metric in Prometheus text exposition format,
+    for node_exporter's textfile collector.
+    """
+    path = path or os.path.join(data_dir("metrics"), "financetweetbot.prom")
+    lines = [
+        "# HELP financetweetbot_phase_duration_seconds Duration of job phases.",
+        "# TYPE financetweetbot_phase_duration_seconds summary",
+    ]
+
+    with _lock:
+        snapshot = {labels: list(values) for labels, values in _durations.items()}
+        counters = dict(_counters)
+        peaks = dict(_rss_peaks)
+
+    for (job, phase), values in sorted(snapshot.items()):
+        labels = f'job="{job}",phase="{phase}"'
+        for q in (0.5, 0.95):
+            lines.append(f'financetweetbot_phase_duration_seconds{{{labels},quantile="{q}"}} {_quantile(values, q):.6f}')
+        lines.append(f"financetweetbot_phase_duration_seconds_sum{{{labels}}} {counters[(job, phase, 'sum')]:.6f}")
+        lines.append(f"financetweetbot_phase_duration_seconds_count{{{labels}}} {counters[(job, phase, 'count')]:.0f}")
+
+    extra = sorted(k for k in counters if k[2] not in ("sum", "count"))
+    if extra:
+        lines.append("# HELP financetweetbot_phase_total Counts recorded by job phases (rows, retries, ...).")
+        lines.append("# TYPE financetweetbot_phase_total counter")
+        for job, phase, name in extra:
+            lines.append(f'financetweetbot_phase_total{{job="{job}",phase="{phase}",name="{name}"}} {counters[(job, phase, name)]:.0f}')
+
+    if peaks:
+        lines.append("# HELP financetweetbot_chrome_rss_peak_bytes Peak Chrome RSS during the last run of a job.")
+        lines.append("# TYPE financetweetbot_chrome_rss_peak_bytes gauge")
+        for job, peak in sorted(peaks.items()):
+            lines.append(f'financetweetbot_chrome_rss_peak_bytes{{job="{job}"}} {peak}')
+
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.warning(f"Failed to write Prometheus metrics: {e}")
+
+
+def chrome_rss_bytes():
+    """
+    Returns the summed RSS of the Chrome and chromedriver
+    processes started by this process, in bytes.
+    """
+    from config.browser_watchdog import browser_processes, rss_mb
+
+    return round(rss_mb(browser_processes(os.getpid())) * 1024 * 1024)
+
+
+class RssSampler(threading.Thread):
+    """
+    Samples Chrome RSS in the background and keeps the peak.
+    """
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.interval = interval
+        self.peak = None
+        self._stopping = threading.Event()
+
+    def run(self):
+        while True:
+            self._sample()
+            if self._stopping.wait(self.interval):
+                break
+
+    def _sample(self):
+        try:
+            value = chrome_rss_bytes()
+        except Exception:
+            value = None
+        if value is not None:
+            self.peak = value if self.peak is None else max(self.peak, value)
+
+    def stop(self):
+        self._stopping.set()
+        self.join(timeout=self.interval + 1)
+        self._sample()
+        return self.peak
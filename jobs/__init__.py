@@ -0,0 +1,118 @@
+import os
+import time
+import importlib
+from config.logger import setup_logging
+from config.tracing import current_job, span
+
+logging = setup_logging("Jobs")
+
+MAX_AGE = float(os.getenv("JOB_MAX_AGE", "300"))
+
+# Job name -> "module:function" of the job's prepare function, which
+# scrapes and formats and returns the posts to send. Modules are imported
+# only when a job is run, so a process that runs one job never pays for
+# the others' scrapers and their dependencies.
+JOBS = {
+    "pre_market_earnings": "jobs.earnings:prepare_pre_market_earnings",
+    "after_hours_earnings": "jobs.earnings:prepare_after_hours_earnings",
+    "daily_econ": "jobs.econ:prepare_daily_econ",
+    "weekly_econ": "jobs.econ:prepare_weekly_econ",
+    "pre_market_gainers": "jobs.market_movers:prepare_pre_market_gainers",
+    "pre_market_losers": "jobs.market_movers:prepare_pre_market_losers",
+    "pre_market_gap": "jobs.market_movers:prepare_gap",
+    "week_high_52": "jobs.market_movers:prepare_week_high_52",
+    "week_low_52": "jobs.market_movers:prepare_week_low_52",
+    "all_time_high": "jobs.market_movers:prepare_all_time_high",
+    "all_time_low": "jobs.market_movers:prepare_all_time_low",
+    "market_close": "jobs.market_movers:prepare_market_close",
+}
+
+
+class Prepared:
+    """
+    The posts a job's prepare phase built, waiting to be
+    committed. `posts` is a list of tweets or reply threads,
+    or None when the scrape failed.
+    """
+
+    def __init__(self, job, posts):
+        self.job = job
+        self.posts = posts
+        self.prepared_at = time.monotonic()
+
+    def age(self):
+        return time.monotonic() - self.prepared_at
+
+
+def load_job(name):
+    """
+    Imports and returns the prepare function for job `name`.
+    """
+    if name not in JOBS:
+        raise ValueError(f"Unknown job: {name}")
+
+    module_name, function_name = JOBS[name].split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def prepare(name):
+    """
+    Runs the prepare phase of job `name`: opens the pages,
+    scrapes and formats, but posts nothing.
+    """
+    job = load_job(name)
+    try:
+        posts = job()
+    except Exception as e:
+        logging.error(f"Preparing {name} failed: {e}")
+        posts = None
+    return Prepared(name, posts)
+
+
+def commit(prepared, max_age=MAX_AGE):
+    """
+    Runs the commit phase: queues the prepared posts on the
+    outbox. Posts older than `max_age` seconds, or a failed
+    prepare, are re-validated by preparing once more; if that
+    fails the prepared posts are sent as they are.
+    """
+    with span("commit", job=prepared.job) as current:
+        if prepared.posts is None or prepared.age() > max_age:
+            logging.info(f"Re-validating {prepared.job} (prepared {prepared.age():.0f}s ago).")
+            fresh = prepare(prepared.job)
+            current.set(revalidated=1)
+            if fresh.posts is not None:
+                prepared = fresh
+
+        if prepared.posts is None:
+            logging.error(f"Nothing to commit for {prepared.job}; the scrape failed.")
+            return
+
+        if not prepared.posts:
+            logging.info(f"No posts for {prepared.job}.")
+
+        for post in prepared.posts:
+            send_tweet(post, job=prepared.job)
+        current.set(posts=len(prepared.posts))
+
+
+def run_job(name):
+    """
+    Prepares and immediately commits job `name`.
+    """
+    commit(prepare(name))
+
+
+def send_tweet(tweet_text, job=None):
+    """
+    Queues a tweet, or a thread of tweets, on the durable
+    outbox. The outbox worker posts it, so a slow API
+    never blocks a job.
+    """
+    from twitter.outbox import enqueue_tweet
+
+    if tweet_text:
+        with span("enqueue", job=job):
+            enqueue_tweet(tweet_text, job=job or current_job())
+    else:
+        logging.info("No tweet content to send.")
@@ -0,0 +1,37 @@
+from jobs.pipeline import Pipeline
+from scraping.earnings_tradingview import scrape_todays_earnings
+from twitter.tweet_format import daily_premkt_earnings_tweet, daily_afterhrs_earnings_tweet
+from config.logger import setup_logging
+
+logging = setup_logging("EarningsJobs")
+
+
+def _earnings_posts(timing, formatter, label):
+    """
+    Builds a transform that formats the earnings
+    reported at `timing` ("Before Open"/"After Close").
+    """
+
+    def transform(earnings_data):
+        reporting = [e for e in earnings_data if e.time == timing]
+        if not reporting:
+            logging.info(f"No {label} earnings available.")
+            return []
+        return [formatter(reporting)]
+
+    return transform
+
+
+# Scheduled for 4:00 AM.
+prepare_pre_market_earnings = Pipeline(
+    "pre_market_earnings",
+    scrape=scrape_todays_earnings,
+    transform=_earnings_posts("Before Open", daily_premkt_earnings_tweet, "Pre-Market"),
+)
+
+# Scheduled for 12:00 PM.
+prepare_after_hours_earnings = Pipeline(
+    "after_hours_earnings",
+    scrape=scrape_todays_earnings,
+    transform=_earnings_posts("After Close", daily_afterhrs_earnings_tweet, "After-Hours"),
+)
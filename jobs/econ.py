@@ -0,0 +1,95 @@
+import datetime
+from jobs.pipeline import Pipeline
+from config.market_calendar import trading_date
+from scraping.econ_scraper import (
+    open_earnings_calendar,
+    click_importance,
+    day,
+    scrape_economics_data,
+    collect_econ_week,
+    events_on,
+)
+from twitter.tweet_format import econ_reminder_tomorrow, econ_reminder_weekly
+from config.driver_pool import release_driver
+from config.logger import setup_logging
+from scraping.snapshots import record_snapshot, snapshot_source, unchanged_since_last_session
+
+logging = setup_logging("EconJobs")
+
+
+def _scrape_option(option):
+    """
+    Fallback for when the collected week does not cover the
+    day wanted: opens the calendar and selects `option`.
+    """
+    driver = open_earnings_calendar()
+    if not driver:
+        return None
+
+    try:
+        click_importance(driver)
+        day(driver, option)
+        return scrape_economics_data(driver)
+    finally:
+        release_driver(driver)
+
+
+def _unchanged(option, econ_data):
+    """
+    Records the events for `option` and returns True when
+    they are unchanged since the last session, so the
+    tweet would be a repeat.
+    """
+    source = snapshot_source("econ", option)
+    record_snapshot(source, econ_data)
+    if unchanged_since_last_session(source, econ_data):
+        logging.info(f"Economic events for '{option}' are unchanged since the last session.")
+        return True
+    return False
+
+
+def _collect_tomorrow():
+    """
+    Returns tomorrow's events from the collected week,
+    selecting 'Tomorrow' on its own when the week does
+    not cover it. None when scraping failed.
+    """
+    week = collect_econ_week()
+    if week is None:
+        return None
+
+    tomorrow = trading_date() + datetime.timedelta(days=1)
+    econ_data_tomorrow = events_on(week, tomorrow)
+    if econ_data_tomorrow is None:
+        logging.info(f"Collected week does not cover {tomorrow}; selecting 'Tomorrow' instead.")
+        econ_data_tomorrow = _scrape_option("Tomorrow")
+    return econ_data_tomorrow
+
+
+def _econ_posts(option, formatter):
+    """
+    Builds a transform that formats the events for
+    `option` unless they repeat the last session's.
+    """
+
+    def transform(econ_data):
+        if _unchanged(option, econ_data):
+            return []
+        return [formatter(econ_data)]
+
+    return transform
+
+
+# Scheduled for 8:00 PM.
+prepare_daily_econ = Pipeline(
+    "daily_econ",
+    scrape=_collect_tomorrow,
+    transform=_econ_posts("Tomorrow", econ_reminder_tomorrow),
+)
+
+# Scheduled for 10:00 PM.
+prepare_weekly_econ = Pipeline(
+    "weekly_econ",
+    scrape=collect_econ_week,
+    transform=_econ_posts("This Week", econ_reminder_weekly),
+)
@@ -0,0 +1,97 @@
+from config.logger import setup_logging
+from functools import partial
+from jobs.pipeline import Pipeline
+from scraping.market_movers import (
+    MARKET_MOVERS_URLS,
+    scrape_market_movers,
+    scrape_market_movers_batch,
+)
+from twitter.tweet_format import (
+    pre_market_gainer,
+    pre_market_losers,
+    week_high_52,
+    week_low_52,
+    all_time_high,
+    all_time_low,
+    pre_market_gap,
+)
+from scraping.snapshots import snapshot_source, unchanged_since_last_session
+
+logging = setup_logging("MarketMoversJobs")
+
+
+def _unchanged(key, data):
+    """
+    True when the page returned exactly what it did last
+    session, so its tweet would be a repeat.
+    """
+    url = MARKET_MOVERS_URLS[key]
+    if unchanged_since_last_session(snapshot_source("market_movers", url), data):
+        logging.info(f"{key} is unchanged since the last session; not posting it again.")
+        return True
+    return False
+
+
+def _movers(key, formatter, name=None):
+    """
+    Declares the pipeline for one market movers page,
+    traced as job `name` (default: the page key).
+    """
+
+    def transform(data):
+        if _unchanged(key, data):
+            return []
+        return [formatter(data)]
+
+    return Pipeline(name or key, scrape=partial(scrape_market_movers, MARKET_MOVERS_URLS[key]), transform=transform)
+
+
+# Scheduled for 7:00 AM.
+prepare_pre_market_gainers = _movers("pre_market_gainers", pre_market_gainer)
+
+# Scheduled for 7:05 AM.
+prepare_pre_market_losers = _movers("pre_market_losers", pre_market_losers)
+
+# Scheduled for 8:00 AM.
+prepare_gap = _movers("pre_market_gappers", pre_market_gap, name="pre_market_gap")
+
+# Batched at 3:45 PM by prepare_market_close.
+prepare_week_high_52 = _movers("week_high_52", week_high_52)
+prepare_week_low_52 = _movers("week_low_52", week_low_52)
+prepare_all_time_high = _movers("all_time_high", all_time_high)
+prepare_all_time_low = _movers("all_time_low", all_time_low)
+
+MARKET_CLOSE_BATCH = [
+    ("week_high_52", week_high_52),
+    ("week_low_52", week_low_52),
+    ("all_time_high", all_time_high),
+    ("all_time_low", all_time_low),
+]
+
+
+def _scrape_market_close():
+    """
+    Scrapes the 52-week and all-time highs/lows pages as
+    one batch. Returns None only if every page failed.
+    """
+    results = scrape_market_movers_batch([MARKET_MOVERS_URLS[key] for key, _ in MARKET_CLOSE_BATCH])
+    if all(rows is None for rows in results.values()):
+        return None
+    return results
+
+
+def _market_close_posts(results):
+    """
+    Formats a tweet for every page in the batch that was
+    scraped and changed since the last session.
+    """
+    posts = []
+    for key, formatter in MARKET_CLOSE_BATCH:
+        data = results.get(MARKET_MOVERS_URLS[key])
+        if data is not None and not _unchanged(key, data):
+            posts.append(formatter(data))
+    return posts
+
+
+# Scheduled for 3:45 PM.
+prepare_market_close = Pipeline("market_close", scrape=_scrape_market_close, transform=_market_close_posts)
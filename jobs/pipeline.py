@@ -0,0 +1,150 @@
+"""
+Job pipelines: each job is a scrape stage (a blocking producer)
+and a transform stage that turns the scraped data into posts.
+
+Called directly, a Pipeline is the job's prepare function, so the
+scheduler and jobs.prepare() run it synchronously. run_pipelines()
+runs several jobs at once on asyncio instead: scrapers run on worker
+threads, transforms consume their results from a bounded queue and
+a single sink stage queues the posts on the outbox and posts them to
+every publishing sink concurrently, so one job's API wait overlaps
+another's scrape.
+
+    python -m jobs.pipeline pre_market_gainers pre_market_losers
+"""
+import os
+import sys
+import asyncio
+from config.logger import setup_logging
+from config.tracing import span, traced_job
+
+logging = setup_logging("Pipeline")
+
+QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+MAX_SCRAPERS = int(os.getenv("PIPELINE_MAX_SCRAPERS", "2"))
+
+_DONE = object()
+
+
+class Pipeline:
+    """
+    Declares job `name`. `scrape()` returns the job's data,
+    or None when scraping failed; `transform(data)` returns
+    the list of posts (tweets or reply threads) to send.
+    """
+
+    def __init__(self, name, scrape, transform):
+        self.name = name
+        self.scrape = scrape
+        self.transform = transform
+        self._prepare = traced_job(name)(self._run)
+
+    def __call__(self):
+        return self._prepare()
+
+    def _run(self):
+        data = self.scrape()
+        if data is None:
+            return None
+        with span("format"):
+            return self.transform(data)
+
+
+async def _produce(pipeline, scraped, scrapers):
+    async with scrapers:
+        try:
+            data = await asyncio.to_thread(traced_job(pipeline.name)(pipeline.scrape))
+        except Exception as e:
+            logging.error(f"Scrape for {pipeline.name} failed: {e}")
+            data = None
+    await scraped.put((pipeline, data))
+
+
+async def _transform(scraped, posts):
+    while True:
+        item = await scraped.get()
+        try:
+            if item is _DONE:
+                await posts.put(_DONE)
+                return
+
+            pipeline, data = item
+            if data is None:
+                logging.error(f"Nothing to post for {pipeline.name}; the scrape failed.")
+                continue
+
+            # Materialised here so a transform returning something
+            # that is not a list of posts fails this job only.
+            try:
+                with span("format", job=pipeline.name):
+                    results = list(await asyncio.to_thread(pipeline.transform, data))
+            except Exception as e:
+                logging.error(f"Formatting {pipeline.name} failed: {e}")
+                continue
+
+            for post in results:
+                await posts.put((pipeline.name, post))
+        finally:
+            scraped.task_done()
+
+
+async def _sink(posts, sinks):
+    from twitter.outbox import get_outbox, drain_async
+
+    outbox = get_outbox()
+    names = [sink.name for sink in sinks]
+    while True:
+        item = await posts.get()
+        try:
+            if item is _DONE:
+                return
+
+            name, post = item
+            try:
+                parts = [post] if isinstance(post, str) else list(post)
+                with span("enqueue", job=name):
+                    await asyncio.to_thread(outbox.enqueue_thread, parts, name, names)
+                await drain_async(sinks)
+            except Exception as e:
+                logging.error(f"Queueing a post for {name} failed: {e}")
+        finally:
+            posts.task_done()
+
+
+async def run_pipelines(pipelines, sinks=None, queue_size=QUEUE_SIZE, max_scrapers=MAX_SCRAPERS):
+    """
+    Runs `pipelines` concurrently through bounded scrape ->
+    transform -> post queues and returns once every post has
+    been handed to each sink (or left on the outbox for retry).
+    """
+    from twitter.outbox import drain_async
+    from twitter.sinks import get_sinks
+
+    sinks = sinks or get_sinks()
+    scraped = asyncio.Queue(maxsize=queue_size)
+    posts = asyncio.Queue(maxsize=queue_size)
+    scrapers = asyncio.Semaphore(max_scrapers)
+
+    transformer = asyncio.create_task(_transform(scraped, posts))
+    sink = asyncio.create_task(_sink(posts, sinks))
+
+    await asyncio.gather(*(_produce(p, scraped, scrapers) for p in pipelines))
+    await scraped.put(_DONE)
+    await asyncio.gather(transformer, sink)
+
+    # Replies become due once their parent is posted
+    await drain_async(sinks)
+
+
+def run(names, sinks=None):
+    """
+    Runs the named jobs through run_pipelines().
+    """
+    from jobs import load_job
+
+    pipelines = [load_job(name) for name in names]
+    asyncio.run(run_pipelines(pipelines, sinks))
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:])
@@ -0,0 +1,41 @@
+import time
+from jobs import run_job
+from twitter.outbox import drain
+from config.logger import setup_logging, flush_logs
+
+logging = setup_logging("LambdaHandler")
+
+
+def lambda_handler(event, context):
+    """
+    AWS Lambda entry point. The scheduling rule passes the job to
+    run as {"job": "<name>"} (see jobs.JOBS), or several jobs as
+    {"jobs": [...]}, which run together through jobs.pipeline. Only
+    those jobs' modules are imported, and the publishing sinks,
+    driver pool and outbox are module-level singletons, so warm invocations
+    reuse them.
+    """
+    event = event or {}
+    names = event.get("jobs") or ([event["job"]] if event.get("job") else [])
+    if not names:
+        logging.error(f"Event has neither 'job' nor 'jobs': {event}")
+        flush_logs()
+        return {"error": "Event must name a job as {\"job\": \"<name>\"} or {\"jobs\": [...]}."}
+
+    start = time.perf_counter()
+    try:
+        logging.info(f"Running job(s) {', '.join(map(str, names))}.")
+        if len(names) > 1:
+            from jobs.pipeline import run
+            run(names)
+        else:
+            run_job(names[0])
+
+        drain(timeout=float(event.get("drain_timeout", 30)))
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        logging.info(f"Finished in {duration_ms:.0f} ms.")
+        return {"jobs": names, "duration_ms": round(duration_ms)}
+    finally:
+        # Lambda freezes the process as soon as the handler returns or raises
+        flush_logs()
@@ -0,0 +1,213 @@
+import os
+import time
+import heapq
+import datetime
+import threading
+from config.logger import setup_logging
+from config.market_calendar import MARKET_TZ, market_now, is_trading_day
+from config.tracing import span
+from jobs import MAX_AGE, prepare, commit
+
+logging = setup_logging("Scheduler")
+
+MAX_WORKERS = int(os.getenv("SCHEDULER_MAX_WORKERS", "2"))
+JOB_TIMEOUT = float(os.getenv("SCHEDULER_JOB_TIMEOUT", "600"))
+MISFIRE_GRACE = float(os.getenv("SCHEDULER_MISFIRE_GRACE", "900"))
+PREPARE_LEAD = float(os.getenv("SCHEDULER_PREPARE_LEAD", "120"))
+MAX_SLEEP = 60.0
+
+
+class ScheduledJob:
+    """
+    Posts job `name` at `at` ("HH:MM", New York time) on
+    every day for which `days(date)` is true. The job is
+    prepared `lead` seconds early and its posts committed
+    at the deadline, re-validated if older than `max_age`.
+    A run that cannot start within `grace` seconds of its
+    deadline is skipped; `timeout` bounds how long it may
+    hold a worker beyond the lead time.
+    """
+
+    def __init__(self, name, at, days=is_trading_day, timeout=JOB_TIMEOUT,
+                 grace=MISFIRE_GRACE, lead=PREPARE_LEAD, max_age=MAX_AGE):
+        self.name = name
+        self.at = datetime.time.fromisoformat(at)
+        self.days = days
+        self.timeout = timeout
+        self.grace = grace
+        self.lead = datetime.timedelta(seconds=lead)
+        self.max_age = max_age
+
+    def next_run(self, after):
+        """
+        Returns the first deadline at or after `after`
+        that falls on an eligible day.
+        """
+        after = after.astimezone(MARKET_TZ)
+        day = after.date()
+
+        for _ in range(370):
+            deadline = datetime.datetime.combine(day, self.at, tzinfo=MARKET_TZ)
+            if deadline >= after and self.days(day):
+                return deadline
+            day += datetime.timedelta(days=1)
+
+        raise ValueError(f"Job {self.name} has no eligible day within a year.")
+
+
+def skip_run(scheduled, deadline, reason):
+    logging.warning(f"Skipping {scheduled.name} for {deadline:%Y-%m-%d %H:%M}: {reason}.")
+    with span("schedule", job=scheduled.name) as current:
+        current.set(skipped=1)
+
+
+class JobRunner:
+    """
+    Runs jobs on at most `max_workers` worker slots at once.
+    Each run gets its own thread, which waits for a slot, so
+    the caller never blocks on busy workers. Python cannot
+    kill a thread, so a job that outlives its timeout is
+    logged and abandoned: its worker slot is handed back and
+    the thread is left to finish on its own.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, clock=market_now):
+        self.clock = clock
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._running = set()
+        self._lock = threading.Lock()
+
+    def is_running(self, name):
+        with self._lock:
+            return name in self._running
+
+    def start(self, scheduled, deadline):
+        """
+        Starts `scheduled` on a thread that waits for a worker
+        slot until the run's grace period is up, skipping the
+        run if none frees, then prepares and commits at `deadline`.
+        """
+        released = threading.Event()
+
+        def release_slot():
+            if not released.is_set():
+                released.set()
+                self._slots.release()
+
+        def overrun():
+            logging.error(f"Job {scheduled.name} exceeded its {scheduled.timeout:.0f}s timeout; abandoning it.")
+            with span("schedule", job=scheduled.name) as current:
+                current.set(timeouts=1)
+            release_slot()
+
+        def run():
+            wait = scheduled.grace - (self.clock() - deadline).total_seconds()
+            if not self._slots.acquire(timeout=max(0.0, wait)):
+                with self._lock:
+                    self._running.discard(scheduled.name)
+                skip_run(scheduled, deadline, f"no worker free within its {scheduled.grace:.0f}s grace")
+                return
+
+            lead = (deadline - self.clock()).total_seconds()
+            with span("schedule", job=scheduled.name) as current:
+                current.set(prepare_lead_seconds=round(lead, 3), runs=1)
+            logging.info(f"Preparing {scheduled.name} for {deadline:%Y-%m-%d %H:%M} ({lead:.1f}s before its deadline).")
+
+            timer = threading.Timer(scheduled.lead.total_seconds() + scheduled.timeout, overrun)
+            timer.daemon = True
+            timer.start()
+            try:
+                prepared = prepare(scheduled.name)
+                self._sleep_until(deadline)
+                with span("schedule", job=scheduled.name) as current:
+                    current.set(commit_late_seconds=round((self.clock() - deadline).total_seconds(), 3))
+                commit(prepared, max_age=scheduled.max_age)
+            except Exception as e:
+                logging.error(f"Job {scheduled.name} failed: {e}")
+            finally:
+                timer.cancel()
+                with self._lock:
+                    self._running.discard(scheduled.name)
+                release_slot()
+
+        with self._lock:
+            self._running.add(scheduled.name)
+
+        threading.Thread(target=run, name=f"job-{scheduled.name}", daemon=True).start()
+
+    def _sleep_until(self, deadline):
+        while True:
+            remaining = (deadline - self.clock()).total_seconds()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, MAX_SLEEP))
+
+
+class Scheduler:
+    """
+    Sleeps until the earliest job is due to be prepared
+    instead of polling, then hands it to a JobRunner so a
+    slow job never delays the next one. Runs missed while
+    the process was down or every worker was busy are
+    caught up once if still within their grace period and
+    skipped otherwise.
+    """
+
+    def __init__(self, jobs, runner=None, clock=market_now):
+        self.jobs = list(jobs)
+        self.runner = runner or JobRunner(clock=clock)
+        self.clock = clock
+        self._stopping = threading.Event()
+        self._queue = []
+
+    def run_forever(self):
+        now = self.clock()
+        for index, scheduled in enumerate(self.jobs):
+            since = now - datetime.timedelta(seconds=scheduled.grace)
+            self._push(scheduled.next_run(since), index)
+
+        logging.info(f"Scheduler started with {len(self.jobs)} jobs.")
+        self._log_upcoming()
+
+        while not self._stopping.is_set():
+            start_at, index, deadline = self._queue[0]
+            remaining = (start_at - self.clock()).total_seconds()
+
+            # Wake at least once a minute so wall-clock jumps
+            # (suspend, NTP corrections) are noticed.
+            if remaining > 0:
+                self._stopping.wait(min(remaining, MAX_SLEEP))
+                continue
+
+            heapq.heappop(self._queue)
+            scheduled = self.jobs[index]
+            self._dispatch(scheduled, deadline)
+            after = max(deadline, self.clock()) + datetime.timedelta(seconds=1)
+            self._push(scheduled.next_run(after), index)
+
+        logging.info("Scheduler stopped.")
+
+    def stop(self):
+        self._stopping.set()
+
+    def _dispatch(self, scheduled, deadline):
+        late = (self.clock() - deadline).total_seconds()
+
+        if self.runner.is_running(scheduled.name):
+            skip_run(scheduled, deadline, "the previous run is still going")
+            return
+
+        if late > scheduled.grace:
+            skip_run(scheduled, deadline, f"{late:.0f}s late, past its {scheduled.grace:.0f}s grace")
+            return
+
+        # The run waits for a worker on its own thread, so a
+        # long job never holds up dispatching the others.
+        self.runner.start(scheduled, deadline)
+
+    def _push(self, deadline, index):
+        heapq.heappush(self._queue, (deadline - self.jobs[index].lead, index, deadline))
+
+    def _log_upcoming(self):
+        for _, index, deadline in sorted(self._queue):
+            logging.info(f"Next {self.jobs[index].name}: {deadline:%a %Y-%m-%d %H:%M %Z}.")
@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import functools
+import threading
+import contextvars
+from collections import OrderedDict
+from config.logger import setup_logging
+from config.market_calendar import trading_date
+from config.paths import data_dir
+from scraping.records import to_rows
+
+logging = setup_logging("ScrapeCache")
+
+CACHE_TTL = float(os.getenv("SCRAPE_CACHE_TTL", str(12 * 3600)))
+CACHE_STALE_TTL = float(os.getenv("SCRAPE_CACHE_STALE_TTL", str(12 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("SCRAPE_CACHE_MAX_ENTRIES", "32"))
+
+# Lambda freezes the process once the handler returns, so a
+# background refresh could be cut off mid-scrape
+REVALIDATE_IN_BACKGROUND = not os.getenv("AWS_LAMBDA_FUNCTION_NAME")
+
+
+class ScrapeCache:
+    """
+    Two-tier cache for scrape results: an in-memory LRU in
+    front of one JSON file per key on disk, so results survive
+    process restarts and Lambda cold starts.
+    """
+
+    def __init__(self, directory=None, max_entries=CACHE_MAX_ENTRIES):
+        self.directory = directory or data_dir("cache")
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns (value, stored_at) for `key`, or None.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("key") != key:
+            return None
+
+        entry = (data["value"], data["stored_at"])
+        self._remember(key, entry)
+        return entry
+
+    def set(self, key, value):
+        """
+        Stores `value` in both tiers.
+        """
+        entry = (value, time.time())
+        self._remember(key, entry)
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "stored_at": entry[1], "value": value}, f)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError) as e:
+            logging.warning(f"Failed to write cache entry for {key}: {e}")
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+
+_cache = None
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    Returns the process-wide scrape cache.
+    """
+    global _cache
+    if _cache is None:
+        _cache = ScrapeCache()
+    return _cache
+
+
+def cached_scrape(source, ttl=CACHE_TTL, stale_ttl=CACHE_STALE_TTL, record=None):
+    """
+    Caches a scraper's result per source URL and trading date.
+    When the scraper returns `record`s (see scraping.records),
+    they are stored as dicts and rebuilt on every hit.
+
+    Results younger than `ttl` are returned as-is. Results up to
+    `stale_ttl` past that are returned immediately while a background
+    thread re-scrapes (stale-while-revalidate); on Lambda they are
+    re-scraped synchronously instead. Anything older, or a miss,
+    scrapes synchronously. Empty results are never cached so a
+    failed scrape is retried on the next call.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parts = [source, *map(str, args), trading_date().isoformat()]
+            key = "|".join(parts)
+            cache = get_cache()
+            entry = cache.get(key)
+
+            if entry is not None and record is not None:
+                entry = (record.from_rows(entry[0]), entry[1])
+
+            if entry is not None:
+                value, stored_at = entry
+                age = time.time() - stored_at
+
+                if age < ttl:
+                    logging.info(f"Cache hit for {key} ({age:.0f}s old).")
+                    return value
+
+                if age < ttl + stale_ttl and REVALIDATE_IN_BACKGROUND:
+                    logging.info(f"Serving stale {key} ({age:.0f}s old) and revalidating.")
+                    _refresh_in_background(key, func, args, kwargs, record)
+                    return value
+
+            return _refresh(key, func, args, kwargs, record, fallback=entry)
+
+        return wrapper
+
+    return decorator
+
+
+def _refresh(key, func, args, kwargs, record=None, fallback=None):
+    value = func(*args, **kwargs)
+
+    if value:
+        get_cache().set(key, to_rows(value) if record is not None else value)
+        return value
+
+    if fallback is not None:
+        logging.warning(f"Scrape for {key} came back empty; keeping cached result.")
+        return fallback[0]
+
+    return value
+
+
+def _refresh_in_background(key, func, args, kwargs, record=None):
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        try:
+            _refresh(key, func, args, kwargs, record)
+        except Exception as e:
+            logging.error(f"Background refresh of {key} failed: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    # Run in a copy of this context so the refresh's spans and logs stay attributed to the job
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(run,), name=f"refresh-{key}", daemon=True).start()
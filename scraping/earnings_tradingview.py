@@ -1,111 +1,154 @@
-import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from config.chrome_options import chrome_options 
-from config.logger import setup_logging
+import os
+import re
+from config.chrome_options import block_resources
+from config.driver_pool import borrow_driver, release_driver
+from config.logger import setup_logging, RowErrors
+from config.tracing import span, traced
+from scraping.cache import cached_scrape
+from scraping.snapshots import snapshotted
+from scraping.records import Earnings, earnings
+from scraping.extractor import stream_rows, field, row_filter
+from scraping.watchlist import get_watchlist
+from scraping.locators import current, wait_for
+from config.market_calendar import trading_date
 
 logging = setup_logging("EarningsScraper")
 
+EARNINGS_URL = "https://www.tradingview.com/markets/stocks-usa/earnings/"
+
+# Most table rows to scan before giving up on tracked tickers, or 0
+# to read until the table ends (a full day lists well over 5000)
+ROW_BUDGET = int(os.getenv("EARNINGS_ROW_BUDGET", "0"))
+
+# "rows" is filled in from the locator registry ("earnings_rows")
+EARNINGS_SPEC = {
+    "fields": {
+        "Ticker": field("[data-field-key='name']"),
+        "EPS Estimate": field("[data-field-key='earnings_per_share_forecast_next_fq']"),
+        "Revenue Forecast": field("[data-field-key='revenue_forecast_next_fq']"),
+        "Time": field("[data-field-key='earnings_release_next_time']", attr="title"),
+    },
+    # Clicked to load the next page of rows once the rendered ones run out
+    "more": ".tv-load-more__btn",
+}
+
+# The name cell's first line is the ticker followed by one badge character
+TICKER_PATTERN = r"^(.*)."
+
 def earnings_to_be_tracked():
     """
-    Returns a dictionary mapping days
+    Returns the watchlist's mapping of days
     of the week to the stocks being tracked.
     """
-    return {
-        "Monday": ["MCD", "MNDY", "ON", "TSEM", "INCY", "ROK", "GCMG", "ALX", "NSP", "CNA",
-                   "ALAB", "FLNC", "VRTIX", "ACLS", "MEDP", "AMKR", "LSCC", "MITK", "INSP", "AWR"],
-        "Tuesday": ["SHOP", "KO", "HUM", "BP", "LDOS", "AN", "SPGI", "CG", "MAR",
-                    "SMCI", "SUPMERC", "UPST", "DASH", "LYFT", "FRSH", "FWKS", "ET", "GLD", "GILD", "CFLT"],
-        "Wednesday": ["VRT", "CVS", "ABNB", "BMO", "JLL", "BIDU", "WDAY", "ADBE", "DUOL", "YETI",
-                      "RBLX", "ROKU", "AFRM", "PINS", "CSCO", "MGM", "ASPN", "GEHC"],
-        "Thursday": ["DDOG", "CYBR", "DE", "CROX", "DUK", "PGY", "SONY", "PCG", "HWM", 
-                     "GEHC", "CON", "TWLO", "DKNG", "AMAT", "ABNB", "PANW", "ROKU", "WYNN", "HL", "RSG"],
-        "Friday": ["MRNA", "ENB", "AXL", "AMC", "MGA", "POR", "FTS", "ACDVF", "SXT", "SXT", "ESNT"]
-    }
+    return get_watchlist().by_weekday
 
 def get_todays_stocks():
     """
-    Returns the stock list for today's earnings
+    Returns the frozenset of stocks tracked
+    for today's earnings.
     """
-    today = datetime.datetime.now().strftime("%A")
-    tracked_stocks = earnings_to_be_tracked().get(today, [])
-    return set(tracked_stocks)
+    return get_watchlist().tickers_for(trading_date())
 
 def open_earnings_calendar():
     """
     Navigates to the Trading View
     Earnings calendar page.
     """
+    driver = None
     try:
-        driver = chrome_options()
-        logging.info("Initializing WebDriver and opening earnings calendar page.")
+        driver = borrow_driver()
+        block_resources(driver, "earnings")
+        logging.info("Borrowed WebDriver, opening earnings calendar page.")
 
-        driver.get("https://www.tradingview.com/markets/stocks-usa/earnings/")
-        WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "tv-data-table"))
-        )
+        with span("page_load"):
+            driver.get(EARNINGS_URL)
+            wait_for(driver, "earnings_table", timeout=30, also=("earnings_rows",))
 
         logging.info("Earnings calendar page loaded successfully.")
         return driver
 
     except Exception as e:
         logging.error(f"Failed to open earnings calendar: {e}")
+        release_driver(driver, healthy=False)
         return None
 
+@traced("scrape_earnings_data")
 def scrape_earnings_data(driver):
     """
     Extracts earnings data from TradingView and filters
-    for today's tracked stocks.
+    for today's tracked stocks. Rows are streamed in chunks,
+    loading more as needed, and extraction stops once every
+    tracked stock has been seen, the table ends or ROW_BUDGET
+    (when set) rows have been scanned.
     """
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.CLASS_NAME, "tv-data-table"))
-    )
+    wait_for(driver, "earnings_table", timeout=10, also=("earnings_rows",))
 
-    rows = driver.find_elements(By.CLASS_NAME, "tv-data-table__row")
+    tracked_stocks = get_todays_stocks()
+    if not tracked_stocks:
+        logging.info("No stocks tracked today.")
+        return []
+
+    spec = dict(EARNINGS_SPEC, rows=current("earnings_rows"), filter=row_filter("Ticker", tracked_stocks, TICKER_PATTERN))
     earnings_data = []
+    found = set()
 
-    tracked_stocks = get_todays_stocks()
+    with RowErrors(logging, "earnings") as errors:
+        for row in _stream_tracked(driver, spec, tracked_stocks, found):
+            try:
+                match = re.match(TICKER_PATTERN, (row["Ticker"] or "").strip())
+                ticker = match.group(1) if match else ""
 
-    for row in rows:
-        try:
-            ticker_element = WebDriverWait(row, 3).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[data-field-key='name']"))
-            )
-            ticker_full = ticker_element.text.strip()
-            ticker_d = ticker_full.split("\n")[0]
-            ticker = "".join(ticker_d[:-1])
-
-            if ticker in tracked_stocks:
-                eps_estimate_element = row.find_element(By.CSS_SELECTOR, "[data-field-key='earnings_per_share_forecast_next_fq']")
-                eps_estimate = eps_estimate_element.text.strip("USD") if eps_estimate_element else "N/A"
-
-                revenue_forecast_element = row.find_element(By.CSS_SELECTOR, "[data-field-key='revenue_forecast_next_fq']")
-                revenue_forecast = revenue_forecast_element.text.strip("USD") if revenue_forecast_element else "N/A"
-                
-                try:
-                    time_reporting_element = row.find_element(By.CSS_SELECTOR, "[data-field-key='earnings_release_next_time']")
-                    time_reporting = time_reporting_element.get_attribute("title").strip() if time_reporting_element else "N/A"
-                except:
-                    time_reporting = "N/A"
-
-                earnings_data.append({
-                    "Ticker": ticker,
-                    "EPS Estimate": eps_estimate,
-                    "Revenue Forecast": revenue_forecast,
-                    "Time": time_reporting
-                })
-
-        except Exception as e:
-            logging.error(f"Error processing row: {e}")
-
-    return earnings_data
+                if ticker in tracked_stocks:
+                    found.add(ticker)
+                    eps_estimate = row["EPS Estimate"].strip("USD") if row["EPS Estimate"] is not None else "N/A"
+                    revenue_forecast = row["Revenue Forecast"].strip("USD") if row["Revenue Forecast"] is not None else "N/A"
+                    time_reporting = row["Time"].strip() if row["Time"] is not None else "N/A"
+
+                    earnings_data.append((ticker, eps_estimate, revenue_forecast, time_reporting))
+
+            except Exception as e:
+                errors.add(e)
+
+    missing = tracked_stocks - found
+    if missing:
+        logging.info(f"No earnings rows found for {len(missing)} tracked stocks: {', '.join(sorted(missing))}.")
 
+    return earnings(earnings_data)
+
+def _stream_tracked(driver, spec, tracked_stocks, found):
+    """
+    Yields streamed rows until `found` (filled in by the
+    caller) covers every tracked stock. Warns when the row
+    budget runs out with tracked stocks still unseen.
+    """
+    chunks = stream_rows(driver, spec, max_rows=ROW_BUDGET or None)
+    while True:
+        try:
+            chunk = next(chunks)
+        except StopIteration as stop:
+            missing = tracked_stocks - found
+            if stop.value and missing:
+                logging.warning(
+                    f"Row budget of {ROW_BUDGET} (EARNINGS_ROW_BUDGET) ran out with {len(missing)} "
+                    f"tracked stocks not yet seen: {', '.join(sorted(missing))}."
+                )
+            return
+
+        yield from chunk
+        if found >= tracked_stocks:
+            logging.info("All tracked stocks found; stopping early.")
+            chunks.close()
+            return
+
+@traced("scrape_todays_earnings")
+@cached_scrape(EARNINGS_URL, record=Earnings)
+@snapshotted("earnings")
 def scrape_todays_earnings():
     """
     Scrapes today's earnings
-    from TradingView.
+    from TradingView. Cached per
+    trading date, so the pre-market
+    and after-hours jobs share one scrape.
     """
     driver = open_earnings_calendar()
     if not driver:
@@ -120,5 +163,5 @@ def scrape_todays_earnings():
         return []
     
     finally:
-        driver.quit()
+        release_driver(driver)
 
@@ -1,54 +1,165 @@
 import time
 import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+from contextlib import contextmanager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from config.chrome_options import chrome_options
+from selenium.common.exceptions import TimeoutException
+from config.chrome_options import block_resources
+from config.driver_pool import borrow_driver, release_driver
 from config.logger import setup_logging
+from config.tracing import span, traced
+from config.market_calendar import trading_date
+from scraping.cache import cached_scrape
+from scraping.extractor import extract_rows, field, row_group
+from scraping.snapshots import snapshotted
+from scraping.locators import by, current, wait_for
+from scraping.records import EconEvent
 
 logging  = setup_logging("EconScraper")
 
+# "rows" is filled in from the locator registry ("econ_items")
+ECON_CALENDAR_SPEC = {
+    "fields": {
+        "Event": field("span[class*='titleText']"),
+    },
+}
+
+ECON_CALENDAR_URL = "https://www.tradingview.com/symbols/USDCAD/economic-calendar/?exchange=FX_IDC"
+
+# The week view lists each day's events under a day title;
+# tagging every event with the title above it dates it.
+DAY_TITLE_SELECTOR = "[class*='dayTitle'], [class*='dateTitle']"
+
+ECON_WEEK_SPEC = dict(ECON_CALENDAR_SPEC, group=row_group(DAY_TITLE_SELECTOR, "Date"))
+
+DAY_TITLE_FORMATS = ("%B %d", "%b %d", "%d %B", "%d %b", "%A %B %d", "%a %b %d")
+
+# Locator registry names of the day filter buttons
+DAY_OPTIONS = {
+    "Tomorrow": "econ_tomorrow",
+    "This Week": "econ_this_week",
+}
+
+# Seconds each navigation step is expected to take
+STEP_BUDGETS = {
+    "click_importance": 2.0,
+    "day": 2.0,
+}
+
+# Seconds to wait for new rows once a control reports itself selected
+SELECTED_SETTLE = 1.0
+
+ROWS_SIGNATURE_SCRIPT = """
+const rows = document.querySelectorAll(arguments[0]);
+const first = rows.length ? rows[0].innerText : "";
+const last = rows.length ? rows[rows.length - 1].innerText : "";
+return rows.length + "|" + first + "|" + last;
+"""
+
+IS_SELECTED_SCRIPT = """
+for (let el = arguments[0]; el && el !== document.body; el = el.parentElement) {
+    if (el.getAttribute("aria-pressed") === "true" ||
+        el.getAttribute("aria-selected") === "true" ||
+        el.getAttribute("aria-checked") === "true") {
+        return true;
+    }
+}
+return false;
+"""
+
 def open_earnings_calendar():
     """
     Navigates to the Trading Views
     USDCAD Economic Calendar page.
     """
+    driver = None
     try:
-        driver = chrome_options()
+        driver = borrow_driver()
+        block_resources(driver, "econ")
         driver.set_window_size(1920, 1080)
 
-        logging.info("Initializing WebDriver and opening economic calendar page.")
+        logging.info("Borrowed WebDriver, opening economic calendar page.")
 
-        driver.get("https://www.tradingview.com/symbols/USDCAD/economic-calendar/?exchange=FX_IDC")
-        WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.XPATH, "//div[contains(@data-name, 'economic-calendar-item')]"))
-        )
+        with span("page_load"):
+            driver.get(ECON_CALENDAR_URL)
+            wait_for(driver, "econ_items", timeout=30)
 
         logging.info("Economic calendar page loaded successfully.")
         return driver
 
     except Exception as e:
         logging.error(f"Failed to open economic calendar: {e}")
+        release_driver(driver, healthy=False)
         return None
 
+@contextmanager
+def timed_step(name):
+    """
+    Logs how long a navigation step took
+    against its latency budget.
+    """
+    budget = STEP_BUDGETS.get(name)
+    start = time.perf_counter()
+    try:
+        with span(name):
+            yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if budget is not None and elapsed > budget:
+            logging.warning(f"Step '{name}' took {elapsed:.2f}s, over its {budget:.1f}s budget.")
+        else:
+            logging.info(f"Step '{name}' took {elapsed:.2f}s.")
+
+def rows_signature(driver):
+    """
+    Returns a cheap fingerprint of the rendered
+    event rows, used to detect that a click has
+    re-rendered the calendar.
+    """
+    return driver.execute_script(ROWS_SIGNATURE_SCRIPT, current("econ_items"))
+
+def click_and_wait(driver, name, timeout=10):
+    """
+    Waits for control `name` (see scraping.locators) to be
+    clickable, clicks it, then waits until the event rows have
+    re-rendered. Returns False if nothing changed within `timeout`.
+    """
+    before = rows_signature(driver)
+
+    locator = by(wait_for(driver, name, timeout=timeout))
+    button = WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(locator))
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();", button)
+
+    selected_at = None
+
+    def applied(d):
+        nonlocal selected_at
+        if rows_signature(d) != before:
+            return True
+        # Selected but the rows are identical: the filter may genuinely
+        # not change anything, so accept it after a short settle time.
+        if selected_at is None and d.execute_script(IS_SELECTED_SCRIPT, button):
+            selected_at = time.perf_counter()
+        return selected_at is not None and time.perf_counter() - selected_at > SELECTED_SETTLE
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(applied)
+        return True
+    except TimeoutException:
+        logging.warning(f"Click on {name} did not change the calendar within {timeout}s.")
+        return False
+
 def click_importance(driver):
     """
-    Clicks the Importance filter button
-    and then click on "Today"
+    Clicks the Importance filter button and waits
+    for the filtered calendar to render.
     """
     try:
         logging.info("Finding the High Importance button.")
 
-        importance_button = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, '//*[@id="js-category-content"]/div[2]/div/section/div/div[2]/div/div/div/div[1]/div[1]/button/span[2]/span[1]'))
-        )
+        with timed_step("click_importance"):
+            click_and_wait(driver, "econ_importance")
 
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", importance_button)
-        time.sleep(2)
-        
-        driver.execute_script("arguments[0].click();", importance_button)
-        
         logging.info("Importance button clicked successfully.")
 
     except Exception as e:
@@ -62,55 +173,120 @@ def day(driver, option):
     try:
         logging.info(f"Clicking on '{option}' option.")
 
-        option_xpath = {
-            "Tomorrow": '//*[@id="Tomorrow"]/span[1]/span',
-            "This Week": '//*[@id="This week"]/span[1]/span'
-        }
-
-        if option not in option_xpath:
+        if option not in DAY_OPTIONS:
             logging.error(f"Invalid option: {option}")
             return
 
-        button = driver.find_element(By.XPATH, option_xpath[option])
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-        
-        time.sleep(2)  
-        
-        driver.execute_script("arguments[0].click();", button)
+        with timed_step("day"):
+            click_and_wait(driver, DAY_OPTIONS[option])
 
         logging.info(f"'{option}' button clicked successfully.")
 
     except Exception as e:
         logging.error(f"Failed to click '{option}' button: {e}")
 
+@traced("scrape_economics_data")
 def scrape_economics_data(driver):
     """
     Extracts the Economic Event data from Trading View
     """
     logging.info("Waiting for the economic calendar to load.")
 
-    WebDriverWait(driver, 20).until(
-        EC.presence_of_element_located((By.XPATH, "//div[contains(@data-name, 'economic-calendar-item')]"))
-    )
+    wait_for(driver, "econ_items", timeout=20)
 
-    rows = driver.find_elements(By.XPATH, "//div[contains(@data-name, 'economic-calendar-item')]")
+    rows = extract_rows(driver, dict(ECON_CALENDAR_SPEC, rows=current("econ_items")))
 
     if not rows:
         logging.error("No economic calendar rows found.")
         return []
 
-    econ_data = []
+    return [EconEvent((row["Event"] or "").strip() or "N/A", None) for row in rows]
+
+def parse_day_title(title, today=None):
+    """
+    Turns a calendar day title such as "Today", "Tomorrow" or
+    "Monday, October 20" into a date, or None if unrecognised.
+    The year is the one that puts the date nearest to today.
+    """
+    today = today or trading_date()
+    text = (title or "").strip()
+    relative = {"today": 0, "tomorrow": 1, "yesterday": -1}
 
-    for row in rows:
-        try:
-            event_element = row.find_element(By.XPATH, ".//span[contains(@class, 'titleText')]")
-            event_name = event_element.text.strip()
+    first_word = text.split(",")[0].split()[0].lower() if text else ""
+    if first_word in relative:
+        return today + datetime.timedelta(days=relative[first_word])
 
-        except Exception as e:
-            event_name = "N/A"
-            
-        econ_data.append({
-            "Event": event_name,
-        })
+    # Drop a leading weekday ("Monday, ..." / "Mon ...")
+    if "," in text:
+        text = text.split(",", 1)[1].strip()
 
-    return econ_data
\ No newline at end of file
+    for fmt in DAY_TITLE_FORMATS:
+        candidates = []
+        for year in (today.year - 1, today.year, today.year + 1):
+            try:
+                candidates.append(datetime.datetime.strptime(f"{text} {year}", f"{fmt} %Y").date())
+            except ValueError:
+                continue
+        if candidates:
+            return min(candidates, key=lambda d: abs((d - today).days))
+
+    return None
+
+@traced("scrape_econ_week")
+def scrape_econ_week(driver):
+    """
+    Extracts every event on the calendar together with the
+    ISO date of the day it is listed under (None when the
+    day title could not be read).
+    """
+    wait_for(driver, "econ_items", timeout=20)
+
+    today = trading_date()
+    events = []
+
+    for row in extract_rows(driver, dict(ECON_WEEK_SPEC, rows=current("econ_items"))):
+        event_date = parse_day_title(row["Date"], today)
+        events.append(EconEvent(
+            (row["Event"] or "").strip() or "N/A",
+            event_date.isoformat() if event_date else None,
+        ))
+
+    return events
+
+@traced("collect_econ_week")
+@cached_scrape(ECON_CALENDAR_URL, record=EconEvent)
+@snapshotted("econ_week")
+def collect_econ_week():
+    """
+    Loads the economic calendar once, filters it to high
+    importance and "This Week", and returns the dated events.
+    Cached per trading date so the daily and weekly tweets
+    share one browser session. Returns None if the page
+    could not be opened.
+    """
+    driver = open_earnings_calendar()
+    if not driver:
+        return None
+
+    try:
+        click_importance(driver)
+        day(driver, "This Week")
+        return scrape_econ_week(driver)
+
+    except Exception as e:
+        logging.error(f"Error collecting economic calendar: {e}")
+        return []
+
+    finally:
+        release_driver(driver)
+
+def events_on(events, on_date):
+    """
+    Returns the events dated `on_date`, or None when the
+    collected week ends before that date (or no dates could
+    be read), so the caller can fall back.
+    """
+    dates = [e.date for e in events if e.date]
+    if not dates or max(dates) < on_date.isoformat():
+        return None
+    return [e for e in events if e.date == on_date.isoformat()]
@@ -0,0 +1,197 @@
+import os
+import json
+import time
+from config.logger import setup_logging
+from config.tracing import span
+
+logging = setup_logging("Extractor")
+
+CHUNK_SIZE = int(os.getenv("EXTRACT_CHUNK_SIZE", "250"))
+LOAD_TIMEOUT = float(os.getenv("EXTRACT_LOAD_TIMEOUT", "2.0"))
+LOAD_POLL = 0.2
+
+# Number of elements a streaming extraction walks (rows plus any
+# group headers), used to notice that lazily loaded rows arrived.
+COUNT_SCRIPT = """
+const spec = arguments[0];
+const selector = spec.group ? spec.rows + ", " + spec.group.selector : spec.rows;
+return document.querySelectorAll(selector).length;
+"""
+
+# Runs inside the page. Walks every row matched by spec.rows and reads
+# each field relative to the row, so a whole table comes back in one
+# WebDriver round trip instead of one per cell. With spec.filter only
+# rows whose key is in the filter's values are serialized. With
+# spec.group, header elements interleaved with the rows (such as day
+# titles) are walked in document order and each row is tagged with
+# the text of the header above it.
+#
+# Arguments after the spec stream the table in chunks: start index,
+# row limit, the heading carried over from the previous chunk, and
+# whether to scroll (or click spec.more) once the end is reached so
+# lazily loaded rows appear.
+EXTRACT_SCRIPT = """
+const spec = arguments[0];
+const read = (row, field) => {
+    const el = field.selector ? row.querySelector(field.selector) : row;
+    if (!el) return null;
+    return field.attr ? el.getAttribute(field.attr) : el.innerText;
+};
+const filter = spec.filter || null;
+const wanted = filter ? new Set(filter.values) : null;
+const pattern = filter && filter.pattern ? new RegExp(filter.pattern) : null;
+const keyOf = (text) => {
+    if (text === null) return null;
+    text = text.trim();
+    if (!pattern) return text;
+    const match = text.match(pattern);
+    return match ? (match[1] !== undefined ? match[1] : match[0]) : null;
+};
+const group = spec.group || null;
+const selector = group ? spec.rows + ", " + group.selector : spec.rows;
+const nodes = document.querySelectorAll(selector);
+const limit = arguments[2] == null ? Infinity : arguments[2];
+const out = [];
+let scanned = 0;
+let heading = arguments[3] == null ? null : arguments[3];
+let i = arguments[1] || 0;
+for (; i < nodes.length && scanned < limit; i++) {
+    const row = nodes[i];
+    if (group && !row.matches(spec.rows)) {
+        heading = row.innerText.trim();
+        continue;
+    }
+    scanned++;
+    if (filter && !wanted.has(keyOf(read(row, spec.fields[filter.field])))) continue;
+    const record = {};
+    for (const [name, field] of Object.entries(spec.fields)) {
+        record[name] = read(row, field);
+    }
+    if (group) record[group.field] = heading;
+    out.push(record);
+}
+// Reached the end while streaming: ask the page for more rows
+if (arguments[4] && i >= nodes.length) {
+    const more = spec.more ? document.querySelector(spec.more) : null;
+    if (more) {
+        more.click();
+    } else if (nodes.length) {
+        nodes[nodes.length - 1].scrollIntoView({block: "end"});
+    } else {
+        window.scrollTo(0, document.body.scrollHeight);
+    }
+}
+return JSON.stringify({rows: out, scanned: scanned, next: i, total: nodes.length, heading: heading});
+"""
+
+
+def field(selector=None, attr=None):
+    """
+    Describes one column of a row. `selector` is a CSS selector
+    relative to the row (None means the row itself) and `attr`
+    reads an attribute instead of the rendered text.
+    """
+    return {"selector": selector, "attr": attr}
+
+
+def row_filter(field_name, values, pattern=None):
+    """
+    Restricts extraction to rows whose `field_name` key is in
+    `values`. The key is the trimmed field text, or the first
+    group of `pattern` (a JavaScript-compatible regex) when given.
+    """
+    return {"field": field_name, "values": sorted(values), "pattern": pattern}
+
+
+def row_group(selector, field_name):
+    """
+    Tags each row with the text of the nearest preceding
+    element matching `selector`, stored as `field_name`.
+    """
+    return {"selector": selector, "field": field_name}
+
+
+def extract_rows(driver, spec):
+    """
+    Extracts every row described by `spec` in a single
+    execute_script call and returns a list of dicts.
+    Missing cells come back as None.
+    """
+    with span("extract") as current:
+        payload = driver.execute_script(EXTRACT_SCRIPT, spec)
+        result = json.loads(payload) if payload else {"rows": [], "scanned": 0}
+        rows = result["rows"]
+        current.set(rows=len(rows), scanned=result["scanned"], round_trips=1)
+
+    elapsed_ms = (time.perf_counter() - current.start) * 1000
+
+    logging.info(
+        f"Extracted {len(rows)} of {result['scanned']} rows matching '{spec['rows']}' "
+        f"in 1 WebDriver round trip ({elapsed_ms:.0f} ms)."
+    )
+    return rows
+
+
+def _wait_for_more(driver, spec, seen, timeout):
+    """
+    Polls until the page holds more than `seen` elements.
+    Returns (loaded, round trips spent).
+    """
+    deadline = time.monotonic() + timeout
+    round_trips = 0
+
+    while True:
+        round_trips += 1
+        if driver.execute_script(COUNT_SCRIPT, spec) > seen:
+            return True, round_trips
+        if time.monotonic() >= deadline:
+            return False, round_trips
+        time.sleep(LOAD_POLL)
+
+
+def stream_rows(driver, spec, chunk_size=CHUNK_SIZE, max_rows=None, scroll=True, load_timeout=None):
+    """
+    Yields the rows described by `spec` in chunks of up to
+    `chunk_size` scanned rows, one execute_script call each.
+    When the rendered rows run out it scrolls (or clicks
+    spec["more"]) and waits up to `load_timeout` seconds for
+    lazily loaded rows. Stops after `max_rows` scanned rows,
+    or as soon as the caller stops iterating. Returns True
+    (as the generator's return value) when `max_rows` ran out
+    before the rows did.
+    """
+    load_timeout = LOAD_TIMEOUT if load_timeout is None else load_timeout
+    offset, heading = 0, None
+    scanned = kept = round_trips = 0
+
+    with span("extract") as current:
+        try:
+            while max_rows is None or scanned < max_rows:
+                limit = chunk_size if max_rows is None else min(chunk_size, max_rows - scanned)
+                payload = driver.execute_script(EXTRACT_SCRIPT, spec, offset, limit, heading, scroll)
+                round_trips += 1
+
+                result = json.loads(payload)
+                offset, heading = result["next"], result["heading"]
+                scanned += result["scanned"]
+                kept += len(result["rows"])
+
+                if result["rows"]:
+                    yield result["rows"]
+
+                if offset >= result["total"]:
+                    if not scroll:
+                        break
+                    loaded, polls = _wait_for_more(driver, spec, result["total"], load_timeout)
+                    round_trips += polls
+                    if not loaded:
+                        break
+            else:
+                logging.info(f"Row budget of {max_rows} reached for '{spec['rows']}'.")
+                return True
+        finally:
+            current.set(rows=kept, scanned=scanned, round_trips=round_trips)
+            logging.info(
+                f"Streamed {kept} of {scanned} rows matching '{spec['rows']}' "
+                f"in {round_trips} WebDriver round trips."
+            )
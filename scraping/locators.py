@@ -0,0 +1,249 @@
+"""
+Central registry of the page elements the scrapers look for.
+
+Each logical element has an ordered list of candidate selectors
+(CSS, or XPath when it starts with "/" or "("). wait_for() tests
+every candidate of the elements it is asked about in a single
+script call per poll, remembers the selector that matched under
+data/selectors.json so it is tried first next time, and gives up
+early once the page has finished loading and stopped changing
+instead of sitting out the full timeout on a broken selector.
+"""
+import os
+import json
+import time
+import tempfile
+import threading
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
+from config.logger import setup_logging
+from config.paths import data_dir
+
+logging = setup_logging("Locators")
+
+# Seconds to look before checking whether the page has settled
+PROBE_SECONDS = float(os.getenv("LOCATOR_PROBE_SECONDS", "3"))
+
+# Seconds without DOM changes after which a settled page is given up on
+SETTLE_SECONDS = float(os.getenv("LOCATOR_SETTLE_SECONDS", "1.5"))
+
+POLL_SECONDS = 0.1
+
+LOCATORS = {
+    "movers_content": [
+        ".tv-category-content",
+        "[class*='category-content']",
+    ],
+    "movers_rows": [
+        ".tv-category-content table tbody tr",
+        "[class*='category-content'] table tbody tr",
+        "table tbody tr",
+    ],
+    "earnings_table": [
+        ".tv-data-table",
+        "table[class*='data-table']",
+    ],
+    "earnings_rows": [
+        ".tv-data-table__row",
+        "tr[class*='data-table__row']",
+        "table tbody tr",
+    ],
+    "econ_items": [
+        "div[data-name*='economic-calendar-item']",
+        "[data-name*='calendar-item']",
+    ],
+    "econ_importance": [
+        '//*[@id="js-category-content"]/div[2]/div/section/div/div[2]/div/div/div/div[1]/div[1]/button/span[2]/span[1]',
+        "//button[contains(@aria-label, 'mportance')]",
+        "//button[contains(normalize-space(.), 'Importance')]",
+    ],
+    "econ_tomorrow": [
+        '//*[@id="Tomorrow"]/span[1]/span',
+        '//*[@id="Tomorrow"]',
+        "//button[normalize-space(.)='Tomorrow']",
+    ],
+    "econ_this_week": [
+        '//*[@id="This week"]/span[1]/span',
+        '//*[@id="This week"]',
+        "//button[normalize-space(.)='This week']",
+    ],
+}
+
+LOCATE_SCRIPT = """
+const groups = arguments[0];
+const found = {};
+for (const name of Object.keys(groups)) {
+    found[name] = null;
+    for (const selector of groups[name]) {
+        let hit = null;
+        try {
+            if (selector.startsWith("/") || selector.startsWith("(")) {
+                hit = document.evaluate(selector, document, null,
+                    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            } else {
+                hit = document.querySelector(selector);
+            }
+        } catch (e) {
+            hit = null;
+        }
+        if (hit) {
+            found[name] = selector;
+            break;
+        }
+    }
+}
+return {found: found, ready: document.readyState, nodes: document.getElementsByTagName("*").length};
+"""
+
+
+class LocatorNotFound(TimeoutException):
+    """
+    No candidate selector for an element matched.
+    """
+
+
+def is_xpath(selector):
+    return selector.startswith("/") or selector.startswith("(")
+
+
+def by(selector):
+    """
+    Returns the Selenium (By, value) locator for a selector.
+    """
+    return (By.XPATH, selector) if is_xpath(selector) else (By.CSS_SELECTOR, selector)
+
+
+class SelectorRegistry:
+    """
+    LOCATORS with the selector that last matched each element
+    moved to the front, persisted as JSON under the data dir.
+    """
+
+    def __init__(self, path=None, locators=None):
+        self.path = path or os.path.join(data_dir(), "selectors.json")
+        self.locators = locators or LOCATORS
+        self._lock = threading.Lock()
+        self._winners = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                winners = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {
+            name: selector for name, selector in winners.items()
+            if selector in self.locators.get(name, ())
+        }
+
+    def candidates(self, name):
+        """
+        Returns the candidates for `name`, last winner first.
+        """
+        candidates = self.locators[name]
+        winner = self._winners.get(name)
+        if winner is None:
+            return list(candidates)
+        return [winner] + [c for c in candidates if c != winner]
+
+    def current(self, name):
+        """
+        Returns the best known selector for `name`.
+        """
+        return self.candidates(name)[0]
+
+    def remember(self, found):
+        """
+        Records the winning selector of every element in
+        `found` (name -> selector or None) and saves the
+        registry when any of them changed.
+        """
+        with self._lock:
+            changed = {
+                name: selector for name, selector in found.items()
+                if selector is not None and self._winners.get(name) != selector
+            }
+            if not changed:
+                return
+
+            for name, selector in changed.items():
+                default = self.locators[name][0]
+                if selector != default:
+                    logging.warning(f"Element '{name}' matched fallback selector {selector}.")
+            self._winners.update(changed)
+            winners = dict(self._winners)
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(winners, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"Failed to save selector registry: {e}")
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """
+    Returns the process-wide selector registry.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SelectorRegistry()
+        return _registry
+
+
+def current(name):
+    """
+    Returns the best known selector for element `name`.
+    """
+    return get_registry().current(name)
+
+
+def locate(driver, names):
+    """
+    Tests every candidate for `names` in one round trip. Returns
+    ({name: winning selector or None}, readyState, DOM size).
+    """
+    registry = get_registry()
+    result = driver.execute_script(LOCATE_SCRIPT, {name: registry.candidates(name) for name in names})
+    return result["found"], result["ready"], result["nodes"]
+
+
+def wait_for(driver, name, timeout=10, also=(), probe=None, settle=None):
+    """
+    Waits up to `timeout` seconds for element `name` and returns
+    the selector that matched. Elements in `also` are looked up
+    in the same calls and remembered when found. After `probe`
+    seconds, a page that has finished loading and whose DOM has
+    not changed for `settle` seconds raises LocatorNotFound
+    rather than waiting out the timeout.
+    """
+    probe = PROBE_SECONDS if probe is None else probe
+    settle = SETTLE_SECONDS if settle is None else settle
+    names = [name, *also]
+    start = time.monotonic()
+    last_size, stable_since = None, start
+
+    while True:
+        found, ready, size = locate(driver, names)
+        if found[name] is not None:
+            get_registry().remember(found)
+            return found[name]
+
+        now = time.monotonic()
+        if size != last_size:
+            last_size, stable_since = size, now
+
+        if now - start >= probe and ready == "complete" and now - stable_since >= settle:
+            raise LocatorNotFound(
+                f"No selector for '{name}' matched after {now - start:.1f}s on a settled page."
+            )
+        if now - start >= timeout:
+            raise LocatorNotFound(f"No selector for '{name}' matched within {timeout}s.")
+
+        time.sleep(POLL_SECONDS)
@@ -1,63 +1,222 @@
 import time
 import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from config.chrome_options import chrome_options
-from config.logger import setup_logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from config.logger import setup_logging, RowErrors
+from config.tracing import span, traced
+from scraping.extractor import extract_rows, field
+from scraping.movers_http import fetch_market_movers
+from scraping.records import movers
+from scraping.screener import SCREENER_ENABLED, fetch_screens
+from scraping.snapshots import snapshotted, snapshot_source, record_snapshot
 
 logging = setup_logging("MarketMoversLogger")
 
+MARKET_MOVERS_URLS = {
+    "pre_market_gainers": "https://www.tradingview.com/markets/stocks-usa/market-movers-pre-market-gainers/",
+    "pre_market_losers": "https://www.tradingview.com/markets/stocks-usa/market-movers-pre-market-losers/",
+    "pre_market_gappers": "https://www.tradingview.com/markets/stocks-usa/market-movers-pre-market-gappers/",
+    "week_high_52": "https://www.tradingview.com/markets/stocks-usa/market-movers-52wk-high/",
+    "week_low_52": "https://www.tradingview.com/markets/stocks-usa/market-movers-52wk-low/",
+    "all_time_high": "https://www.tradingview.com/markets/stocks-usa/market-movers-ath/",
+    "all_time_low": "https://www.tradingview.com/markets/stocks-usa/market-movers-atl/",
+}
+
+SCREENS_BY_URL = {url: key for key, url in MARKET_MOVERS_URLS.items()}
+
+# "rows" is filled in from the locator registry ("movers_rows")
+MARKET_MOVERS_SPEC = {
+    "fields": {
+        "Ticker": field("td:nth-child(1) span"),
+        "Pre-Market Change": field("td:nth-child(2) span"),
+    },
+}
+
+# Selenium, the driver pool and the locator registry are imported inside
+# the browser fallback only: the scanner and HTTP paths need none of them,
+# and importing them costs a Lambda cold start tens of milliseconds.
+
 def open_premarket_page(url):
     """
     Navigates to the specified pre-market
     page (gainers or losers).
     """
+    from config.chrome_options import block_resources
+    from config.driver_pool import borrow_driver, release_driver
+    from scraping.locators import wait_for
+
+    driver = None
     try:
-        driver = chrome_options()
-        logging.info(f"Initializing WebDriver and opening page: {url}")
+        driver = borrow_driver()
+        block_resources(driver, "market_movers")
+        logging.info(f"Borrowed WebDriver, opening page: {url}")
 
-        driver.get(url)
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "tv-category-content"))
-        )
+        with span("page_load"):
+            driver.get(url)
+            wait_for(driver, "movers_content", timeout=10, also=("movers_rows",))
 
         logging.info(f"Page loaded successfully: {url}")
         return driver
 
     except Exception as e:
         logging.error(f"Failed to open page {url}: {e}")
+        release_driver(driver, healthy=False)
         return None
     
+@traced("premarket_data_scraper")
 def premarket_data_scraper(driver):
     """
     Extracts Pre-Market gainers or
     losers data from TradingView
     """
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.CLASS_NAME, "tv-category-content"))
-    )
+    from scraping.locators import current, wait_for
+
+    wait_for(driver, "movers_content", timeout=10, also=("movers_rows",))
 
-    rows = driver.find_elements(By.XPATH, "//div[contains(@class, 'tv-category-content')]//table/tbody/tr")
+    rows = extract_rows(driver, dict(MARKET_MOVERS_SPEC, rows=current("movers_rows")))
     pre_market_data = []
 
-    for row in rows:
-        try:
-            ticker_element = row.find_element(By.XPATH, "./td[1]//span")
-            ticker_full = ticker_element.text.strip()
-            ticker = ticker_full.split("\n")[0]
-
-            if len(ticker) > 1:
-                percent_element = row.find_element(By.CSS_SELECTOR, "td:nth-child(2) span")
-                percent_change = percent_element.text.strip()
-                
-                pre_market_data.append({
-                    "Ticker": ticker,
-                    "Pre-Market Change": percent_change,
-                })
-
-        except Exception as e:
-            logging.error(f"Error processing row: {e}")
-
-    return pre_market_data
\ No newline at end of file
+    with RowErrors(logging, "market movers", rows=len(rows)) as errors:
+        for row in rows:
+            try:
+                ticker = row["Ticker"].strip().split("\n")[0]
+
+                if len(ticker) > 1:
+                    pre_market_data.append((ticker, row["Pre-Market Change"].strip()))
+
+            except Exception as e:
+                errors.add(e)
+
+    return movers(pre_market_data)
+
+def from_screener(urls):
+    """
+    Fetches the movers for every page in `urls` from the
+    scanner, one concurrent query per page. Returns a dict of
+    url -> rows for the pages the scanner covers (None where
+    it failed).
+    """
+    screens = [SCREENS_BY_URL[url] for url in urls if url in SCREENS_BY_URL]
+    if not SCREENER_ENABLED or not screens:
+        return {}
+
+    results = fetch_screens(screens)
+    return {MARKET_MOVERS_URLS[key]: rows for key, rows in results.items()}
+
+
+@traced("scrape_market_movers")
+@snapshotted("market_movers")
+def scrape_market_movers(url):
+    """
+    Returns the market movers table for `url`, from the
+    scanner API when it has rows, else parsed from the
+    server-rendered HTML, and scraped through Selenium
+    only when both yield nothing. Returns None when the
+    page could not be scraped.
+    """
+    rows = from_screener([url]).get(url)
+    if rows:
+        return rows
+
+    rows = fetch_market_movers(url)
+    if rows:
+        return rows
+
+    logging.info(f"No rows over HTTP, falling back to Selenium for {url}")
+    from config.driver_pool import release_driver
+
+    driver = open_premarket_page(url)
+    if not driver:
+        return None
+
+    try:
+        return premarket_data_scraper(driver)
+
+    except Exception as e:
+        logging.error(f"Error scraping market movers from {url}: {e}")
+        return None
+
+    finally:
+        release_driver(driver)
+
+@traced("scrape_market_movers_batch")
+def scrape_market_movers_batch(urls, max_workers=8):
+    """
+    Scrapes several market movers pages at once and returns
+    a dict of url -> rows (None for pages that failed).
+    Pages are queried on the scanner concurrently; any it has
+    no rows for are fetched concurrently over HTTP, and those
+    still empty are loaded together as tabs of one browser.
+    """
+    urls = list(dict.fromkeys(urls))
+    start = time.perf_counter()
+
+    results = {url: None for url in urls}
+    results.update(from_screener(urls))
+    pending = [url for url in urls if not results[url]]
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+            # Each fetch runs in a copy of this context so its spans stay attributed to the job
+            futures = [executor.submit(contextvars.copy_context().run, fetch_market_movers, url) for url in pending]
+            results.update({url: future.result() for url, future in zip(pending, futures)})
+
+    missing = [url for url, rows in results.items() if not rows]
+    if missing:
+        logging.info(f"No rows over HTTP for {len(missing)} page(s), falling back to browser tabs.")
+        results.update(scrape_in_tabs(missing))
+
+    for url, rows in results.items():
+        record_snapshot(snapshot_source("market_movers", url), rows)
+
+    elapsed = time.perf_counter() - start
+    logging.info(f"Scraped {len(urls)} market movers pages in {elapsed:.1f}s.")
+    return results
+
+
+def scrape_in_tabs(urls):
+    """
+    Opens every url as a tab of one borrowed browser so the
+    pages load in parallel, then extracts each tab in turn.
+    """
+    from config.chrome_options import block_resources
+    from config.driver_pool import borrow_driver, release_driver
+
+    results = {url: None for url in urls}
+
+    try:
+        driver = borrow_driver()
+    except Exception as e:
+        logging.error(f"Failed to borrow WebDriver for batch scrape: {e}")
+        return results
+
+    healthy = True
+    try:
+        tabs = {}
+        for url in urls:
+            # Open blank so the tab's resource blocking is in
+            # place before the page starts loading.
+            before = set(driver.window_handles)
+            driver.execute_script("window.open('about:blank', '_blank');")
+            opened = set(driver.window_handles) - before
+            if opened:
+                tabs[url] = opened.pop()
+                driver.switch_to.window(tabs[url])
+                block_resources(driver, "market_movers")
+                driver.execute_script("window.location.href = arguments[0];", url)
+
+        for url, handle in tabs.items():
+            try:
+                driver.switch_to.window(handle)
+                results[url] = premarket_data_scraper(driver)
+            except Exception as e:
+                logging.error(f"Error scraping tab {url}: {e}")
+
+    except Exception as e:
+        logging.error(f"Batch scrape failed: {e}")
+        healthy = False
+
+    finally:
+        release_driver(driver, healthy=healthy)
+
+    return results
@@ -0,0 +1,170 @@
+import time
+import requests
+from html.parser import HTMLParser
+from requests.adapters import HTTPAdapter
+from config.logger import setup_logging
+from config.tracing import traced
+from scraping.records import movers
+
+logging = setup_logging("MoversHTTP")
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+_session = None
+
+
+def get_session():
+    """
+    Returns a shared requests.Session with a pooled,
+    keep-alive connection to TradingView.
+    """
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=1)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        _session = session
+    return _session
+
+
+class MarketMoversParser(HTMLParser):
+    """
+    Streaming parser for the server-rendered market movers table.
+    Reads the text of the first <span> in the first two cells of
+    every body row inside the `tv-category-content` container,
+    mirroring what premarket_data_scraper reads through Selenium.
+    Rows are collected as (ticker, change) pairs.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self._stack = []
+        self._content_depth = None
+        self._tbody_depth = None
+        self._cells = None
+        self._cell_index = -1
+        self._span_depth = None
+        self._chunks = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+
+        self._stack.append(tag)
+        depth = len(self._stack)
+
+        if self._content_depth is None:
+            classes = (dict(attrs).get("class") or "").split()
+            if "tv-category-content" in classes:
+                self._content_depth = depth
+            return
+
+        if tag == "tbody" and self._tbody_depth is None:
+            self._tbody_depth = depth
+        elif tag == "tr" and self._tbody_depth is not None:
+            self._cells = []
+            self._cell_index = -1
+        elif tag == "td" and self._cells is not None:
+            self._cell_index += 1
+            self._cells.append(None)
+        elif tag == "span" and self._in_capturable_cell() and self._span_depth is None:
+            self._span_depth = depth
+            self._chunks = []
+
+    def handle_startendtag(self, tag, attrs):
+        pass
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS or tag not in self._stack:
+            return
+
+        while self._stack:
+            depth = len(self._stack)
+            closed = self._stack.pop()
+            self._close(closed, depth)
+            if closed == tag:
+                break
+
+    def handle_data(self, data):
+        if self._chunks is not None:
+            text = data.strip()
+            if text:
+                self._chunks.append(text)
+
+    def _in_capturable_cell(self):
+        return (
+            self._cells is not None
+            and 0 <= self._cell_index < 2
+            and self._cells[self._cell_index] is None
+        )
+
+    def _close(self, tag, depth):
+        if depth == self._span_depth:
+            self._cells[self._cell_index] = self._chunks
+            self._span_depth = None
+            self._chunks = None
+        elif tag == "tr" and self._cells is not None:
+            self._emit_row(self._cells)
+            self._cells = None
+        elif depth == self._tbody_depth:
+            self._tbody_depth = None
+        elif depth == self._content_depth:
+            self._content_depth = None
+
+    def _emit_row(self, cells):
+        if len(cells) < 2 or not cells[0] or cells[1] is None:
+            return
+
+        ticker = cells[0][0]
+        if len(ticker) > 1:
+            self.rows.append((ticker, "".join(cells[1])))
+
+
+def parse_market_movers(html):
+    """
+    Parses a saved or fetched market movers page into the
+    same records premarket_data_scraper returns.
+    """
+    parser = MarketMoversParser()
+    parser.feed(html)
+    parser.close()
+    return movers(parser.rows)
+
+
+@traced("fetch_market_movers")
+def fetch_market_movers(url, timeout=10):
+    """
+    Fetches a market movers page over plain HTTP and parses
+    the table as the body streams in. Returns an empty list
+    when the request fails or the table is not in the HTML.
+    """
+    start = time.perf_counter()
+
+    try:
+        parser = MarketMoversParser()
+        with get_session().get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            response.encoding = response.encoding or "utf-8"
+            for chunk in response.iter_content(chunk_size=65536, decode_unicode=True):
+                parser.feed(chunk)
+        parser.close()
+
+    except Exception as e:
+        logging.warning(f"HTTP fetch failed for {url}: {e}")
+        return []
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logging.info(f"Parsed {len(parser.rows)} rows from {url} over HTTP in {elapsed_ms:.0f} ms.")
+    return movers(parser.rows)
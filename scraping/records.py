@@ -0,0 +1,176 @@
+"""
+Record types for scraped rows.
+
+Each record keeps the text as shown on the page (what the tweets
+print) next to the number parsed from it, so ranking and
+thresholds work on floats. Numbers are parsed once per scrape
+with parse_numbers(). to_row()/from_rows() convert to and from
+the dicts stored in the scrape cache and snapshot history, whose
+keys are the original column names.
+"""
+import re
+import math
+import heapq
+from array import array
+from collections import namedtuple
+
+NAN = float("nan")
+
+SUFFIXES = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+
+# Optional sign, currency symbol or code, optional sign, number, optional K/M/B/T
+NUMBER_PATTERN = re.compile(r"([-+]?)[^\d.+-]*([-+]?)(\d+\.?\d*|\.\d+)([KMBT]?)")
+
+# TradingView prints a real minus sign and thin spaces between digit groups
+_NORMALISE = str.maketrans({"\u2212": "-", ",": None, " ": None, "\u00a0": None, "\u202f": None})
+
+
+def parse_number(text):
+    """
+    Parses "12.3%", "−4.10%", "1.82 USD" or "$100.5B" into a float.
+    Percentages stay in percent and K/M/B/T suffixes are expanded.
+    Returns NaN when there is no number.
+    """
+    if not text:
+        return NAN
+    match = NUMBER_PATTERN.search(text.translate(_NORMALISE))
+    if not match:
+        return NAN
+
+    sign, inner_sign, digits, suffix = match.groups()
+    value = float(digits) * SUFFIXES.get(suffix, 1.0)
+    return -value if "-" in (sign, inner_sign) else value
+
+
+def parse_numbers(texts):
+    """
+    Parses a column of texts into an array of doubles.
+    """
+    return array("d", map(parse_number, texts))
+
+
+def top_k(records, k, key, above=None):
+    """
+    Returns up to `k` records with the largest key(record), best
+    first, keeping page order between ties. Records whose value is
+    NaN or not greater than `above` are skipped. When no value on
+    the page could be parsed, the first `k` rows are returned as-is.
+    """
+    values = array("d", map(key, records))
+    ranked = [i for i, value in enumerate(values) if not math.isnan(value)]
+    if not ranked:
+        return list(records[:k])
+
+    if above is not None:
+        ranked = [i for i in ranked if values[i] > above]
+    return [records[i] for i in heapq.nlargest(k, ranked, key=values.__getitem__)]
+
+
+def ranked(records, key):
+    """
+    Returns `records` sorted by key(record), largest first,
+    with NaN values last and page order kept between ties.
+    """
+    def sort_key(record):
+        value = key(record)
+        return (math.isnan(value), -value if not math.isnan(value) else 0.0)
+
+    return sorted(records, key=sort_key)
+
+
+class Mover(namedtuple("Mover", ["ticker", "change", "change_pct"])):
+    """
+    A market movers row: the change column as shown and in percent.
+    """
+
+    __slots__ = ()
+
+    def to_row(self):
+        return {"Ticker": self.ticker, "Pre-Market Change": self.change}
+
+    @classmethod
+    def from_rows(cls, rows):
+        return movers([(row["Ticker"], row["Pre-Market Change"]) for row in rows])
+
+
+class Earnings(namedtuple("Earnings", ["ticker", "eps_estimate", "revenue_forecast", "time", "eps", "revenue"])):
+    """
+    An earnings calendar row, with the EPS and revenue
+    estimates as shown and as numbers.
+    """
+
+    __slots__ = ()
+
+    def to_row(self):
+        return {
+            "Ticker": self.ticker,
+            "EPS Estimate": self.eps_estimate,
+            "Revenue Forecast": self.revenue_forecast,
+            "Time": self.time,
+        }
+
+    @classmethod
+    def from_rows(cls, rows):
+        return earnings([
+            (row["Ticker"], row["EPS Estimate"], row["Revenue Forecast"], row["Time"])
+            for row in rows
+        ])
+
+
+class EconEvent(namedtuple("EconEvent", ["event", "date"])):
+    """
+    An economic calendar event and the ISO date it is
+    listed under (None when unknown).
+    """
+
+    __slots__ = ()
+
+    def to_row(self):
+        if self.date is None:
+            return {"Event": self.event}
+        return {"Event": self.event, "Date": self.date}
+
+    @classmethod
+    def from_rows(cls, rows):
+        return [cls(row["Event"], row.get("Date")) for row in rows]
+
+
+def movers(pairs):
+    """
+    Builds Movers from (ticker, change text) pairs.
+    """
+    pairs = list(pairs)
+    changes = parse_numbers(change for _, change in pairs)
+    return [Mover(ticker, change, pct) for (ticker, change), pct in zip(pairs, changes)]
+
+
+def earnings(rows):
+    """
+    Builds Earnings from (ticker, eps, revenue, time) tuples.
+    """
+    rows = list(rows)
+    eps = parse_numbers(row[1] for row in rows)
+    revenue = parse_numbers(row[2] for row in rows)
+    return [Earnings(*row, e, r) for row, e, r in zip(rows, eps, revenue)]
+
+
+def to_rows(records):
+    """
+    Converts records to their stored dicts; dicts pass through.
+    """
+    return [record.to_row() if hasattr(record, "to_row") else record for record in records]
+
+
+# Snapshot sources whose rows are stored per ticker
+RECORD_TYPES = {
+    "market_movers": Mover,
+    "earnings": Earnings,
+}
+
+
+def record_type(source):
+    """
+    Returns the record type for a snapshot source
+    key, or None when its rows are kept as dicts.
+    """
+    return RECORD_TYPES.get(source.split("|", 1)[0])
@@ -0,0 +1,179 @@
+"""
+Client for TradingView's JSON scanner endpoint, the data behind
+the market movers pages.
+
+Every screen (gainers, losers, gappers, 52-week and all-time highs
+and lows) is one small query: the scanner applies the screen's
+filter and sort and returns only its top SCREENER_LIMIT rows with
+the single column the tweets print. The queries of a batch run
+concurrently over one pooled keep-alive session. SCREENER_URL
+points the client at another host, e.g. the replay server in
+benchmarks/screener.py for offline runs.
+"""
+import os
+import time
+import math
+import contextvars
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from config.logger import setup_logging
+from config.tracing import traced
+from scraping.records import Mover, parse_number
+
+logging = setup_logging("Screener")
+
+SCREENER_URL = os.getenv("SCREENER_URL", "https://scanner.tradingview.com")
+SCREENER_ENABLED = os.getenv("SCREENER_API", "1") != "0"
+
+# Rows requested per screen, as many as a movers page lists
+SCREENER_LIMIT = int(os.getenv("SCREENER_LIMIT", "100"))
+
+MARKET = "america"
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# US-listed common stocks and depositary receipts, as on the movers pages
+UNIVERSE_FILTER = [
+    {"left": "type", "operation": "in_range", "right": ["stock", "dr"]},
+    {"left": "exchange", "operation": "in_range", "right": ["AMEX", "NASDAQ", "NYSE"]},
+    {"left": "is_primary", "operation": "equal", "right": True},
+]
+
+
+class Screen:
+    """
+    One movers list: rows where `where` holds, ranked on
+    `value` (largest first unless `descending` is False).
+    `where` is (column, scanner operation, column or number).
+    """
+
+    def __init__(self, value, descending=True, where=None):
+        self.value = value
+        self.descending = descending
+        self.where = where
+
+    def query(self, limit=SCREENER_LIMIT):
+        """
+        Returns the scanner request body for this screen.
+        """
+        filters = list(UNIVERSE_FILTER)
+        filters.append({"left": self.value, "operation": "nempty"})
+        if self.where is not None:
+            left, operation, right = self.where
+            filters.append({"left": left, "operation": operation, "right": right})
+
+        return {
+            "filter": filters,
+            "options": {"lang": "en"},
+            "markets": [MARKET],
+            "symbols": {"query": {"types": []}, "tickers": []},
+            "columns": [self.value],
+            "sort": {"sortBy": self.value, "sortOrder": "desc" if self.descending else "asc"},
+            "range": [0, limit],
+        }
+
+
+# Keyed like scraping.market_movers.MARKET_MOVERS_URLS
+SCREENS = {
+    "pre_market_gainers": Screen("premarket_change", where=("premarket_change", "greater", 0)),
+    "pre_market_losers": Screen("premarket_change", descending=False, where=("premarket_change", "less", 0)),
+    "pre_market_gappers": Screen("premarket_gap", where=("premarket_gap", "greater", 0)),
+    "week_high_52": Screen("change", where=("high", "egreater", "price_52_week_high")),
+    "week_low_52": Screen("change", descending=False, where=("low", "eless", "price_52_week_low")),
+    "all_time_high": Screen("change", where=("high", "egreater", "High.All")),
+    "all_time_low": Screen("change", descending=False, where=("low", "eless", "Low.All")),
+}
+
+_session = None
+
+
+def get_session():
+    """
+    Returns a shared requests.Session with a pooled,
+    keep-alive connection to the scanner.
+    """
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=len(SCREENS), max_retries=1)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json",
+            "Origin": "https://www.tradingview.com",
+            "Referer": "https://www.tradingview.com/",
+        })
+        _session = session
+    return _session
+
+
+def _number(value):
+    if value is None:
+        return math.nan
+    if isinstance(value, str):
+        return parse_number(value)
+    return float(value)
+
+
+def percent_text(value):
+    """
+    Formats a change as the movers pages print it.
+    """
+    return f"+{value:.2f}%" if value >= 0 else f"−{-value:.2f}%"
+
+
+def parse_screen(payload):
+    """
+    Turns a screen's scanner response into Movers, in the
+    order the scanner ranked them. Rows without a value
+    are dropped.
+    """
+    records = []
+    for row in payload.get("data") or []:
+        value = _number(row["d"][0])
+        if not math.isnan(value):
+            records.append(Mover(row["s"].split(":", 1)[-1], percent_text(value), value))
+    return records
+
+
+def fetch_screen(name, base_url=None, limit=SCREENER_LIMIT, timeout=15):
+    """
+    Runs screen `name` on the scanner. Returns its Movers,
+    or None when the request fails.
+    """
+    url = f"{(base_url or SCREENER_URL).rstrip('/')}/{MARKET}/scan"
+    try:
+        response = get_session().post(url, json=SCREENS[name].query(limit), timeout=timeout)
+        response.raise_for_status()
+        return parse_screen(response.json())
+    except Exception as e:
+        logging.warning(f"Scanner request failed for {name}: {e}")
+        return None
+
+
+@traced("fetch_screens")
+def fetch_screens(names, base_url=None, limit=SCREENER_LIMIT, timeout=15):
+    """
+    Runs the screens in `names` (keys of SCREENS) concurrently
+    and returns a dict of name -> Movers (None where it failed).
+    """
+    names = [name for name in dict.fromkeys(names) if name in SCREENS]
+    if not names:
+        return {}
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        # Each request runs in a copy of this context so its spans stay attributed to the job
+        futures = [
+            executor.submit(contextvars.copy_context().run, fetch_screen, name, base_url, limit, timeout)
+            for name in names
+        ]
+        results = {name: future.result() for name, future in zip(names, futures)}
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    counts = ", ".join(f"{name}: {'failed' if rows is None else len(rows)}" for name, rows in results.items())
+    logging.info(f"Ran {len(names)} screen(s) ({counts}) in {elapsed_ms:.0f} ms.")
+    return results
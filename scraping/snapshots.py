@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import datetime
+import functools
+import threading
+from contextlib import contextmanager
+from config.logger import setup_logging
+from config.market_calendar import trading_date
+from config.paths import data_dir
+from scraping.records import to_rows, record_type
+
+logging = setup_logging("Snapshots")
+
+RETENTION_DAYS = int(os.getenv("SNAPSHOT_RETENTION_DAYS", "400"))
+
+# Payloads are content addressed, so a scrape that returns the
+# same rows as an earlier one only costs a snapshots row.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS payloads (
+    content_hash TEXT PRIMARY KEY,
+    rows TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    trading_date TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    row_count INTEGER NOT NULL,
+    content_hash TEXT NOT NULL REFERENCES payloads (content_hash)
+);
+CREATE TABLE IF NOT EXISTS snapshot_tickers (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    ticker TEXT NOT NULL,
+    trading_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_source_date ON snapshots (source, trading_date, taken_at);
+CREATE INDEX IF NOT EXISTS snapshots_date ON snapshots (trading_date);
+CREATE INDEX IF NOT EXISTS snapshot_tickers_ticker ON snapshot_tickers (ticker, trading_date);
+CREATE INDEX IF NOT EXISTS snapshot_tickers_snapshot ON snapshot_tickers (snapshot_id);
+"""
+
+
+def content_hash(rows):
+    """
+    Returns a stable hash of scraped rows or records.
+    """
+    canonical = json.dumps(to_rows(rows), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class SnapshotStore:
+    """
+    Append-only SQLite history of scrape results, indexed
+    by source, trading date and ticker.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(data_dir(), "snapshots.sqlite3")
+
+        # auto_vacuum only takes effect on a new database, before
+        # it is switched to WAL and before any table exists
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        finally:
+            conn.close()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self, source, rows, day=None):
+        """
+        Appends a snapshot of `rows` for `source` and
+        returns its content hash.
+        """
+        day = (day or trading_date()).isoformat()
+        rows = to_rows(rows)
+        digest = content_hash(rows)
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO payloads (content_hash, rows) VALUES (?, ?)",
+                (digest, json.dumps(rows, separators=(",", ":"))),
+            )
+            cursor = conn.execute(
+                "INSERT INTO snapshots (source, trading_date, taken_at, row_count, content_hash) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (source, day, time.time(), len(rows), digest),
+            )
+            tickers = {row["Ticker"] for row in rows if isinstance(row, dict) and row.get("Ticker")}
+            conn.executemany(
+                "INSERT INTO snapshot_tickers (snapshot_id, ticker, trading_date) VALUES (?, ?, ?)",
+                [(cursor.lastrowid, ticker, day) for ticker in sorted(tickers)],
+            )
+
+        return digest
+
+    def previous_session_hash(self, source, day=None):
+        """
+        Returns the content hash of the last snapshot of
+        `source` taken on an earlier trading date, or None.
+        """
+        day = (day or trading_date()).isoformat()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT content_hash FROM snapshots WHERE source = ? AND trading_date < ? "
+                "ORDER BY trading_date DESC, taken_at DESC LIMIT 1",
+                (source, day),
+            ).fetchone()
+        return row["content_hash"] if row else None
+
+    def latest(self, source, day=None):
+        """
+        Returns the rows of the newest snapshot of `source`
+        on `day` (default today), or None.
+        """
+        day = (day or trading_date()).isoformat()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT p.rows FROM snapshots s JOIN payloads p USING (content_hash) "
+                "WHERE s.source = ? AND s.trading_date = ? ORDER BY s.taken_at DESC LIMIT 1",
+                (source, day),
+            ).fetchone()
+        return json.loads(row["rows"]) if row else None
+
+    def ticker_history(self, ticker, since=None):
+        """
+        Returns [(trading_date, source, taken_at, record)] for every
+        snapshot row of `ticker`, oldest first. Rows of sources
+        with a record type are returned as records.
+        """
+        since = (since or datetime.date.min).isoformat()
+        with self._connect() as conn:
+            found = conn.execute(
+                "SELECT s.trading_date, s.source, s.taken_at, p.rows FROM snapshot_tickers t "
+                "JOIN snapshots s ON s.id = t.snapshot_id JOIN payloads p USING (content_hash) "
+                "WHERE t.ticker = ? AND t.trading_date >= ? ORDER BY s.taken_at",
+                (ticker, since),
+            ).fetchall()
+
+        history = []
+        for row in found:
+            matches = [r for r in json.loads(row["rows"]) if r.get("Ticker") == ticker]
+            kind = record_type(row["source"])
+            if kind is not None:
+                matches = kind.from_rows(matches)
+            history.extend((row["trading_date"], row["source"], row["taken_at"], match) for match in matches)
+        return history
+
+    def prune(self, keep_days=RETENTION_DAYS):
+        """
+        Deletes snapshots older than `keep_days`, drops payloads
+        no snapshot refers to any more and returns the freed
+        pages to the filesystem. Returns the snapshots deleted.
+        """
+        cutoff = (trading_date() - datetime.timedelta(days=keep_days)).isoformat()
+
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM snapshot_tickers WHERE snapshot_id IN "
+                "(SELECT id FROM snapshots WHERE trading_date < ?)",
+                (cutoff,),
+            )
+            deleted = conn.execute("DELETE FROM snapshots WHERE trading_date < ?", (cutoff,)).rowcount
+            conn.execute(
+                "DELETE FROM payloads WHERE content_hash NOT IN (SELECT content_hash FROM snapshots)"
+            )
+
+        if deleted:
+            with self._connect() as conn:
+                conn.execute("PRAGMA incremental_vacuum")
+            logging.info(f"Pruned {deleted} snapshots older than {cutoff}.")
+        return deleted
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    Returns the process-wide snapshot store, pruning
+    expired history the first time it is opened.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SnapshotStore()
+            try:
+                _store.prune()
+            except sqlite3.Error as e:
+                logging.warning(f"Snapshot pruning failed: {e}")
+        return _store
+
+
+def snapshot_source(source, *args):
+    """
+    Returns the snapshot source key for a scraper call.
+    """
+    return "|".join([source, *map(str, args)])
+
+
+def snapshotted(source):
+    """
+    Records every list a scraper returns under
+    snapshot_source(source, *args).
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            if isinstance(result, list):
+                record_snapshot(snapshot_source(source, *args), result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def record_snapshot(source, rows):
+    """
+    Stores a scrape result. Failures are logged and never
+    interrupt the scrape.
+    """
+    if rows is None:
+        return
+    try:
+        get_store().record(source, rows)
+    except (sqlite3.Error, OSError, TypeError) as e:
+        logging.warning(f"Failed to record snapshot for {source}: {e}")
+
+
+def unchanged_since_last_session(source, rows):
+    """
+    True when `rows` match the last snapshot of `source` from
+    an earlier trading date, i.e. posting them would repeat
+    the previous session's post.
+    """
+    if not rows:
+        return False
+    try:
+        return get_store().previous_session_hash(source) == content_hash(rows)
+    except (sqlite3.Error, OSError) as e:
+        logging.warning(f"Snapshot diff failed for {source}: {e}")
+        return False
@@ -0,0 +1,85 @@
+import os
+import json
+import threading
+from types import MappingProxyType
+from typing import NamedTuple
+from config.logger import setup_logging
+from config.paths import PROJECT_ROOT
+
+logging = setup_logging("Watchlist")
+
+WATCHLIST_PATH = os.getenv("WATCHLIST_PATH", os.path.join(PROJECT_ROOT, "config", "watchlist.json"))
+
+
+class WatchlistIndex(NamedTuple):
+    """
+    Immutable view of the earnings watchlist. `by_date` entries
+    (ISO dates) take precedence over the `by_weekday` defaults.
+    """
+    by_weekday: MappingProxyType
+    by_date: MappingProxyType
+    mtime: float
+
+    def tickers_for(self, day):
+        """
+        Returns the frozenset of tickers tracked on `day`.
+        """
+        tickers = self.by_date.get(day.isoformat())
+        if tickers is None:
+            tickers = self.by_weekday.get(day.strftime("%A"), frozenset())
+        return tickers
+
+
+def normalize_ticker(ticker):
+    """
+    Upper-cases a ticker and strips whitespace
+    and a leading cashtag.
+    """
+    return ticker.strip().lstrip("$").upper()
+
+
+def _freeze(mapping):
+    return MappingProxyType({
+        key: frozenset(filter(None, map(normalize_ticker, tickers)))
+        for key, tickers in mapping.items()
+    })
+
+
+def load_watchlist(path=WATCHLIST_PATH):
+    """
+    Reads the watchlist file into a WatchlistIndex.
+    """
+    mtime = os.stat(path).st_mtime
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    index = WatchlistIndex(
+        by_weekday=_freeze({day.capitalize(): t for day, t in data.get("weekdays", {}).items()}),
+        by_date=_freeze(data.get("dates", {})),
+        mtime=mtime,
+    )
+    logging.info(f"Loaded watchlist from {path} ({sum(map(len, index.by_weekday.values()))} weekday entries).")
+    return index
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_watchlist(path=WATCHLIST_PATH):
+    """
+    Returns the current index, reloading it when
+    the watchlist file's mtime has changed. If a
+    reload fails the previous index is kept.
+    """
+    global _index
+    with _lock:
+        try:
+            mtime = os.stat(path).st_mtime
+            if _index is None or mtime != _index.mtime:
+                _index = load_watchlist(path)
+        except (OSError, ValueError) as e:
+            if _index is None:
+                raise
+            logging.error(f"Failed to reload watchlist, keeping previous version: {e}")
+        return _index
@@ -0,0 +1,17 @@
+import os
+import pytest
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def read_fixture(name):
+    """
+    Returns the text of tests/fixtures/`name`.
+    """
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def fixture_text():
+    return read_fixture
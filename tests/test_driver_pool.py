@@ -0,0 +1,79 @@
+import threading
+import pytest
+
+pytest.importorskip("psutil")
+
+from config.driver_pool import DriverPool
+
+
+class FakeDriver:
+    window_handles = ["main"]
+
+    def __init__(self):
+        self.quit_calls = 0
+
+    def execute_script(self, script):
+        return 1
+
+    @property
+    def switch_to(self):
+        return self
+
+    def window(self, handle):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+@pytest.fixture
+def pool():
+    return DriverPool(size=1, max_uses=10, idle_timeout=600, factory=lambda debug_port: FakeDriver())
+
+
+def test_released_session_is_reused(pool):
+    driver = pool.borrow(timeout=1)
+    pool.release(driver)
+
+    assert pool.borrow(timeout=1) is driver
+
+
+def test_borrow_after_close_raises(pool):
+    pool.release(pool.borrow(timeout=1))
+    pool.close()
+
+    with pytest.raises(RuntimeError):
+        pool.borrow(timeout=1)
+
+
+def test_release_after_close_quits_the_session(pool):
+    driver = pool.borrow(timeout=1)
+    pool.close()
+    pool.release(driver)
+
+    assert driver.quit_calls == 1
+    assert pool.sessions() == []
+    # max_uses is no longer used as the closed flag
+    assert pool.max_uses == 10
+
+
+def test_close_wakes_waiting_borrowers(pool):
+    pool.borrow(timeout=1)
+    errors = []
+
+    def wait():
+        try:
+            pool.borrow(timeout=30)
+        except Exception as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    pool.close()
+    waiter.join(timeout=5)
+
+    assert not waiter.is_alive()
+    assert [type(e) for e in errors] == [RuntimeError]
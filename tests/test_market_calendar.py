@@ -0,0 +1,130 @@
+import datetime
+import pytest
+from config.market_calendar import (
+    before_trading_day,
+    is_trading_day,
+    next_trading_day,
+    nyse_holidays,
+    trading_date,
+)
+
+D = datetime.date
+
+# Full-day closures as published by NYSE
+KNOWN_HOLIDAYS = {
+    2021: [
+        D(2021, 1, 1), D(2021, 1, 18), D(2021, 2, 15), D(2021, 4, 2), D(2021, 5, 31),
+        D(2021, 7, 5), D(2021, 9, 6), D(2021, 11, 25), D(2021, 12, 24),
+    ],
+    2022: [
+        D(2022, 1, 17), D(2022, 2, 21), D(2022, 4, 15), D(2022, 5, 30), D(2022, 6, 20),
+        D(2022, 7, 4), D(2022, 9, 5), D(2022, 11, 24), D(2022, 12, 26),
+    ],
+    2023: [
+        D(2023, 1, 2), D(2023, 1, 16), D(2023, 2, 20), D(2023, 4, 7), D(2023, 5, 29),
+        D(2023, 6, 19), D(2023, 7, 4), D(2023, 9, 4), D(2023, 11, 23), D(2023, 12, 25),
+    ],
+    2024: [
+        D(2024, 1, 1), D(2024, 1, 15), D(2024, 2, 19), D(2024, 3, 29), D(2024, 5, 27),
+        D(2024, 6, 19), D(2024, 7, 4), D(2024, 9, 2), D(2024, 11, 28), D(2024, 12, 25),
+    ],
+    2025: [
+        D(2025, 1, 1), D(2025, 1, 20), D(2025, 2, 17), D(2025, 4, 18), D(2025, 5, 26),
+        D(2025, 6, 19), D(2025, 7, 4), D(2025, 9, 1), D(2025, 11, 27), D(2025, 12, 25),
+    ],
+    2026: [
+        D(2026, 1, 1), D(2026, 1, 19), D(2026, 2, 16), D(2026, 4, 3), D(2026, 5, 25),
+        D(2026, 6, 19), D(2026, 7, 3), D(2026, 9, 7), D(2026, 11, 26), D(2026, 12, 25),
+    ],
+}
+
+
+@pytest.mark.parametrize("year", sorted(KNOWN_HOLIDAYS))
+def test_known_years(year):
+    assert sorted(nyse_holidays(year)) == KNOWN_HOLIDAYS[year]
+
+
+@pytest.mark.parametrize("day, name", [
+    # Saturday holidays move to Friday
+    (D(2021, 12, 24), "Christmas Day"),
+    (D(2026, 7, 3), "Independence Day"),
+    # Sunday holidays move to Monday
+    (D(2021, 7, 5), "Independence Day"),
+    (D(2022, 6, 20), "Juneteenth"),
+    (D(2022, 12, 26), "Christmas Day"),
+    (D(2023, 1, 2), "New Year's Day"),
+])
+def test_weekend_holidays_are_observed_on_a_weekday(day, name):
+    assert nyse_holidays(day.year)[day] == name
+    assert not is_trading_day(day)
+
+
+@pytest.mark.parametrize("day", [
+    D(2008, 3, 21), D(2019, 4, 19), D(2021, 4, 2), D(2022, 4, 15),
+    D(2023, 4, 7), D(2024, 3, 29), D(2025, 4, 18), D(2038, 4, 23),
+])
+def test_good_friday(day):
+    assert nyse_holidays(day.year)[day] == "Good Friday"
+
+
+def test_juneteenth_from_2022():
+    assert "Juneteenth" not in nyse_holidays(2021).values()
+    assert is_trading_day(D(2021, 6, 18))
+    assert nyse_holidays(2022)[D(2022, 6, 20)] == "Juneteenth"
+    assert nyse_holidays(2024)[D(2024, 6, 19)] == "Juneteenth"
+
+
+@pytest.mark.parametrize("year", [2011, 2022, 2028])
+def test_saturday_new_year_is_not_observed_on_friday(year):
+    assert D(year, 1, 1).weekday() == 5
+    assert "New Year's Day" not in nyse_holidays(year).values()
+    # The last session of the previous year still trades
+    assert is_trading_day(D(year - 1, 12, 31))
+
+
+def test_one_off_closures_are_not_included():
+    # National day of mourning for President Carter
+    assert is_trading_day(D(2025, 1, 9))
+
+
+def test_weekends_are_not_trading_days():
+    assert not is_trading_day(D(2025, 6, 21))
+    assert not is_trading_day(D(2025, 6, 22))
+    assert is_trading_day(D(2025, 6, 23))
+
+
+@pytest.mark.parametrize("day, expected", [
+    (D(2025, 6, 20), D(2025, 6, 23)),
+    (D(2024, 3, 28), D(2024, 4, 1)),
+    (D(2021, 12, 23), D(2021, 12, 27)),
+    (D(2025, 12, 31), D(2026, 1, 2)),
+])
+def test_next_trading_day(day, expected):
+    assert next_trading_day(day) == expected
+
+
+@pytest.mark.parametrize("day, expected", [
+    # Monday to Thursday evenings preview the next session
+    (D(2025, 6, 16), True),
+    # Friday and Saturday evenings do not; Sunday's does
+    (D(2025, 6, 20), False),
+    (D(2025, 6, 21), False),
+    (D(2025, 6, 22), True),
+    # The evening before a holiday, and the holiday before a session
+    (D(2024, 3, 28), False),
+    (D(2024, 3, 31), True),
+    (D(2025, 7, 3), False),
+    (D(2025, 7, 4), False),
+    (D(2022, 6, 19), False),
+    (D(2022, 6, 20), True),
+    # Friday Dec 31 trades even though Jan 1 falls on Saturday
+    (D(2021, 12, 30), True),
+])
+def test_before_trading_day(day, expected):
+    assert before_trading_day(day) is expected
+
+
+def test_trading_date_uses_new_york_time():
+    late_utc = datetime.datetime(2025, 3, 4, 3, 30, tzinfo=datetime.timezone.utc)
+
+    assert trading_date(late_utc) == D(2025, 3, 3)
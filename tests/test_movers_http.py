@@ -0,0 +1,58 @@
+import math
+from scraping.movers_http import parse_market_movers
+
+
+def _page(rows):
+    return (
+        "<html><body><div class='tv-category-content'><table><tbody>"
+        f"{rows}</tbody></table></div></body></html>"
+    )
+
+
+def test_saved_page(fixture_text):
+    rows = parse_market_movers(fixture_text("market_movers.html"))
+
+    assert [(r.ticker, r.change) for r in rows] == [
+        ("SMX", "+187.45%"),
+        ("BRK.B", "+2.10%"),
+        ("ATNF", "+64.33%"),
+        ("UAMY", "+1,204.00%"),
+        ("QBTS", "−3.75%"),
+        ("GME", "+9.81%"),
+    ]
+    assert [r.change_pct for r in rows] == [187.45, 2.1, 64.33, 1204.0, -3.75, 9.81]
+
+
+def test_page_without_table():
+    html = "<html><body><div class='tv-category-content'><p>No data here</p></div></body></html>"
+    assert parse_market_movers(html) == []
+
+
+def test_table_outside_content_is_ignored():
+    html = "<html><body><table><tbody><tr><td><span>AAPL</span></td><td><span>+1.00%</span></td></tr></tbody></table></body></html>"
+    assert parse_market_movers(html) == []
+
+
+def test_malformed_rows_are_skipped():
+    html = _page(
+        "<tr><td><span>AAPL</span></td><td><span>+1.50%</span></td></tr>"
+        # Only one cell
+        "<tr><td><span>LONE</span></td></tr>"
+        # No span in the ticker cell
+        "<tr><td>NOSPAN</td><td><span>+3.00%</span></td></tr>"
+        # Empty ticker span
+        "<tr><td><span></span></td><td><span>+4.00%</span></td></tr>"
+        # Unclosed span and cell, closed by the row
+        "<tr><td><span>OPEN<td><span>+5.00%</tr>"
+        "<tr><td><span>MSFT</span></td><td><span>−2.25%</span></td></tr>"
+    )
+    rows = parse_market_movers(html)
+
+    assert [(r.ticker, r.change_pct) for r in rows] == [("AAPL", 1.5), ("MSFT", -2.25)]
+
+
+def test_unparseable_change_keeps_row():
+    rows = parse_market_movers(_page("<tr><td><span>ABCD</span></td><td><span>—</span></td></tr>"))
+
+    assert [(r.ticker, r.change) for r in rows] == [("ABCD", "—")]
+    assert math.isnan(rows[0].change_pct)
@@ -0,0 +1,77 @@
+import pytest
+from twitter.outbox import Outbox
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return Outbox(str(tmp_path / "outbox.sqlite3"))
+
+
+def _rows(outbox, sink="x"):
+    with outbox._connect() as conn:
+        return [dict(row) for row in conn.execute("SELECT * FROM outbox WHERE sink = ? ORDER BY id", (sink,))]
+
+
+def _thread(outbox, sink="x"):
+    """
+    Returns [(text, parent text)] in queue order.
+    """
+    rows = _rows(outbox, sink)
+    texts = {row["id"]: row["text"] for row in rows}
+    return [(row["text"], texts.get(row["parent_id"])) for row in rows]
+
+
+def _post_all(outbox, sink="x"):
+    posted = []
+    while (row := outbox.next_due(sink)) is not None:
+        outbox.mark_sent(row["id"], f"post:{row['text']}")
+        posted.append((row["text"], row["reply_to"]))
+    return posted
+
+
+def test_same_thread_is_queued_once(outbox):
+    parts = ["Earnings today:", "$AAPL", "$MSFT"]
+
+    assert outbox.enqueue_thread(parts) is True
+    assert outbox.enqueue_thread(parts) is False
+    assert [row["text"] for row in _rows(outbox)] == parts
+
+
+def test_same_header_with_new_items_is_queued(outbox):
+    assert outbox.enqueue_thread(["Earnings today:", "$AAPL"]) is True
+    assert _post_all(outbox) == [("Earnings today:", None), ("$AAPL", "post:Earnings today:")]
+
+    assert outbox.enqueue_thread(["Earnings today:", "$NVDA", "$TSLA"]) is True
+
+    assert [row["text"] for row in _rows(outbox)] == ["Earnings today:", "$AAPL", "$NVDA", "$TSLA"]
+    # The header is not posted again; the new items reply under it
+    assert _post_all(outbox) == [("$NVDA", "post:Earnings today:"), ("$TSLA", "post:$NVDA")]
+
+
+def test_changed_item_requeues_the_rest_of_the_thread(outbox):
+    outbox.enqueue_thread(["Header", "A", "C"])
+    outbox.enqueue_thread(["Header", "B", "C"])
+
+    assert _thread(outbox) == [
+        ("Header", None), ("A", "Header"), ("C", "A"), ("B", "Header"), ("C", "B"),
+    ]
+
+
+def test_dedupe_is_per_sink(outbox):
+    assert outbox.enqueue_thread(["Header", "A"], sinks=("x",)) is True
+    assert outbox.enqueue_thread(["Header", "A"], sinks=("x", "file")) is True
+
+    assert [row["text"] for row in _rows(outbox, "x")] == ["Header", "A"]
+    assert [row["text"] for row in _rows(outbox, "file")] == ["Header", "A"]
+
+
+def test_new_items_under_a_failed_header_fail(outbox):
+    outbox.enqueue_thread(["Header", "A"])
+    outbox.mark_failed(outbox.next_due()["id"], "rejected")
+
+    outbox.enqueue_thread(["Header", "B"])
+
+    assert [(row["text"], row["status"]) for row in _rows(outbox)] == [
+        ("Header", "failed"), ("A", "failed"), ("B", "failed"),
+    ]
+    assert outbox.seconds_until_due() is None
@@ -0,0 +1,107 @@
+import pytest
+from twitter.packer import MAX_TWEET_LENGTH, URL_LENGTH, fits, pack_thread, tweet_length
+
+
+@pytest.mark.parametrize("text, length", [
+    ("", 0),
+    ("$AAPL +1.50%", 12),
+    # Latin, Greek and Cyrillic are light
+    ("café αβγ Сбер", 13),
+    # Decomposed é is normalised to one code point
+    ("café", 4),
+    # Light punctuation (en dash, curly quotes) vs the heavy U+2212 minus
+    ("–“”", 3),
+    ("−", 2),
+    # CJK and fullwidth characters weigh two
+    ("東京", 4),
+    ("ＡＢ", 4),
+    # Every URL counts as 23, whatever its length
+    ("https://t.co/x", URL_LENGTH),
+    ("see www.example.com/a/very/long/path?with=query", 4 + URL_LENGTH),
+    ("https://a.io and http://b.io", 2 * URL_LENGTH + 5),
+    # An emoji sequence counts as two however many code points it has
+    ("📈", 2),
+    ("📈 up", 5),
+    ("👍🏽", 2),
+    ("❤️", 2),
+    ("👨‍👩‍👧‍👦", 2),
+    ("🇺🇸", 2),
+    ("1️⃣", 2),
+])
+def test_tweet_length(text, length):
+    assert tweet_length(text) == length
+
+
+def test_fits_at_the_limit():
+    assert fits("a" * MAX_TWEET_LENGTH)
+    assert not fits("a" * (MAX_TWEET_LENGTH + 1))
+    assert fits("東" * (MAX_TWEET_LENGTH // 2))
+    assert not fits("東" * (MAX_TWEET_LENGTH // 2) + "a")
+
+
+def _assert_thread(tweets, limit):
+    assert tweets
+    assert all(tweet and tweet == tweet.strip() for tweet in tweets)
+    assert all(fits(tweet, limit) for tweet in tweets)
+
+
+def test_everything_fits_in_one_tweet():
+    assert pack_thread("Movers:", ["$A +1%", "$B +2%"]) == ["Movers:\n\n$A +1%\n$B +2%"]
+
+
+def test_header_without_items():
+    assert pack_thread("  Nothing today  ", []) == ["Nothing today"]
+
+
+def test_blank_items_are_skipped():
+    assert pack_thread("Movers:", ["", "  ", "$A +1%"]) == ["Movers:\n\n$A +1%"]
+
+
+def test_splits_between_items_in_order():
+    items = [f"${chr(65 + i)}{chr(65 + i)} +{i}.00%" for i in range(10)]
+
+    tweets = pack_thread("Gainers:", items, limit=40)
+
+    _assert_thread(tweets, 40)
+    assert tweets[0].startswith("Gainers:\n\n")
+    assert "\n".join(tweets).replace("Gainers:\n\n", "").split("\n") == items
+    assert len(tweets) == 4
+
+
+def test_separator_between_items():
+    tweets = pack_thread("Earnings:", ["$A\nRev 1B", "$B\nRev 2B"], separator="\n\n", limit=20)
+
+    assert tweets == ["Earnings:\n\n$A\nRev 1B", "$B\nRev 2B"]
+
+
+def test_weighted_items_split_sooner():
+    items = ["東京電力 +3.00%", "三菱商事 +2.00%"]
+
+    # 39 weighted characters together, though only 31 code points
+    assert pack_thread("Japan:", items, limit=35) == ["Japan:\n\n東京電力 +3.00%", "三菱商事 +2.00%"]
+
+
+def test_header_merges_into_oversized_first_item():
+    item = "\n".join(f"line {i}" for i in range(8))
+
+    tweets = pack_thread("Header", [item], limit=30)
+
+    _assert_thread(tweets, 30)
+    assert tweets[0].startswith("Header\n\nline 0")
+    assert tweets != ["Header"] and tweets[0] != "Header"
+    assert "\n".join(tweets).replace("Header\n\n", "").split("\n") == item.split("\n")
+
+
+def test_oversized_item_after_others_fills_the_current_tweet():
+    tweets = pack_thread("H", ["a", "x1\nx2\nx3\nx4\nx5\nx6"], limit=12)
+
+    _assert_thread(tweets, 12)
+    assert tweets == ["H\n\na\nx1\nx2", "x3\nx4\nx5\nx6"]
+
+
+def test_single_overlong_line_is_hard_wrapped_in_order():
+    tweets = pack_thread("Header", ["first", "y" * 50, "last"], limit=20)
+
+    _assert_thread(tweets, 20)
+    assert tweets[0].startswith("Header\n\nfirst")
+    assert "".join(tweets).replace("\n", "") == "Headerfirst" + "y" * 50 + "last"
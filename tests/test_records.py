@@ -0,0 +1,102 @@
+import math
+import pytest
+from array import array
+from scraping.records import Mover, movers, parse_number, parse_numbers, ranked, top_k
+
+NAN = float("nan")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("+1.23%", 1.23),
+    ("−4.5%", -4.5),
+    ("-4.5%", -4.5),
+    ("0.00%", 0.0),
+    ("12.3%", 12.3),
+    ("+1,204.00%", 1204.0),
+    ("1.2K", 1200.0),
+    ("3.4M", 3.4e6),
+    ("$100.5B", 100.5e9),
+    ("1.1T", 1.1e12),
+    ("-$3.2M", -3.2e6),
+    ("$-3.2M", -3.2e6),
+    ("1.82 USD", 1.82),
+    ("−0.12 USD", -0.12),
+    (".5", 0.5),
+    # Thin and non-breaking spaces between digit groups
+    ("12\u202f345.6", 12345.6),
+    ("1\u00a0000", 1000.0),
+])
+def test_parse_number(text, expected):
+    assert parse_number(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", ["—", "", None, "N/A", "-", "%", "USD"])
+def test_parse_number_without_a_number(text):
+    assert math.isnan(parse_number(text))
+
+
+def test_parse_numbers_is_an_array_of_doubles():
+    values = parse_numbers(["+1.5%", "—", "2K"])
+
+    assert isinstance(values, array) and values.typecode == "d"
+    assert values[0] == 1.5 and math.isnan(values[1]) and values[2] == 2000.0
+
+
+def _movers(*changes):
+    return movers((f"T{i}", change) for i, change in enumerate(changes))
+
+
+def _tickers(records):
+    return [record.ticker for record in records]
+
+
+@pytest.mark.parametrize("changes, k, above, expected", [
+    # Largest first
+    (["+1%", "+5%", "+3%"], 2, None, ["T1", "T2"]),
+    # Ties keep page order
+    (["+2%", "+5%", "+2%", "+5%"], 3, None, ["T1", "T3", "T0"]),
+    # NaN values are skipped, never ranked first
+    (["—", "+1%", "", "+3%"], 5, None, ["T3", "T1"]),
+    # Only values greater than `above`
+    (["+1%", "−2%", "0.00%", "+4%"], 5, 0, ["T3", "T0"]),
+    (["−1%", "−2%"], 5, 0, []),
+    # Nothing parseable: the first k rows as they are
+    (["—", "", "N/A"], 2, None, ["T0", "T1"]),
+    (["—", "", "N/A"], 2, 0, ["T0", "T1"]),
+    # k larger than the page, and zero
+    (["+1%", "+2%"], 10, None, ["T1", "T0"]),
+    (["+1%", "+2%"], 0, None, []),
+    ([], 3, None, []),
+])
+def test_top_k(changes, k, above, expected):
+    records = _movers(*changes)
+
+    assert _tickers(top_k(records, k, key=lambda r: r.change_pct, above=above)) == expected
+
+
+def test_top_k_on_losers():
+    records = _movers("−1%", "−9%", "+2%", "—", "−4%")
+
+    assert _tickers(top_k(records, 2, key=lambda r: -r.change_pct, above=0)) == ["T1", "T4"]
+
+
+@pytest.mark.parametrize("changes, expected", [
+    (["+1%", "+5%", "−3%"], ["T1", "T0", "T2"]),
+    # NaN sorts last, whatever its position on the page
+    (["—", "+1%", "", "−2%", "+4%"], ["T4", "T1", "T3", "T0", "T2"]),
+    # Ties and NaNs keep page order
+    (["+2%", "—", "+2%", "N/A", "+2%"], ["T0", "T2", "T4", "T1", "T3"]),
+    (["—", ""], ["T0", "T1"]),
+    ([], []),
+])
+def test_ranked(changes, expected):
+    assert _tickers(ranked(_movers(*changes), key=lambda r: r.change_pct)) == expected
+
+
+def test_records_round_trip_through_rows():
+    records = _movers("+1.50%", "—")
+
+    rebuilt = Mover.from_rows([record.to_row() for record in records])
+
+    assert [(r.ticker, r.change) for r in rebuilt] == [("T0", "+1.50%"), ("T1", "—")]
+    assert rebuilt[0].change_pct == 1.5 and math.isnan(rebuilt[1].change_pct)
@@ -0,0 +1,122 @@
+import json
+import math
+import threading
+import pytest
+from benchmarks.screener import ReplayServer
+from scraping.screener import SCREENS, SCREENER_LIMIT, Screen, parse_screen, fetch_screen, fetch_screens
+
+
+@pytest.fixture
+def recorded(fixture_text):
+    return json.loads(fixture_text("scanner.json"))
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(**kwargs):
+        server = ReplayServer(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_parse_screen_strips_exchange_prefix():
+    payload = {"totalCount": 2, "data": [
+        {"s": "NASDAQ:AAPL", "d": [1.5]},
+        {"s": "NYSE:BRK.B", "d": [-2.104]},
+    ]}
+
+    assert [(r.ticker, r.change, r.change_pct) for r in parse_screen(payload)] == [
+        ("AAPL", "+1.50%", 1.5),
+        ("BRK.B", "−2.10%", -2.104),
+    ]
+
+
+def test_parse_screen_drops_rows_without_a_value():
+    payload = {"data": [
+        {"s": "NASDAQ:AAPL", "d": [None]},
+        {"s": "NYSE:GME", "d": ["+9.81%"]},
+        {"s": "AMEX:UAMY", "d": ["—"]},
+        {"s": "MSFT", "d": [0]},
+    ]}
+
+    assert [(r.ticker, r.change) for r in parse_screen(payload)] == [("GME", "+9.81%"), ("MSFT", "+0.00%")]
+
+
+@pytest.mark.parametrize("payload", [{}, {"data": None}, {"totalCount": 0, "data": []}])
+def test_parse_screen_without_data(payload):
+    assert parse_screen(payload) == []
+
+
+def test_query_filters_sorts_and_slices_on_the_server():
+    query = Screen("premarket_change", descending=False, where=("premarket_change", "less", 0)).query(25)
+
+    assert query["columns"] == ["premarket_change"]
+    assert query["sort"] == {"sortBy": "premarket_change", "sortOrder": "asc"}
+    assert query["range"] == [0, 25]
+    assert query["filter"][-2:] == [
+        {"left": "premarket_change", "operation": "nempty"},
+        {"left": "premarket_change", "operation": "less", "right": 0},
+    ]
+
+
+def test_fetch_screens_replays_recorded_responses(serve, recorded):
+    server = serve(recorded=recorded)
+
+    results = fetch_screens(list(SCREENS), base_url=server.base_url)
+
+    assert list(results) == list(SCREENS)
+    for exchange in recorded["responses"]:
+        expected = [
+            (row["s"].split(":", 1)[-1], row["d"][0])
+            for row in exchange["response"]["data"]
+            if row["d"][0] is not None
+        ]
+        assert [(r.ticker, r.change_pct) for r in results[exchange["screen"]]] == expected
+    assert server.replayed == len(SCREENS)
+
+
+def test_fetch_screens_marks_failed_screens_none(serve, recorded):
+    recorded["responses"] = [e for e in recorded["responses"] if e["screen"] != "all_time_low"]
+    server = serve(recorded=recorded)
+
+    results = fetch_screens(["pre_market_gainers", "all_time_low", "no_such_screen"], base_url=server.base_url)
+
+    assert list(results) == ["pre_market_gainers", "all_time_low"]
+    assert [r.ticker for r in results["pre_market_gainers"]][:2] == ["SMX", "ATNF"]
+    assert results["all_time_low"] is None
+
+
+def test_fetch_screen_unreachable_scanner(serve):
+    server = serve()
+    base_url = server.base_url
+    server.shutdown()
+    server.server_close()
+
+    assert fetch_screen("pre_market_gainers", base_url=base_url, timeout=2) is None
+
+
+def test_fetch_screen_evaluates_unrecorded_queries(serve):
+    universe = {
+        "columns": ["type", "exchange", "is_primary", "premarket_change"],
+        "data": [
+            {"s": "NASDAQ:UP", "d": ["stock", "NASDAQ", True, 4.0]},
+            {"s": "NYSE:MORE", "d": ["stock", "NYSE", True, 8.0]},
+            {"s": "NYSE:DOWN", "d": ["stock", "NYSE", True, -3.0]},
+            {"s": "NYSE:NOQUOTE", "d": ["stock", "NYSE", True, None]},
+            {"s": "OTC:PINK", "d": ["stock", "OTC", True, 50.0]},
+        ],
+    }
+    server = serve(universe=universe)
+
+    rows = fetch_screen("pre_market_gainers", base_url=server.base_url, limit=SCREENER_LIMIT)
+
+    assert [(r.ticker, r.change_pct) for r in rows] == [("MORE", 8.0), ("UP", 4.0)]
+    assert not any(math.isnan(r.change_pct) for r in rows)
@@ -0,0 +1,64 @@
+import os
+import tweepy
+from dotenv import load_dotenv
+
+_client = None
+
+
+def _credentials(prefix=""):
+    """
+    Reads an X account's credentials from the environment.
+    Accounts other than the main one use prefixed variables,
+    e.g. BACKUP_API_KEY for prefix "BACKUP_".
+    """
+    load_dotenv()
+    return {
+        "bearer_token": os.getenv(f"{prefix}BEARER_TOKEN"),
+        "consumer_key": os.getenv(f"{prefix}API_KEY"),
+        "consumer_secret": os.getenv(f"{prefix}API_SECRET"),
+        "access_token": os.getenv(f"{prefix}ACCESS_TOKEN"),
+        "access_token_secret": os.getenv(f"{prefix}ACCESS_TOKEN_SECRET"),
+    }
+
+
+def client_from_env(prefix=""):
+    """
+    Builds a tweepy.Client, with its own HTTP session,
+    for the account whose credentials use `prefix`.
+    """
+    return tweepy.Client(**_credentials(prefix))
+
+
+def async_client_from_env(prefix=""):
+    """
+    Builds a tweepy AsyncClient (needs the tweepy[async]
+    extra) for the account whose credentials use `prefix`.
+    """
+    from tweepy.asynchronous import AsyncClient
+
+    return AsyncClient(**_credentials(prefix))
+
+
+def get_client():
+    """
+    Returns the shared tweepy.Client for the main
+    account, built on first use and reused afterwards.
+    """
+    global _client
+    if _client is None:
+        _client = client_from_env()
+    return _client
+
+
+_async_client = None
+
+
+def get_async_client():
+    """
+    Returns the shared tweepy AsyncClient for the
+    main account, built like get_client().
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = async_client_from_env()
+    return _async_client
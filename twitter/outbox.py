@@ -0,0 +1,530 @@
+import os
+import time
+import asyncio
+import random
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from config.logger import setup_logging
+from config.tracing import span
+from config.market_calendar import trading_date
+from config.paths import data_dir
+from twitter.sinks import DEFAULT_SINK, SinkRejected, get_sinks
+
+logging = setup_logging("Outbox")
+
+MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+BASE_BACKOFF = float(os.getenv("OUTBOX_BASE_BACKOFF", "30"))
+MAX_BACKOFF = float(os.getenv("OUTBOX_MAX_BACKOFF", "3600"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    job TEXT,
+    text TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    sent_at REAL,
+    tweet_id TEXT,
+    last_error TEXT,
+    parent_id INTEGER REFERENCES outbox (id),
+    sink TEXT NOT NULL DEFAULT 'x'
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+"""
+
+MIGRATIONS = {
+    "parent_id": "ALTER TABLE outbox ADD COLUMN parent_id INTEGER REFERENCES outbox (id)",
+    "sink": "ALTER TABLE outbox ADD COLUMN sink TEXT NOT NULL DEFAULT 'x'",
+}
+
+# Created after MIGRATIONS, since older databases lack the column
+INDEXES = """
+CREATE INDEX IF NOT EXISTS outbox_sink_due ON outbox (sink, status, next_attempt_at);
+"""
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `capacity` tokens refilled evenly
+    over `period` seconds.
+    """
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_spec(cls, spec):
+        """
+        Builds a bucket from a "requests/seconds" string.
+        """
+        capacity, period = spec.split("/")
+        return cls(int(capacity), float(period))
+
+    def wait_time(self):
+        """
+        Takes a token if one is available and returns 0,
+        otherwise returns the seconds until one will be.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+def idempotency_key(text, day=None):
+    """
+    Returns the dedupe key for a post: its content
+    hash scoped to the trading day.
+    """
+    day = day or trading_date()
+    return hashlib.sha256(f"{day.isoformat()}\n{text}".encode("utf-8")).hexdigest()
+
+
+def sink_key(sink, text, day=None):
+    """
+    Returns the dedupe key for a post to `sink`. The main
+    account keeps the plain key, so posts queued before
+    there were several sinks are still recognised.
+    """
+    if sink == DEFAULT_SINK:
+        return idempotency_key(text, day)
+    return idempotency_key(f"{sink}\x1d{text}", day)
+
+
+class Outbox:
+    """
+    Durable SQLite queue of tweets waiting to be posted.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(data_dir(), "outbox.sqlite3")
+        self._wakeups = []
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(outbox)")}
+            for column, statement in MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+            conn.executescript(INDEXES)
+
+    def subscribe(self):
+        """
+        Returns an Event that is set whenever posts are queued.
+        """
+        event = threading.Event()
+        self._wakeups.append(event)
+        return event
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, text, job=None, sinks=(DEFAULT_SINK,)):
+        """
+        Queues `text` for posting. Returns False when the same
+        content was already queued or posted today.
+        """
+        return self.enqueue_thread([text], job=job, sinks=sinks)
+
+    def enqueue_thread(self, parts, job=None, sinks=(DEFAULT_SINK,)):
+        """
+        Queues `parts` as a reply thread on each of `sinks`: each
+        part is posted only after the one before it, as a reply to
+        it. Each part is keyed on the thread up to and including
+        it, so a part already queued or posted today is reused as
+        the parent of the next one and only the parts that differ
+        are queued. Returns False when the whole thread was
+        already queued or posted today on every sink.
+        """
+        now = time.time()
+        queued = []
+
+        with self._connect() as conn:
+            for sink in sinks:
+                parent_id, status = None, "pending"
+                added = 0
+                for position, text in enumerate(parts):
+                    key = sink_key(sink, "\x1e".join(parts[:position + 1]))
+                    # A reply under a part that already failed fails with it
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO outbox "
+                        "(idempotency_key, job, text, status, next_attempt_at, created_at, parent_id, sink, last_error) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (key, job, text, status, now, now, parent_id, sink,
+                         "parent tweet failed" if status == "failed" else None),
+                    )
+                    if cursor.rowcount == 0:
+                        row = conn.execute(
+                            "SELECT id, status FROM outbox WHERE idempotency_key = ?", (key,)
+                        ).fetchone()
+                        parent_id, status = row["id"], "failed" if row["status"] == "failed" else "pending"
+                    else:
+                        parent_id = cursor.lastrowid
+                        added += 1
+                if added:
+                    queued.append(f"{sink} ({added} new)" if added < len(parts) else sink)
+
+        if not queued:
+            logging.info(f"Skipping duplicate tweet: {parts[0][:50]}...")
+            return False
+
+        logging.info(f"Queued {len(parts)} tweet(s) for {', '.join(queued)}: {parts[0][:50]}...")
+        for event in self._wakeups:
+            event.set()
+        return True
+
+    def next_due(self, sink=DEFAULT_SINK):
+        """
+        Returns the oldest pending row for `sink` that is due and
+        whose parent (if any) has been posted, or None. The row
+        carries the parent's post id as `reply_to`.
+        """
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT o.*, p.tweet_id AS reply_to FROM outbox o "
+                "LEFT JOIN outbox p ON p.id = o.parent_id "
+                "WHERE o.sink = ? AND o.status = 'pending' AND o.next_attempt_at <= ? "
+                "AND (o.parent_id IS NULL OR p.status = 'sent') "
+                "ORDER BY o.id LIMIT 1",
+                (sink, time.time()),
+            ).fetchone()
+
+    def seconds_until_due(self, sink=DEFAULT_SINK):
+        """
+        Returns the seconds until the next pending row for
+        `sink` is due, or None when nothing is pending. Replies
+        waiting on a parent count from the parent's retry.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT MIN(o.next_attempt_at) FROM outbox o "
+                "LEFT JOIN outbox p ON p.id = o.parent_id "
+                "WHERE o.sink = ? AND o.status = 'pending' "
+                "AND (o.parent_id IS NULL OR p.status = 'sent')",
+                (sink,),
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def mark_sent(self, row_id, tweet_id=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'sent', sent_at = ?, tweet_id = ?, "
+                "attempts = attempts + 1, last_error = NULL WHERE id = ?",
+                (time.time(), tweet_id, row_id),
+            )
+
+    def mark_retry(self, row_id, delay, error):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, next_attempt_at = ?, last_error = ? "
+                "WHERE id = ?",
+                (time.time() + delay, str(error), row_id),
+            )
+
+    def mark_failed(self, row_id, error):
+        """
+        Fails a row and every reply queued beneath it.
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'failed', attempts = attempts + 1, last_error = ? "
+                "WHERE id = ?",
+                (str(error), row_id),
+            )
+            conn.execute(
+                "WITH RECURSIVE replies(id) AS ("
+                "  SELECT id FROM outbox WHERE parent_id = ? "
+                "  UNION ALL SELECT o.id FROM outbox o JOIN replies r ON o.parent_id = r.id"
+                ") UPDATE outbox SET status = 'failed', last_error = 'parent tweet failed' "
+                "WHERE id IN (SELECT id FROM replies) AND status = 'pending'",
+                (row_id,),
+            )
+
+
+def backoff_delay(attempts, error=None):
+    """
+    Returns how long to wait before retrying. Rate limit
+    errors honour the API's reset header; everything else
+    backs off exponentially with jitter.
+    """
+    import tweepy
+
+    if isinstance(error, tweepy.TooManyRequests):
+        reset = error.response.headers.get("x-rate-limit-reset") if error.response is not None else None
+        if reset:
+            return max(1.0, float(reset) - time.time())
+
+    delay = min(MAX_BACKOFF, BASE_BACKOFF * (2 ** attempts))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def post_one(outbox, sink, row):
+    """
+    Posts a single outbox row to `sink`, recording the
+    outcome. Returns the seconds the caller should wait
+    before trying again when rate limited locally, else 0.
+    """
+    wait = sink.wait_time()
+    if wait > 0:
+        return wait
+
+    _check_reply(row)
+
+    try:
+        with span("api_call", job=row["job"]) as current:
+            current.set(retries=row["attempts"])
+            post_id = sink.post(row["text"], reply_to=row["reply_to"], job=row["job"])
+    except Exception as e:
+        record_error(outbox, row, e)
+    else:
+        record_sent(outbox, row, post_id)
+
+    return 0.0
+
+
+async def post_one_async(outbox, sink, row):
+    """
+    post_one() with the post awaited and the outbox
+    updated off the event loop.
+    """
+    wait = sink.wait_time()
+    if wait > 0:
+        return wait
+
+    _check_reply(row)
+
+    try:
+        with span("api_call", job=row["job"]) as current:
+            current.set(retries=row["attempts"])
+            post_id = await sink.post_async(row["text"], reply_to=row["reply_to"], job=row["job"])
+    except Exception as e:
+        await asyncio.to_thread(record_error, outbox, row, e)
+    else:
+        await asyncio.to_thread(record_sent, outbox, row, post_id)
+
+    return 0.0
+
+
+def _check_reply(row):
+    if row["parent_id"] is not None and row["reply_to"] is None:
+        logging.warning(f"Parent of tweet {row['id']} has no post id; posting it standalone.")
+
+
+def record_sent(outbox, row, post_id):
+    outbox.mark_sent(row["id"], post_id)
+    logging.info(f"Posted to {row['sink']}: {row['text'][:50]}...")
+
+
+def record_error(outbox, row, error):
+    """
+    Decides whether a failed post is done, retried or failed.
+    Only X sinks raise tweepy's errors, so tweepy is imported
+    here rather than when the outbox is loaded.
+    """
+    import tweepy
+
+    if isinstance(error, SinkRejected):
+        logging.error(f"Error posting to {row['sink']}: {error}")
+        outbox.mark_failed(row["id"], error)
+
+    elif isinstance(error, tweepy.Forbidden):
+        # A crash between posting and mark_sent leaves the row pending;
+        # X rejects the re-post as duplicate content, which closes it out.
+        if "duplicate" in str(error).lower():
+            logging.info(f"Tweet {row['id']} was already posted; marking sent.")
+            outbox.mark_sent(row["id"])
+        else:
+            logging.error(f"Error posting to {row['sink']}: {error}")
+            outbox.mark_failed(row["id"], error)
+
+    elif isinstance(error, tweepy.HTTPException):
+        if isinstance(error, (tweepy.TooManyRequests, tweepy.TwitterServerError)):
+            retry_later(outbox, row, error)
+        else:
+            logging.error(f"Error posting to {row['sink']}: {error}")
+            outbox.mark_failed(row["id"], error)
+
+    else:
+        retry_later(outbox, row, error)
+
+
+def retry_later(outbox, row, error):
+    """
+    Schedules a retry with backoff, or gives up
+    once MAX_ATTEMPTS is reached.
+    """
+    attempts = row["attempts"] + 1
+    if attempts >= MAX_ATTEMPTS:
+        logging.error(f"Giving up on tweet {row['id']} for {row['sink']} after {attempts} attempts: {error}")
+        outbox.mark_failed(row["id"], error)
+    else:
+        delay = backoff_delay(row["attempts"], error)
+        logging.warning(f"Retrying tweet {row['id']} for {row['sink']} in {delay:.0f}s: {error}")
+        outbox.mark_retry(row["id"], delay, error)
+
+
+def drain_once(outbox, sink, stopping=None):
+    """
+    Posts every due row for `sink` and returns how long to
+    sleep before the next one is due. Stops early once
+    `stopping` (an Event) is set.
+    """
+    while stopping is None or not stopping.is_set():
+        row = outbox.next_due(sink.name)
+        if row is None:
+            break
+        wait = post_one(outbox, sink, row)
+        if wait > 0:
+            return wait
+
+    pending = outbox.seconds_until_due(sink.name)
+    return 60.0 if pending is None else min(60.0, pending)
+
+
+class OutboxWorker(threading.Thread):
+    """
+    Background thread that drains one sink's rows through
+    its rate limiter, so scraping jobs never wait on the
+    API and one slow sink never holds up another.
+    """
+
+    def __init__(self, outbox, sink):
+        super().__init__(name=f"outbox-{sink.name}", daemon=True)
+        self.outbox = outbox
+        self.sink = sink
+        self.wakeup = outbox.subscribe()
+        self.stopping = threading.Event()
+
+    def run(self):
+        while not self.stopping.is_set():
+            self.wakeup.clear()
+            try:
+                wait = self.drain_once()
+            except Exception as e:
+                logging.error(f"Outbox worker error for {self.sink.name}: {e}")
+                wait = BASE_BACKOFF
+
+            self.wakeup.wait(wait)
+
+    def drain_once(self):
+        return drain_once(self.outbox, self.sink, self.stopping)
+
+    def stop(self):
+        self.stopping.set()
+        self.wakeup.set()
+
+
+_outbox = None
+
+
+def get_outbox():
+    """
+    Returns the process-wide outbox.
+    """
+    global _outbox
+    if _outbox is None:
+        _outbox = Outbox()
+    return _outbox
+
+
+def enqueue_tweet(tweet, job=None, sinks=None):
+    """
+    Queues a tweet, or a list of tweets to post as a reply
+    thread, on the shared outbox for every enabled sink.
+    """
+    parts = [tweet] if isinstance(tweet, str) else list(tweet)
+    names = [sink.name for sink in (sinks or get_sinks())]
+    return get_outbox().enqueue_thread(parts, job=job, sinks=names)
+
+
+def start_workers(sinks=None):
+    """
+    Starts one background posting worker per sink.
+    """
+    workers = [OutboxWorker(get_outbox(), sink) for sink in (sinks or get_sinks())]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+def _drain_sink(outbox, sink, deadline):
+    while time.monotonic() < deadline:
+        wait = drain_once(outbox, sink)
+        if outbox.next_due(sink.name) is None and wait > 1.0:
+            return
+        time.sleep(min(wait, max(0.0, deadline - time.monotonic())))
+
+
+def drain(sinks=None, timeout=30):
+    """
+    Posts everything currently due, draining the sinks in
+    parallel, and returns once every sink is idle or `timeout`
+    seconds have passed. Used by short-lived processes such
+    as the Lambda handler.
+    """
+    outbox = get_outbox()
+    sinks = sinks or get_sinks()
+    deadline = time.monotonic() + timeout
+
+    with ThreadPoolExecutor(max_workers=len(sinks), thread_name_prefix="drain") as pool:
+        futures = {pool.submit(_drain_sink, outbox, sink, deadline): sink for sink in sinks}
+        for future, sink in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Failed to drain {sink.name}: {e}")
+
+
+async def _drain_sink_async(outbox, sink, max_wait):
+    while True:
+        row = await asyncio.to_thread(outbox.next_due, sink.name)
+        if row is None:
+            return
+        wait = await post_one_async(outbox, sink, row)
+        if wait > max_wait:
+            logging.info(f"Rate limited locally on {sink.name}; leaving due posts for {wait:.0f}s.")
+            return
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+async def drain_async(sinks=None, max_wait=30):
+    """
+    Posts every due row, draining the sinks concurrently. Local
+    rate limiting is waited out up to `max_wait` seconds; beyond
+    that the rows are left for a later drain. Do not run it
+    alongside an OutboxWorker on the same outbox.
+    """
+    outbox = get_outbox()
+    sinks = sinks or get_sinks()
+    results = await asyncio.gather(
+        *(_drain_sink_async(outbox, sink, max_wait) for sink in sinks),
+        return_exceptions=True,
+    )
+    for sink, result in zip(sinks, results):
+        if isinstance(result, Exception):
+            logging.error(f"Failed to drain {sink.name}: {result}")
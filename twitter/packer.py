@@ -0,0 +1,131 @@
+import re
+import unicodedata
+
+MAX_TWEET_LENGTH = 280
+
+# Weighting used by X's twitter-text v3 config: code points in these
+# ranges count as one character, everything else counts as two.
+LIGHT_RANGES = (
+    (0x0000, 0x10FF),
+    (0x2000, 0x200D),
+    (0x2010, 0x201F),
+    (0x2032, 0x2037),
+)
+URL_LENGTH = 23
+EMOJI_LENGTH = 2
+
+URL_RE = re.compile(r"(?:https?://|www\.)[^\s]+", re.IGNORECASE)
+
+_EMOJI_BASE = "\u2300-\u23ff\u2600-\u27bf\u2b00-\u2bff\U0001f000-\U0001faff"
+_EMOJI_TAIL = "(?:\ufe0f)?(?:[\U0001f3fb-\U0001f3ff])?"
+EMOJI_RE = re.compile(
+    "[\U0001f1e6-\U0001f1ff]{2}"
+    "|[#*0-9]\ufe0f?\u20e3"
+    f"|[{_EMOJI_BASE}]{_EMOJI_TAIL}(?:\u200d[{_EMOJI_BASE}]{_EMOJI_TAIL})*"
+)
+
+
+def _char_length(char):
+    code = ord(char)
+    for low, high in LIGHT_RANGES:
+        if low <= code <= high:
+            return 1
+    return 2
+
+
+def tweet_length(text):
+    """
+    Returns the length of `text` as X counts it: NFC
+    normalised, URLs as 23, emoji sequences as 2 and
+    CJK and other wide characters as 2.
+    """
+    text = unicodedata.normalize("NFC", text)
+    length = 0
+    position = 0
+
+    for match in re.finditer(f"{URL_RE.pattern}|{EMOJI_RE.pattern}", text, re.IGNORECASE):
+        length += sum(_char_length(c) for c in text[position:match.start()])
+        length += URL_LENGTH if URL_RE.fullmatch(match.group()) else EMOJI_LENGTH
+        position = match.end()
+
+    length += sum(_char_length(c) for c in text[position:])
+    return length
+
+
+def fits(text, limit=MAX_TWEET_LENGTH):
+    """
+    Returns True if `text` can be posted as one tweet.
+    """
+    return tweet_length(text) <= limit
+
+
+def _split_oversized(block, limit):
+    """
+    Breaks a block that cannot fit in one tweet on line
+    boundaries. A single line too long for any tweet is
+    hard-wrapped, starting in the room left by the lines
+    before it.
+    """
+    pieces, current = [], ""
+
+    for line in block.split("\n"):
+        candidate = f"{current}\n{line}" if current else line
+        if fits(candidate, limit):
+            current = candidate
+            continue
+
+        if fits(line, limit):
+            pieces.append(current)
+            current = line
+            continue
+
+        while not fits(candidate, limit):
+            cut = len(candidate)
+            while cut > 1 and not fits(candidate[:cut], limit):
+                cut -= 1
+            pieces.append(candidate[:cut])
+            candidate = candidate[cut:]
+        current = candidate
+
+    pieces.append(current)
+    return [piece.strip("\n") for piece in pieces if piece.strip()]
+
+
+def pack_thread(header, items, separator="\n", limit=MAX_TWEET_LENGTH):
+    """
+    Packs `header` followed by `items` (joined with `separator`)
+    into as few tweets as possible without reordering or splitting
+    an item across tweets, except an item too long for one tweet,
+    which is split on lines and starts in the tweet before it.
+    Returns the tweets in thread order; every tweet after the
+    first is posted as a reply to the one before it.
+    """
+    tweets = []
+    current = header.strip()
+    joiner = "\n\n"
+
+    for item in items:
+        item = item.strip()
+        if not item:
+            continue
+
+        candidate = f"{current}{joiner}{item}" if current else item
+        if fits(candidate, limit):
+            current = candidate
+            joiner = separator
+            continue
+
+        if fits(item, limit):
+            if current:
+                tweets.append(current)
+            current = item
+        else:
+            # Start the item in the room left in this tweet, so a
+            # header is never posted on its own
+            *full, current = _split_oversized(candidate, limit)
+            tweets.extend(full)
+        joiner = separator
+
+    if current:
+        tweets.append(current)
+    return tweets
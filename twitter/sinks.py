@@ -0,0 +1,225 @@
+"""
+Publishing destinations. Every post queued on the outbox is
+posted once to each enabled sink in config/sinks.json: X accounts
+(each with its own credentials, HTTP session and rate limit), a
+local JSON-lines file, or a webhook. Each sink is drained by its
+own worker, so a slow or failing sink never holds up the others.
+"""
+import os
+import json
+import uuid
+import time
+import asyncio
+import threading
+import requests
+from abc import ABC, abstractmethod
+from requests.adapters import HTTPAdapter
+from config.logger import setup_logging
+from config.paths import PROJECT_ROOT, data_dir
+
+logging = setup_logging("Sinks")
+
+SINKS_PATH = os.getenv("PUBLISH_SINKS_PATH", os.path.join(PROJECT_ROOT, "config", "sinks.json"))
+
+# The main X account; posts queued before sinks existed belong to it
+DEFAULT_SINK = "x"
+
+# POST /2/tweets allows 100 requests per 15 minutes per user
+X_RATE_LIMIT = os.getenv("OUTBOX_RATE_LIMIT", "100/900")
+
+
+class SinkRejected(Exception):
+    """
+    The destination refused the post; retrying will not help.
+    """
+
+
+class Sink(ABC):
+    """
+    A destination posts are published to. `rate_limit` is a
+    "requests/seconds" spec, or None for no local limit.
+    Subclasses implement post().
+    """
+
+    def __init__(self, name, rate_limit=None):
+        from twitter.outbox import TokenBucket
+
+        self.name = name
+        self.limiter = TokenBucket.from_spec(rate_limit) if rate_limit else None
+
+    def wait_time(self):
+        return self.limiter.wait_time() if self.limiter else 0.0
+
+    @abstractmethod
+    def post(self, text, reply_to=None, job=None):
+        """
+        Publishes `text` and returns its id on the destination.
+        """
+
+    async def post_async(self, text, reply_to=None, job=None):
+        return await asyncio.to_thread(self.post, text, reply_to, job)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class XSink(Sink):
+    """
+    An X account. Credentials are read from the environment
+    with `credentials_prefix` (see twitter.client).
+    """
+
+    def __init__(self, name, credentials_prefix="", rate_limit=X_RATE_LIMIT):
+        super().__init__(name, rate_limit)
+        self.prefix = credentials_prefix
+        self._client = None
+        self._async_client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                from twitter.client import client_from_env, get_client
+                self._client = get_client() if self.prefix == "" else client_from_env(self.prefix)
+            return self._client
+
+    @property
+    def async_client(self):
+        with self._lock:
+            if self._async_client is None:
+                from twitter.client import async_client_from_env, get_async_client
+                self._async_client = get_async_client() if self.prefix == "" else async_client_from_env(self.prefix)
+            return self._async_client
+
+    def post(self, text, reply_to=None, job=None):
+        response = self.client.create_tweet(text=text, in_reply_to_tweet_id=reply_to)
+        return response.data.get("id") if response.data else None
+
+    async def post_async(self, text, reply_to=None, job=None):
+        response = await self.async_client.create_tweet(text=text, in_reply_to_tweet_id=reply_to)
+        return response.data.get("id") if response.data else None
+
+
+class FileSink(Sink):
+    """
+    Appends every post to a JSON-lines file (relative
+    paths are under the data dir).
+    """
+
+    def __init__(self, name, path, rate_limit=None):
+        super().__init__(name, rate_limit)
+        self.path = path if os.path.isabs(path) else os.path.join(data_dir(), path)
+        self._lock = threading.Lock()
+
+    def post(self, text, reply_to=None, job=None):
+        post_id = uuid.uuid4().hex
+        line = json.dumps({
+            "id": post_id,
+            "reply_to": reply_to,
+            "job": job,
+            "text": text,
+            "posted_at": time.time(),
+        })
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        return post_id
+
+
+class WebhookSink(Sink):
+    """
+    POSTs every post as JSON to `url` over a pooled session.
+    The response's "id" field, if any, is used as the post id.
+    """
+
+    def __init__(self, name, url, token=None, timeout=10, rate_limit=None):
+        super().__init__(name, rate_limit)
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def post(self, text, reply_to=None, job=None):
+        response = self.session.post(
+            self.url,
+            json={"text": text, "reply_to": reply_to, "job": job},
+            timeout=self.timeout,
+        )
+        if 400 <= response.status_code < 500 and response.status_code != 429:
+            raise SinkRejected(f"{self.url} returned {response.status_code}: {response.text[:200]}")
+        response.raise_for_status()
+
+        try:
+            post_id = response.json().get("id")
+        except (ValueError, AttributeError):
+            post_id = None
+        return str(post_id) if post_id is not None else uuid.uuid4().hex
+
+
+def build_sink(entry):
+    """
+    Builds a sink from one config entry.
+    """
+    kind = entry.get("type", "x")
+    name = entry["name"]
+    rate_limit = entry.get("rate_limit")
+
+    if kind == "x":
+        return XSink(name, entry.get("credentials_prefix", ""), rate_limit or X_RATE_LIMIT)
+    if kind == "file":
+        return FileSink(name, entry["path"], rate_limit)
+    if kind == "webhook":
+        url = entry.get("url") or os.getenv(entry.get("url_env", ""), "")
+        if not url:
+            raise ValueError(f"Webhook sink '{name}' has no url.")
+        token = os.getenv(entry["token_env"]) if entry.get("token_env") else None
+        return WebhookSink(name, url, token=token, timeout=entry.get("timeout", 10), rate_limit=rate_limit)
+    raise ValueError(f"Unknown sink type '{kind}' for sink '{name}'.")
+
+
+def load_sinks(path=SINKS_PATH):
+    """
+    Builds the enabled sinks listed in `path`. Without a
+    config file, posts go to the main X account only. A
+    sink that cannot be built is logged and skipped.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        entries = [{"name": DEFAULT_SINK, "type": "x"}]
+
+    sinks = {}
+    for entry in entries:
+        if not entry.get("enabled", True):
+            continue
+        try:
+            sink = build_sink(entry)
+        except (KeyError, ValueError) as e:
+            logging.error(f"Skipping sink {entry.get('name')}: {e}")
+            continue
+        if sink.name in sinks:
+            logging.error(f"Duplicate sink name '{sink.name}'; keeping the first.")
+            continue
+        sinks[sink.name] = sink
+
+    logging.info(f"Publishing to {len(sinks)} sink(s): {', '.join(sinks)}.")
+    return list(sinks.values())
+
+
+_sinks = None
+_lock = threading.Lock()
+
+
+def get_sinks():
+    """
+    Returns the process-wide list of enabled sinks.
+    """
+    global _sinks
+    with _lock:
+        if _sinks is None:
+            _sinks = load_sinks()
+        return _sinks
@@ -1,157 +1,166 @@
+import os
+from twitter.packer import pack_thread
+from scraping.records import ranked, top_k
+
+# Movers listed per tweet
+TOP_K = 5
+
+# Smallest change (in percent) a gainer, loser or gapper must show
+MIN_CHANGE = float(os.getenv("MOVERS_MIN_CHANGE", "0"))
+
+def by_change(stock):
+    return stock.change_pct
+
+def by_drop(stock):
+    return -stock.change_pct
+
+def by_revenue(stock):
+    return stock.revenue
+
+def earnings_block(stock):
+    """
+    Formats one company's line
+    in an earnings reminder.
+    """
+    return (
+        f"- ${stock.ticker} --->\n"
+        f"  EPS estimate: {stock.eps_estimate}\n"
+        f"  Revenue estimate: {stock.revenue_forecast}"
+    )
+
 def daily_premkt_earnings_tweet(earnings_list):
     """
     Formats the Pre-Market earnings reminder tweet.
     """
     if not earnings_list:
-        return "No major earnings reports scheduled for today before the bell."
-
-    tweet = "Major companies reporting earnings TODAY BEFORE the bell:\n\n"
+        return ["No major earnings reports scheduled for today before the bell."]
 
-    for stock in earnings_list:
-        tweet += f"- ${stock['Ticker']} --->\n"
-        tweet += f"  EPS estimate: {stock['EPS Estimate']}\n"
-        tweet += f"  Revenue estimate: {stock['Revenue Forecast']}\n\n"
-
-    return tweet.strip()
+    return pack_thread(
+        "Major companies reporting earnings TODAY BEFORE the bell:",
+        [earnings_block(stock) for stock in ranked(earnings_list, by_revenue)],
+        separator="\n\n",
+    )
 
 def daily_afterhrs_earnings_tweet(earnings_list):
     """
     Formats the After-Market earnings reminder tweet.
     """
     if not earnings_list:
-        return "No major earnings reports scheduled for today after the bell."
-
-    tweet = "Major companies reporting earnings TODAY AFTER the bell:\n\n"
+        return ["No major earnings reports scheduled for today after the bell."]
 
-    for stock in earnings_list:
-        tweet += f"- ${stock['Ticker']} --->\n"
-        tweet += f"  EPS estimate: {stock['EPS Estimate']}\n"
-        tweet += f"  Revenue estimate: {stock['Revenue Forecast']}\n\n"
-
-    return tweet.strip()
+    return pack_thread(
+        "Major companies reporting earnings TODAY AFTER the bell:",
+        [earnings_block(stock) for stock in ranked(earnings_list, by_revenue)],
+        separator="\n\n",
+    )
 
 def econ_reminder_tomorrow(econ_list):
     """
     Formats the economic event reminder tweet for TOMORROW.
     """
     if not econ_list:
-        return "No major economic events scheduled for tomorrow."
-
-    tweet = "Major economic events TOMORROW:\n\n"
-
-    for event in econ_list:
-        tweet += f"- {event['Event']}\n"
+        return ["No major economic events scheduled for tomorrow."]
 
-    return tweet.strip()
+    return pack_thread(
+        "Major economic events TOMORROW:",
+        [f"- {event.event}" for event in econ_list],
+    )
 
 def econ_reminder_weekly(econ_list):
     """
     Formats the economic event reminder tweet for THIS WEEK.
     """
     if not econ_list:
-        return "No major economic events scheduled for this week."
+        return ["No major economic events scheduled for this week."]
 
-    tweet = "Major economic events THIS WEEK:\n\n"
-
-    for event in econ_list:
-        tweet += f"- {event['Event']}\n"
-
-    return tweet.strip()
+    return pack_thread(
+        "Major economic events THIS WEEK:",
+        [f"- {event.event}" for event in econ_list],
+    )
 
 def pre_market_gainer(gainers_list):
     """
     Formats the Pre-Market Gainers tweet.
     """
-    if not gainers_list:
-        return "No significant pre-market gainers today."
-
-    tweet = "Stocks rising in pre-market\n\n"
-
-    for stock in gainers_list[:5]:
-        tweet += f"- ${stock['Ticker']} +{stock['Pre-Market Change']}\n"
+    gainers = top_k(gainers_list, TOP_K, by_change, above=MIN_CHANGE)
+    if not gainers:
+        return ["No significant pre-market gainers today."]
 
-    return tweet.strip()
+    return pack_thread(
+        "Stocks rising in pre-market",
+        [f"- ${stock.ticker} +{stock.change.lstrip('+')}" for stock in gainers],
+    )
 
 def pre_market_losers(losers_list):
     """
     Formats the Pre-Market Losers tweet.
     """
-    if not losers_list:
-        return "No significant pre-market losers today."
+    losers = top_k(losers_list, TOP_K, by_drop, above=MIN_CHANGE)
+    if not losers:
+        return ["No significant pre-market losers today."]
 
-    tweet = "Stocks dropping in pre-market\n\n"
-
-    for stock in losers_list[:5]:
-        tweet += f"- ${stock['Ticker']} {stock['Pre-Market Change']}\n"
-
-    return tweet.strip()
+    return pack_thread(
+        "Stocks dropping in pre-market",
+        [f"- ${stock.ticker} {stock.change}" for stock in losers],
+    )
 
 def week_high_52(high_list):
     """
     Formats the 52-Week Highs tweet.
     """
     if not high_list:
-        return "No stocks hitting new 52-week highs today."
-
-    tweet = "All these stocks hit a 52 WEEK HIGH at some point today\n\n"
+        return ["No stocks hitting new 52-week highs today."]
 
-    for stock in high_list[:5]:
-        tweet += f"- ${stock['Ticker']}\n"
-
-    return tweet.strip()
+    return pack_thread(
+        "All these stocks hit a 52 WEEK HIGH at some point today",
+        [f"- ${stock.ticker}" for stock in top_k(high_list, TOP_K, by_change)],
+    )
 
 def week_low_52(low_list):
     """
     Formats the 52-Week Lows tweet.
     """
     if not low_list:
-        return "No stocks hitting new 52-week lows today."
-
-    tweet = "All these stocks hit a 52 WEEK LOW at some point today\n\n"
+        return ["No stocks hitting new 52-week lows today."]
 
-    for stock in low_list[:5]:
-        tweet += f"- ${stock['Ticker']}\n"
-
-    return tweet.strip()
+    return pack_thread(
+        "All these stocks hit a 52 WEEK LOW at some point today",
+        [f"- ${stock.ticker}" for stock in top_k(low_list, TOP_K, by_drop)],
+    )
 
 def all_time_high(high_list):
     """
     Formats the All-Time Highs tweet.
     """
     if not high_list:
-        return "No stocks reaching all-time highs today."
-
-    tweet = "All these stocks hit ALL TIME HIGHS at some point today\n\n"
+        return ["No stocks reaching all-time highs today."]
 
-    for stock in high_list[:5]:
-        tweet += f"- ${stock['Ticker']}\n"
-
-    return tweet.strip()
+    return pack_thread(
+        "All these stocks hit ALL TIME HIGHS at some point today",
+        [f"- ${stock.ticker}" for stock in top_k(high_list, TOP_K, by_change)],
+    )
 
 def all_time_low(low_list):
     """
     Formats the All-Time Lows tweet.
     """
     if not low_list:
-        return "No stocks reaching all-time lows today."
-
-    tweet = "All these stocks hit ALL TIME LOWS at some point today\n\n"
+        return ["No stocks reaching all-time lows today."]
 
-    for stock in low_list[:5]:
-        tweet += f"- ${stock['Ticker']}\n"
-     
-    return tweet.strip()
+    return pack_thread(
+        "All these stocks hit ALL TIME LOWS at some point today",
+        [f"- ${stock.ticker}" for stock in top_k(low_list, TOP_K, by_drop)],
+    )
 
 def pre_market_gap(gap_list):
     """
     Fromats the pre-market Gap tweet
     """
-    if not gap_list:
-        return "No stocks gapping today."
-    
-    tweet = "Stocks gapping up:"
-
-    for stock in gap_list[:5]:
-        tweet += f"- ${stock['Ticker']}"
+    gappers = top_k(gap_list, TOP_K, by_change, above=MIN_CHANGE)
+    if not gappers:
+        return ["No stocks gapping today."]
 
-    return tweet.strip()
+    return pack_thread(
+        "Stocks gapping up:",
+        [f"- ${stock.ticker}" for stock in gappers],
+    )